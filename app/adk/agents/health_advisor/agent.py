@@ -1,6 +1,7 @@
 from google.adk.agents import Agent
 
 from .models import DEFAULT_MODEL, DEFAULT_PLANNER
+from .router import pre_route
 from .schemas import RootAgentOutput
 from .sub_agents import (
     goal_setting_agent,
@@ -100,4 +101,6 @@ exercise_manager_agent などサブエージェントが `finish_task` で対話
     ],
     output_schema=RootAgentOutput,
     output_key="root_agent_output",
+    # 明らかなケースは LLM を呼ばずにサブエージェントへ転送する
+    before_model_callback=pre_route,
 )
@@ -0,0 +1,5 @@
+"""集計・分析エンジン
+
+DB から取得した集計値を入力に、達成率や推移などを計算する純粋な計算モジュール。
+DB アクセスや ToolContext には依存しない。
+"""
@@ -0,0 +1,146 @@
+"""運動習慣の実施率エンジン
+
+運動習慣（Habit）の目標値・スケジュールと、習慣 × 日付（JST）ごとの運動ログの合計から、
+習慣ごとの実施率と部分達成度（partial credit）を計算する。
+
+スケジュールは analytics.schedule.expand_occurrences で「枠（slot）」に展開する。
+曜日指定・毎日の習慣は予定日 1 日が 1 枠、曜日指定のない週単位の習慣は
+ISO 週 1 つ（期間・有効期間内の日）が 1 枠になる。枠の達成度は枠内の日の達成度の最大値とする。
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from .schedule import HabitSchedule, Occurrence, expand_occurrences
+
+# 目標値を持つ指標（Habit の目標値 → 日ごとの合計のキー）
+TARGET_METRICS = ("sets", "reps", "duration", "distance")
+
+# 直近の枠の内訳として返す件数
+RECENT_SLOTS = 7
+
+
+@dataclass(frozen=True)
+class ExerciseTarget:
+    """運動習慣の目標値とスケジュール"""
+
+    habit_id: str
+    title: str
+    exercise_name: str
+    targets: dict[str, float]
+    schedule: HabitSchedule
+
+    @classmethod
+    def from_habit(cls, habit: Any) -> "ExerciseTarget | None":
+        """Habit から目標値を取り出す。運動名がない場合は None。
+
+        レップ数の目標は 1 セットあたりとみなし、目標セット数を掛けた総レップ数と比較する。
+        """
+        if not habit.exercise_name:
+            return None
+        targets = {
+            "sets": habit.target_sets,
+            "reps": (
+                habit.target_reps * (habit.target_sets or 1) if habit.target_reps else None
+            ),
+            "duration": habit.target_duration,
+            "distance": habit.target_distance,
+        }
+        return cls(
+            habit_id=habit.id,
+            title=habit.title,
+            exercise_name=habit.exercise_name,
+            targets={k: float(v) for k, v in targets.items() if v},
+            schedule=HabitSchedule.from_habit(habit),
+        )
+
+
+def day_credit(targets: dict[str, float], totals: dict[str, Any] | None) -> float:
+    """1 日分の部分達成度（0.0 〜 1.0）を計算する。
+
+    目標値ごとの達成比（上限 1.0）の平均。目標値がない習慣は記録があれば 1.0。
+    """
+    if not totals or not totals.get("sessions"):
+        return 0.0
+    if not targets:
+        return 1.0
+    ratios = [min(float(totals.get(k) or 0) / t, 1.0) for k, t in targets.items()]
+    return sum(ratios) / len(ratios)
+
+
+def _slot_days(occurrence: Occurrence, schedule: HabitSchedule, end_date: date) -> list[date]:
+    """予定 1 回分の枠に含まれる日を返す。
+
+    週単位の予定は、予定日から ISO 週の日曜日までのうち期間・有効期間内の日。
+    """
+    if not occurrence.weekly:
+        return [occurrence.date]
+    last = min(occurrence.date + timedelta(days=6 - occurrence.date.weekday()), end_date)
+    if schedule.end_date is not None:
+        last = min(last, schedule.end_date)
+    return [occurrence.date + timedelta(days=i) for i in range((last - occurrence.date).days + 1)]
+
+
+def _slots(
+    targets: list[ExerciseTarget],
+    start_date: date,
+    end_date: date,
+) -> dict[str, list[list[date]]]:
+    """期間内の予定を習慣ごとの枠（日付順）に展開する。"""
+    schedules = {target.habit_id: target.schedule for target in targets}
+    slots: dict[str, list[list[date]]] = {habit_id: [] for habit_id in schedules}
+    for occurrence in expand_occurrences(schedules.values(), start_date, end_date):
+        schedule = schedules[occurrence.habit_id]
+        slots[occurrence.habit_id].append(_slot_days(occurrence, schedule, end_date))
+    return slots
+
+
+def compute_habit_adherence(
+    targets: list[ExerciseTarget],
+    daily_totals: list[dict[str, Any]],
+    start_date: date,
+    end_date: date,
+) -> list[dict[str, Any]]:
+    """運動習慣ごとの実施状況を計算する。
+
+    Args:
+        targets: 運動習慣の目標値
+        daily_totals: ExerciseLogRepository.get_daily_totals_by_habit の結果
+        start_date: 期間の開始日（JST）
+        end_date: 期間の終了日（JST、この日を含む）
+
+    Returns:
+        習慣ごとの実施状況の辞書リスト。completion_rate は目標を満たした枠の割合、
+        credit_rate は部分達成度の平均
+    """
+    totals = {(row["habit_id"], row["date"]): row for row in daily_totals}
+    slots_by_habit = _slots(targets, start_date, end_date)
+
+    results = []
+    for target in targets:
+        slots = slots_by_habit[target.habit_id]
+        credits = [
+            max(day_credit(target.targets, totals.get((target.habit_id, d))) for d in slot)
+            for slot in slots
+        ]
+        completed = sum(1 for c in credits if c >= 1.0)
+        results.append(
+            {
+                "habit_id": target.habit_id,
+                "title": target.title,
+                "exercise_name": target.exercise_name,
+                "targets": target.targets,
+                "unit": "week" if target.schedule.weekly else "day",
+                "scheduled": len(slots),
+                "done": sum(1 for c in credits if c > 0),
+                "completed": completed,
+                "completion_rate": round(completed / len(slots), 3) if slots else None,
+                "credit_rate": round(sum(credits) / len(slots), 3) if slots else None,
+                "recent": [
+                    {"start": slot[0].isoformat(), "credit": round(credit, 2)}
+                    for slot, credit in list(zip(slots, credits))[-RECENT_SLOTS:]
+                ],
+            }
+        )
+    return results
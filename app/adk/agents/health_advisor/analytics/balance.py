@@ -0,0 +1,71 @@
+"""筋肉群バランスの計算
+
+WeeklyMuscleVolumeRepository の週ごと・筋肉群ごとの集計から、
+対象週の筋肉群ごとの配分（セット数の割合）と前週からの増減を計算する。
+"""
+
+from typing import Any
+
+# 配分を確認する主な筋肉群（今週トレーニングしていなければ untrained に含める）
+MAJOR_MUSCLE_GROUPS = ("chest", "back", "legs", "shoulders", "arms", "core")
+
+# 集計する指標
+BALANCE_METRICS = ("sessions", "sets", "reps", "volume", "duration")
+
+
+def compute_muscle_balance(
+    current: list[dict[str, Any]],
+    previous: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """対象週と前週の集計から筋肉群のバランスを計算する。
+
+    Args:
+        current: 対象週の集計（muscle_group と BALANCE_METRICS の各指標を持つ辞書のリスト）
+        previous: 前週の集計（同じ形式）
+
+    Returns:
+        以下のキーを持つ辞書:
+        - total: 対象週の合計と前週からの増減
+        - by_muscle_group: 筋肉群ごとの指標・セット数の割合（%）・前週からの増減
+          （セット数の降順。前週のみの筋肉群も含む）
+        - untrained: 対象週にトレーニングしていない主な筋肉群
+    """
+    current_by_group = {row["muscle_group"]: row for row in current}
+    previous_by_group = {row["muscle_group"]: row for row in previous}
+
+    def totals(rows: list[dict[str, Any]]) -> dict[str, float]:
+        return {key: sum(row[key] for row in rows) for key in BALANCE_METRICS}
+
+    current_total = totals(current)
+    previous_total = totals(previous)
+
+    by_muscle_group = []
+    for group in current_by_group.keys() | previous_by_group.keys():
+        now = current_by_group.get(group)
+        before = previous_by_group.get(group)
+        metrics = {key: now[key] if now else 0 for key in BALANCE_METRICS}
+        by_muscle_group.append(
+            {
+                "muscle_group": group,
+                **metrics,
+                "volume": round(metrics["volume"], 1),
+                "set_share": (
+                    round(metrics["sets"] / current_total["sets"] * 100, 1)
+                    if current_total["sets"]
+                    else 0.0
+                ),
+                "sets_delta": metrics["sets"] - (before["sets"] if before else 0),
+                "volume_delta": round(metrics["volume"] - (before["volume"] if before else 0), 1),
+            }
+        )
+    by_muscle_group.sort(key=lambda g: (-g["sets"], -g["volume"], g["muscle_group"]))
+
+    return {
+        "total": {
+            **{key: round(value, 1) for key, value in current_total.items()},
+            "sets_delta": current_total["sets"] - previous_total["sets"],
+            "volume_delta": round(current_total["volume"] - previous_total["volume"], 1),
+        },
+        "by_muscle_group": by_muscle_group,
+        "untrained": [g for g in MAJOR_MUSCLE_GROUPS if g not in current_by_group],
+    }
@@ -0,0 +1,202 @@
+"""健康目標の数値目標の抽出
+
+健康目標の details（目標の詳細）と habits（行動計画）の文章から、1 日の目標カロリー・PFC、
+目標体重、期限、週あたりの運動回数を取り出す。目標の保存時に一度だけ実行し、
+結果を goals テーブルの型付きカラムに保存する。
+
+文章は NFKC で正規化（全角数字・記号を半角に）してから正規表現で照合する。
+見つからない項目は None（推測で埋めない）。
+"""
+
+import calendar
+import re
+import unicodedata
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+_NUMBER = r"(\d{1,5}(?:,\d{3})*(?:\.\d+)?)"
+
+_CALORIES = re.compile(_NUMBER + r"\s*(?:kcal|キロカロリー|カロリー)", re.IGNORECASE)
+
+# 1 日の目標カロリーとみなす範囲（「間食は200kcal以内」「1食あたり600kcal」等を除く）
+DAILY_CALORIE_MIN = 800
+DAILY_CALORIE_MAX = 6000
+
+# カロリーの直前（数文字以内）にある 1 日 / 1 食単位の修飾
+_DAILY_QUALIFIER = re.compile(r"(?:1日|一日|毎日|日当たり|日あたり)\D{0,8}$")
+_PER_MEAL_QUALIFIER = re.compile(r"(?:1食|一食|食あたり|食当たり|毎食|間食|おやつ)\D{0,8}$")
+
+_NUTRIENTS = {
+    "target_proteins": re.compile(
+        r"(?:タンパク質|たんぱく質|蛋白質|プロテイン|\bP)\D{0,8}?" + _NUMBER + r"\s*g",
+        re.IGNORECASE,
+    ),
+    "target_fats": re.compile(r"(?:脂質|脂肪|\bF)\D{0,8}?" + _NUMBER + r"\s*g", re.IGNORECASE),
+    "target_carbohydrates": re.compile(
+        r"(?:炭水化物|糖質|\bC)\D{0,8}?" + _NUMBER + r"\s*g", re.IGNORECASE
+    ),
+}
+
+# 「65kgまで」「体重を60kgにする」等の到達目標（「5kg減量」のような変化量は対象外）
+_WEIGHT = re.compile(
+    _NUMBER + r"\s*(?:kg|キロ)\s*(?:まで|以下|台|を目指|を目標|に(?:する|なる|落と|減ら|絞))",
+    re.IGNORECASE,
+)
+
+_DEADLINE_DATE = re.compile(r"(\d{4})\s*[年/\-]\s*(\d{1,2})\s*(?:[月/\-]\s*(?:(\d{1,2})\s*日?)?)?")
+_DEADLINE_MONTH = re.compile(r"(\d{1,2})\s*月\s*(?:(\d{1,2})\s*日|末|中|まで)")
+_DEADLINE_RELATIVE = re.compile(
+    r"(\d{1,3}|半)\s*(年|ヶ月|か月|カ月|ケ月|ヵ月|週間|日)\s*(?:で|後|以内|まで|かけて)"
+)
+
+_WEEKLY_SESSIONS = re.compile(r"週\s*(\d)\s*(?:回|日)")
+_EXERCISE_LINE = re.compile(r"運動|トレーニング|筋トレ|ジム|ラン|ジョギング|ウォーキング|ヨガ|水泳")
+
+
+@dataclass(frozen=True)
+class GoalTargets:
+    """健康目標の数値目標（goals テーブルのカラムに対応）"""
+
+    daily_calorie_target: int | None = None
+    target_proteins: int | None = None
+    target_fats: int | None = None
+    target_carbohydrates: int | None = None
+    target_weight: float | None = None
+    deadline: datetime | None = None
+    weekly_exercise_sessions: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """カラム名 → 値の辞書を返す。"""
+        return asdict(self)
+
+    def merged(self, **overrides: Any) -> "GoalTargets":
+        """None でない値で上書きした GoalTargets を返す。"""
+        values = self.as_dict()
+        values.update({k: v for k, v in overrides.items() if v is not None})
+        return GoalTargets(**values)
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def _add_months(base: datetime, months: int) -> datetime:
+    """base の months ヶ月後（月末を超える日は月末に丸める）。"""
+    month_index = base.month - 1 + months
+    year, month = base.year + month_index // 12, month_index % 12 + 1
+    day = min(base.day, calendar.monthrange(year, month)[1])
+    return base.replace(year=year, month=month, day=day)
+
+
+def _end_of_month(year: int, month: int, base: datetime) -> datetime:
+    return base.replace(year=year, month=month, day=calendar.monthrange(year, month)[1])
+
+
+def _daily_calories(text: str) -> int | None:
+    """1 日の目標カロリーを取り出す。
+
+    範囲外の値と 1 食単位の値は除き、「1日」「毎日」等の修飾がある値を優先する。
+    """
+    daily = None
+    for match in _CALORIES.finditer(text):
+        value = _number(match.group(1))
+        prefix = text[max(0, match.start() - 12) : match.start()]
+        if not DAILY_CALORIE_MIN <= value <= DAILY_CALORIE_MAX:
+            continue
+        if _PER_MEAL_QUALIFIER.search(prefix):
+            continue
+        if _DAILY_QUALIFIER.search(prefix):
+            return int(value)
+        if daily is None:
+            daily = int(value)
+    return daily
+
+
+def _deadline(text: str, now: datetime) -> datetime | None:
+    """期限を取り出す（日付の指定がなければ月末、時刻は now に揃える）。"""
+    base = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    match = _DEADLINE_DATE.search(text)
+    if match:
+        year, month = int(match.group(1)), int(match.group(2))
+        if 1 <= month <= 12:
+            if match.group(3):
+                day = min(int(match.group(3)), calendar.monthrange(year, month)[1])
+                return base.replace(year=year, month=month, day=day)
+            return _end_of_month(year, month, base)
+
+    match = _DEADLINE_MONTH.search(text)
+    if match:
+        month = int(match.group(1))
+        if 1 <= month <= 12:
+
+            def candidate(year: int) -> datetime:
+                if match.group(2):
+                    day = min(int(match.group(2)), calendar.monthrange(year, month)[1])
+                    return base.replace(year=year, month=month, day=day)
+                return _end_of_month(year, month, base)
+
+            # 今日より前の日付は来年とみなす（月ではなく日付で比べる）
+            deadline = candidate(now.year)
+            return deadline if deadline >= base else candidate(now.year + 1)
+
+    match = _DEADLINE_RELATIVE.search(text)
+    if match:
+        amount, unit = match.group(1), match.group(2)
+        if amount == "半":
+            return _add_months(base, 6) if unit == "年" else None
+        n = int(amount)
+        if unit == "年":
+            return _add_months(base, 12 * n)
+        if unit == "週間":
+            return base + timedelta(weeks=n)
+        if unit == "日":
+            return base + timedelta(days=n)
+        return _add_months(base, n)
+    return None
+
+
+def _weekly_sessions(habits: str) -> int | None:
+    """行動計画の運動の行から、週あたりの運動回数を合計する（毎日は 7 回）。"""
+    lines = [line for line in habits.splitlines() if _EXERCISE_LINE.search(line)]
+    if not lines:
+        return None
+    total = sum(int(n) for line in lines for n in _WEEKLY_SESSIONS.findall(line))
+    if total:
+        return min(total, 14)
+    if any("毎日" in line for line in lines):
+        return 7
+    return None
+
+
+def extract_goal_targets(details: str, habits: str, now: datetime) -> GoalTargets:
+    """健康目標の文章から数値目標を取り出す。
+
+    Args:
+        details: 目標の詳細（例:「3ヶ月で65kgまで減量する」）
+        habits: 行動計画（例:「- 運動：週3回ジム\\n- 食事：1日1800kcal、タンパク質120g」）
+        now: 相対的な期限（「3ヶ月で」等）の基準日時
+
+    Returns:
+        GoalTargets（見つからない項目は None）
+    """
+    details = unicodedata.normalize("NFKC", details or "")
+    habits = unicodedata.normalize("NFKC", habits or "")
+    text = f"{details}\n{habits}"
+
+    calories = _daily_calories(habits) or _daily_calories(details)
+    nutrients = {
+        key: int(_number(match.group(1)))
+        for key, pattern in _NUTRIENTS.items()
+        if (match := pattern.search(text))
+    }
+    weight = _WEIGHT.search(details) or _WEIGHT.search(habits)
+
+    return GoalTargets(
+        daily_calorie_target=calories,
+        target_weight=_number(weight.group(1)) if weight else None,
+        deadline=_deadline(details, now) or _deadline(habits, now),
+        weekly_exercise_sessions=_weekly_sessions(habits),
+        **nutrients,
+    )
@@ -0,0 +1,175 @@
+"""PFC 達成率エンジン
+
+食事習慣（Habit）の目標値と、日付 × 食事種別ごとの実績合計から
+達成率・不足量・連続達成日数を計算する。
+
+実績は「日付 × 栄養素」の列（日数分の配列）に展開し、全日分をまとめて
+要素ごとの演算で計算する。日ごとに DB を引いたりループで判定を重ねたりしない。
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from .schedule import weekday_mask
+
+NUTRIENTS = ("calories", "proteins", "fats", "carbohydrates")
+
+# 目標に対する許容幅（±15%）
+ACHIEVEMENT_TOLERANCE = 0.15
+
+# 直近の日別内訳として返す日数
+RECENT_DAYS = 7
+
+
+@dataclass(frozen=True)
+class MealTarget:
+    """食事習慣の目標値"""
+
+    habit_id: str
+    title: str
+    meal_type: str
+    targets: dict[str, float]
+    weekdays: int
+
+    @classmethod
+    def from_habit(cls, habit: Any) -> "MealTarget | None":
+        """Habit から目標値を取り出す。目標値が 1 つもない場合は None。"""
+        targets = {
+            "calories": habit.target_calories,
+            "proteins": habit.target_proteins,
+            "fats": habit.target_fats,
+            "carbohydrates": habit.target_carbohydrates,
+        }
+        targets = {k: float(v) for k, v in targets.items() if v}
+        if not habit.meal_type or not targets:
+            return None
+        return cls(
+            habit_id=habit.id,
+            title=habit.title,
+            meal_type=habit.meal_type,
+            targets=targets,
+            weekdays=weekday_mask(habit.days_of_week),
+        )
+
+
+def _is_achieved(nutrient: str, ratio: float) -> bool:
+    """栄養素ごとの達成判定。
+
+    - calories: 目標の ±15% 以内
+    - proteins: 目標の 85% 以上（多い分には問題ない）
+    - fats, carbohydrates: 目標の 115% 以下
+    """
+    if nutrient == "calories":
+        return abs(ratio - 1.0) <= ACHIEVEMENT_TOLERANCE
+    if nutrient == "proteins":
+        return ratio >= 1.0 - ACHIEVEMENT_TOLERANCE
+    return ratio <= 1.0 + ACHIEVEMENT_TOLERANCE
+
+
+def _streaks(flags: list[bool]) -> tuple[int, int]:
+    """連続達成日数（現在, 最長）を返す。flags は対象日のみの時系列。"""
+    longest = run = 0
+    for flag in flags:
+        run = run + 1 if flag else 0
+        longest = max(longest, run)
+    return run, longest
+
+
+def _mean(values: list[float]) -> float | None:
+    return round(sum(values) / len(values), 3) if values else None
+
+
+def compute_pfc_achievement(
+    targets: list[MealTarget],
+    daily_totals: list[dict[str, Any]],
+    start_date: date,
+    end_date: date,
+) -> list[dict[str, Any]]:
+    """食事習慣ごとの PFC 達成状況を計算する。
+
+    Args:
+        targets: 食事習慣の目標値
+        daily_totals: DietLogRepository.get_daily_totals_by_meal_type の結果
+        start_date: 期間の開始日（JST）
+        end_date: 期間の終了日（JST、この日を含む）
+
+    Returns:
+        習慣ごとの達成状況の辞書リスト
+    """
+    days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    index = {d: i for i, d in enumerate(days)}
+
+    # 食事種別ごとに「栄養素 → 日数分の配列」へ展開する
+    columns: dict[str, dict[str, list[float]]] = {}
+    logged: dict[str, list[bool]] = {}
+    for row in daily_totals:
+        i = index.get(row["date"])
+        if i is None:
+            continue
+        meal_type = row["meal_type"]
+        if meal_type not in columns:
+            columns[meal_type] = {n: [0.0] * len(days) for n in NUTRIENTS}
+            logged[meal_type] = [False] * len(days)
+        for n in NUTRIENTS:
+            columns[meal_type][n][i] = float(row[n] or 0.0)
+        logged[meal_type][i] = row["meal_count"] > 0
+
+    empty = [0.0] * len(days)
+    weekdays = [d.weekday() for d in days]
+    results = []
+
+    for target in targets:
+        actual = columns.get(target.meal_type, {})
+        has_log = logged.get(target.meal_type, [False] * len(days))
+        scheduled = [bool(target.weekdays >> wd & 1) for wd in weekdays]
+
+        ratios = {
+            n: [a / t for a in actual.get(n, empty)]
+            for n, t in target.targets.items()
+        }
+        deficits = {
+            n: [t - a for a in actual.get(n, empty)]
+            for n, t in target.targets.items()
+        }
+        # 全ての目標栄養素を満たし、かつ記録がある日を達成とする
+        achieved = [
+            has_log[i] and all(_is_achieved(n, ratios[n][i]) for n in ratios)
+            for i in range(len(days))
+        ]
+
+        target_idx = [i for i, s in enumerate(scheduled) if s]
+        logged_idx = [i for i in target_idx if has_log[i]]
+        achieved_flags = [achieved[i] for i in target_idx]
+        current_streak, longest_streak = _streaks(achieved_flags)
+
+        results.append(
+            {
+                "habit_id": target.habit_id,
+                "title": target.title,
+                "meal_type": target.meal_type,
+                "targets": target.targets,
+                "scheduled_days": len(target_idx),
+                "logged_days": len(logged_idx),
+                "achieved_days": sum(achieved_flags),
+                "achievement_rate": (
+                    round(sum(achieved_flags) / len(target_idx), 3) if target_idx else None
+                ),
+                # 平均は記録がある日のみで計算する（未記録日は 0 で薄まるため）
+                "avg_ratio": {n: _mean([ratios[n][i] for i in logged_idx]) for n in ratios},
+                "avg_deficit": {n: _mean([deficits[n][i] for i in logged_idx]) for n in deficits},
+                "current_streak": current_streak,
+                "longest_streak": longest_streak,
+                "recent_days": [
+                    {
+                        "date": days[i].isoformat(),
+                        "logged": has_log[i],
+                        "achieved": achieved[i],
+                        "ratio": {n: round(ratios[n][i], 2) for n in ratios},
+                    }
+                    for i in target_idx[-RECENT_DAYS:]
+                ],
+            }
+        )
+
+    return results
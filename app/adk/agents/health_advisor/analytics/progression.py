@@ -0,0 +1,126 @@
+"""筋力の推移エンジン
+
+ExerciseLogRepository.get_session_series のセッションごとの指標から、
+推定 1RM の移動平均・傾き（kg/週）・ベストを計算し、間引いた時系列を返す。
+
+セッションを「指標 → 配列」の列に展開し、移動平均は累積和、
+傾きは最小二乗法で全セッション分をまとめて計算する。
+"""
+
+from datetime import datetime
+from typing import Any
+
+from ..utils import JST, to_utc
+
+# 推定 1RM の計算式
+E1RM_FORMULAS = ("epley", "brzycki")
+
+# 移動平均のセッション数
+DEFAULT_ROLLING_WINDOW = 4
+
+# 返す時系列の最大点数
+DEFAULT_MAX_POINTS = 20
+
+
+def _rolling_mean(values: list[float], window: int) -> list[float]:
+    """累積和で移動平均を計算する（先頭は揃っている分だけで平均する）。"""
+    prefix = [0.0]
+    for v in values:
+        prefix.append(prefix[-1] + v)
+    return [
+        (prefix[i + 1] - prefix[max(0, i + 1 - window)]) / min(i + 1, window)
+        for i in range(len(values))
+    ]
+
+
+def _slope_per_week(days: list[float], values: list[float]) -> float | None:
+    """最小二乗法で 1 週間あたりの変化量を計算する。"""
+    n = len(days)
+    if n < 2:
+        return None
+    mean_x = sum(days) / n
+    mean_y = sum(values) / n
+    var_x = sum((x - mean_x) ** 2 for x in days)
+    if var_x == 0:
+        return None
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(days, values))
+    return cov / var_x * 7
+
+
+def _downsample(n: int, max_points: int, values: list[float]) -> list[int]:
+    """時系列を max_points 個のバケットに分け、各バケットの最大値のインデックスを返す。
+
+    最新のセッションは必ず含める。
+    """
+    if n <= max_points:
+        return list(range(n))
+    bucket = n / max_points
+    indices = []
+    for b in range(max_points):
+        lo, hi = int(b * bucket), int((b + 1) * bucket)
+        indices.append(max(range(lo, hi), key=values.__getitem__))
+    if indices[-1] != n - 1:
+        indices[-1] = n - 1
+    return indices
+
+
+def compute_progression(
+    sessions: list[dict[str, Any]],
+    formula: str = "epley",
+    window: int = DEFAULT_ROLLING_WINDOW,
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> dict[str, Any]:
+    """セッションごとの指標から筋力の推移を計算する。
+
+    Args:
+        sessions: get_session_series の結果（記録日時の昇順）
+        formula: 推定 1RM の計算式（"epley" または "brzycki"）
+        window: 移動平均のセッション数
+        max_points: 返す時系列の最大点数
+
+    Returns:
+        summary（最新値・ベスト・変化量・傾き）と series（間引いた時系列）を持つ辞書
+    """
+    key = f"e1rm_{formula}"
+    # Brzycki は高レップのセットで NULL になるため、Epley で補う
+    e1rm = [float(s[key] if s[key] is not None else s["e1rm_epley"]) for s in sessions]
+    top_weight = [float(s["top_weight"]) for s in sessions]
+    volume = [float(s["volume"]) for s in sessions]
+    # 日付は JST で表示する（タイムゾーンなしの日時は UTC とみなす）
+    recorded: list[datetime] = [to_utc(s["recorded_at"]).astimezone(JST) for s in sessions]
+
+    n = len(sessions)
+    if n == 0:
+        return {"summary": None, "series": []}
+
+    origin = recorded[0]
+    days = [(r - origin).total_seconds() / 86400 for r in recorded]
+    rolling = _rolling_mean(e1rm, max(window, 1))
+    best_idx = max(range(n), key=e1rm.__getitem__)
+    e1rm_slope = _slope_per_week(days, e1rm)
+    volume_slope = _slope_per_week(days, volume)
+
+    summary = {
+        "sessions": n,
+        "first_date": recorded[0].date().isoformat(),
+        "last_date": recorded[-1].date().isoformat(),
+        "latest_e1rm": round(e1rm[-1], 1),
+        "best_e1rm": round(e1rm[best_idx], 1),
+        "best_e1rm_date": recorded[best_idx].date().isoformat(),
+        "best_top_weight": max(top_weight),
+        "e1rm_change": round(rolling[-1] - rolling[0], 1),
+        "e1rm_slope_kg_per_week": round(e1rm_slope, 2) if e1rm_slope is not None else None,
+        "volume_slope_kg_per_week": round(volume_slope, 1) if volume_slope is not None else None,
+    }
+
+    series = [
+        {
+            "date": recorded[i].date().isoformat(),
+            "top_set": f"{top_weight[i]:g}kg x {sessions[i]['top_reps']:g}",
+            "e1rm": round(e1rm[i], 1),
+            "e1rm_rolling": round(rolling[i], 1),
+            "volume": round(volume[i], 1),
+        }
+        for i in _downsample(n, max(max_points, 2), e1rm)
+    ]
+    return {"summary": summary, "series": series}
@@ -0,0 +1,114 @@
+"""自己ベスト（Personal Record）の候補計算
+
+運動ログ 1 件のセット情報から、自己ベストの指標ごとの候補値を計算する。
+既存の自己ベストとの比較・保存は PersonalRecordRepository が行う。
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+# 指標ごとの比較方向（True: 大きいほど良い、False: 小さいほど良い）
+RECORD_METRICS = {
+    "max_weight": True,  # 最大重量（kg）
+    "max_reps": True,  # 重量ごとの最大レップ数
+    "best_e1rm": True,  # 推定 1RM（kg、Epley 式）
+    "longest_distance": True,  # 1 セッションの最長距離（km）
+    "fastest_pace": False,  # 最速ペース（秒/km）
+}
+
+# 重量に依存しない指標の weight の値
+NO_WEIGHT = 0.0
+
+# max_reps を記録する重量の下限（最大重量に対する比率）。ウォームアップのセットは対象外
+WORKING_WEIGHT_RATIO = 0.7
+
+
+@dataclass(frozen=True)
+class RecordCandidate:
+    """自己ベストの候補値
+
+    weight は max_reps のときのみ使用し、それ以外は NO_WEIGHT とする。
+    """
+
+    metric: str
+    weight: float
+    value: float
+
+
+def _to_float(value: Any) -> float | None:
+    """数値に変換する。数値でない値（"自重" 等）は None。"""
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+def estimate_one_rep_max(weight: float, reps: float) -> float:
+    """Epley 式で推定 1RM を計算する。1 レップの場合は重量そのもの。"""
+    if reps <= 1:
+        return weight
+    return weight * (1 + reps / 30)
+
+
+def extract_record_candidates(
+    sets: list[dict[str, Any]],
+    total_distance: float | None = None,
+    previous_max_weight: float | None = None,
+) -> list[RecordCandidate]:
+    """運動ログ 1 件から、指標ごとのベスト値を計算する。
+
+    max_reps は、既存の最大重量とこのログの最大重量の大きい方に WORKING_WEIGHT_RATIO を
+    掛けた重量以上のセットのみを対象にする（ウォームアップの軽い重量を自己ベストにしない）。
+
+    Args:
+        sets: セット情報のリスト（[{"reps": 10, "weight": 50}, ...]）
+        total_distance: 総距離（km、省略時はセットの距離の合計）
+        previous_max_weight: 既存の最大重量の自己ベスト（kg、ない場合は None）
+
+    Returns:
+        RecordCandidate のリスト（指標 × 重量ごとに 1 件）
+    """
+    best: dict[tuple[str, float], float] = {}
+
+    def offer(metric: str, value: float, weight: float = NO_WEIGHT) -> None:
+        key = (metric, weight)
+        current = best.get(key)
+        if current is None or (value > current if RECORD_METRICS[metric] else value < current):
+            best[key] = value
+
+    parsed = [
+        (
+            _to_float(s.get("weight")),
+            _to_float(s.get("reps")),
+            _to_float(s.get("duration")),
+            _to_float(s.get("distance")),
+        )
+        for s in (sets if isinstance(sets, list) else [])
+        if isinstance(s, dict)
+    ]
+    max_weight = max(
+        [w for w, _, _, _ in parsed if w is not None] + [previous_max_weight or 0.0]
+    )
+    working_weight = max_weight * WORKING_WEIGHT_RATIO
+
+    set_distance = 0.0
+    for weight, reps, duration, distance in parsed:
+        if weight is not None:
+            offer("max_weight", weight)
+            if reps is not None:
+                if weight >= working_weight:
+                    offer("max_reps", reps, weight=round(weight, 2))
+                offer("best_e1rm", round(estimate_one_rep_max(weight, reps), 2))
+        if distance is not None:
+            set_distance += distance
+            if duration is not None:
+                offer("fastest_pace", round(duration / distance, 1))
+
+    distance = _to_float(total_distance) or set_distance
+    if distance:
+        offer("longest_distance", distance)
+
+    return [RecordCandidate(metric, weight, value) for (metric, weight), value in best.items()]
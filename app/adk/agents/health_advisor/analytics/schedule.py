@@ -0,0 +1,200 @@
+"""習慣スケジュールの曜日判定と予定の展開
+
+Habit の frequency / days_of_week を曜日のビットマスクに変換する。
+ビット i は datetime.date.weekday() == i（0=月曜, 6=日曜）に対応する。
+
+期間内の予定（occurrence）への展開は、期間の日数分のビット列（ビット k = 開始日から k 日目）
+で行う。曜日マスクごとの「期間内の該当日」のビット列を 1 回だけ作り、習慣ごとには
+有効期間のビット列との AND を取るだけにする。日ごとのループは回さず、予定日のビットだけを
+取り出して日付に変換し、習慣ごとのソート済みの列を heapq.merge でまとめる。
+"""
+
+import heapq
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, NamedTuple
+
+from ..utils import JST, to_utc
+
+WEEKDAY_NAMES = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+# 全曜日
+EVERY_DAY_MASK = (1 << len(WEEKDAY_NAMES)) - 1
+
+
+def weekday_mask(days_of_week: Any) -> int:
+    """days_of_week（["monday", "friday"] 等）を曜日のビットマスクに変換する。
+
+    未指定・不正な値の場合は全曜日を返す。
+
+    Args:
+        days_of_week: Habit.days_of_week の値
+
+    Returns:
+        曜日のビットマスク
+    """
+    if not isinstance(days_of_week, list):
+        return EVERY_DAY_MASK
+
+    mask = 0
+    for name in days_of_week:
+        if not isinstance(name, str):
+            continue
+        key = name.strip().lower()
+        for i, weekday in enumerate(WEEKDAY_NAMES):
+            # "mon" などの省略形も許容する
+            if key and weekday.startswith(key[:3]):
+                mask |= 1 << i
+                break
+    return mask or EVERY_DAY_MASK
+
+
+def to_jst_date(value: datetime | None) -> date | None:
+    """習慣の開始日時・終了日時を JST の日付に変換する。
+
+    タイムゾーンなしの日時は UTC とみなす（Prisma の TIMESTAMP(3) と同じ）。
+    """
+    if value is None:
+        return None
+    return to_utc(value).astimezone(JST).date()
+
+
+@dataclass(frozen=True)
+class HabitSchedule:
+    """習慣のスケジュール"""
+
+    habit_id: str
+    user_id: str
+    habit_type: str
+    title: str
+    weekdays: int
+    weekly: bool
+    time_of_day: str | None
+    start_date: date | None
+    end_date: date | None
+
+    @classmethod
+    def from_habit(cls, habit: Any) -> "HabitSchedule":
+        """Habit からスケジュールを取り出す。
+
+        曜日指定のない週単位の習慣（frequency="weekly"）は、週に 1 回どの日に行ってもよい予定とみなす。
+        """
+        has_days = isinstance(habit.days_of_week, list) and bool(habit.days_of_week)
+        return cls(
+            habit_id=habit.id,
+            user_id=habit.user_id,
+            habit_type=habit.habit_type,
+            title=habit.title,
+            weekdays=weekday_mask(habit.days_of_week),
+            weekly=habit.frequency == "weekly" and not has_days,
+            time_of_day=habit.time_of_day,
+            start_date=to_jst_date(habit.start_date),
+            end_date=to_jst_date(habit.end_date),
+        )
+
+
+class Occurrence(NamedTuple):
+    """習慣の予定 1 回分
+
+    タプルの順序（日付, 時刻, ユーザー ID, 習慣 ID）で並ぶ。時刻未指定は空文字（その日の先頭）。
+    weekly が True の予定は date を含む ISO 週のどの日に行ってもよい（date は週の最初の有効日）。
+    """
+
+    date: date
+    time_of_day: str
+    user_id: str
+    habit_id: str
+    weekly: bool
+
+
+def _weekday_bits(start: date, days: int, mask: int) -> int:
+    """start から days 日間のうち、曜日が mask に含まれる日のビット列を返す。"""
+    # 開始日の曜日に合わせて 7 日分のパターンを回転し、掛け算で期間の週数分だけ繰り返す
+    offset = start.weekday()
+    pattern = sum(1 << k for k in range(7) if mask >> ((offset + k) % 7) & 1)
+    weeks = -(-days // 7)
+    repeat = ((1 << (7 * weeks)) - 1) // 0x7F
+    return (pattern * repeat) & ((1 << days) - 1)
+
+
+def _window_bits(schedule: HabitSchedule, start: date, days: int) -> tuple[int, int]:
+    """習慣の有効期間を期間内の日のインデックス範囲 [lo, hi) で返す。"""
+    lo = 0 if schedule.start_date is None else max((schedule.start_date - start).days, 0)
+    hi = days if schedule.end_date is None else min((schedule.end_date - start).days + 1, days)
+    return lo, max(hi, lo)
+
+
+def _iter_bits(bits: int) -> Iterator[int]:
+    """立っているビットのインデックスを昇順に返す。"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def _stream(schedule: HabitSchedule, start: date, bits: int) -> Iterator[Occurrence]:
+    """ビット列を習慣の予定の列（日付順）に変換する。"""
+    ordinal = start.toordinal()
+    time_of_day = schedule.time_of_day or ""
+    for k in _iter_bits(bits):
+        yield Occurrence(
+            date.fromordinal(ordinal + k),
+            time_of_day,
+            schedule.user_id,
+            schedule.habit_id,
+            schedule.weekly,
+        )
+
+
+def expand_occurrences(
+    schedules: Iterable[HabitSchedule],
+    start: date,
+    end: date,
+) -> Iterator[Occurrence]:
+    """習慣のスケジュールを期間内の予定に展開する。
+
+    複数ユーザーの習慣をまとめて渡してよい。結果は（日付, 時刻, ユーザー ID, 習慣 ID）の順に
+    ソートされた列で、必要な分だけ遅延して生成する。
+
+    Args:
+        schedules: 習慣のスケジュール
+        start: 期間の開始日
+        end: 期間の終了日（この日を含む）
+
+    Returns:
+        予定（Occurrence）のイテレータ
+    """
+    days = (end - start).days + 1
+    if days <= 0:
+        return iter(())
+
+    calendars: dict[int, int] = {}
+
+    def calendar(mask: int) -> int:
+        if mask not in calendars:
+            calendars[mask] = _weekday_bits(start, days, mask)
+        return calendars[mask]
+
+    streams = []
+    for schedule in schedules:
+        lo, hi = _window_bits(schedule, start, days)
+        if lo >= hi:
+            continue
+        window = ((1 << hi) - 1) ^ ((1 << lo) - 1)
+        if schedule.weekly:
+            # ISO 週ごとに 1 回（週の最初の有効日）
+            bits = (calendar(1) & window) | (1 << lo)
+        else:
+            bits = calendar(schedule.weekdays or EVERY_DAY_MASK) & window
+        streams.append(_stream(schedule, start, bits))
+    return heapq.merge(*streams)
+
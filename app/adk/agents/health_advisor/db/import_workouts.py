@@ -0,0 +1,448 @@
+"""過去の運動記録の一括インポート
+
+他のトレーニングアプリからエクスポートした CSV / JSON を読み込み、
+ExerciseLog として一括登録するオフライン用のエントリーポイント。
+
+- ファイルはストリームで読み、batch_size 件の運動ログごとに書き込むため、
+  メモリ使用量はファイルサイズに依存しない
+- 1 行 1 セットの形式（Strong などのエクスポート）を想定し、連続する
+  同じ日時・同じ種目の行を 1 件の運動ログにまとめる
+- 運動ログの ID は（ユーザー、運動名、日時、出現順）から決定的に生成し、
+  ON CONFLICT DO NOTHING で書き込むため、同じファイルを再インポートしても重複しない
+- 運動名は別名索引で運動種目に解決し（「Bench Press (Barbell)」等の器具の括弧書きは
+  除いて解決する）、自己ベストと週ごとの集計も更新する
+
+入力形式:
+    CSV: ヘッダー付き。列名は以下のいずれか（大文字小文字・括弧内の単位は無視する）
+        日時: Date, recorded_at, datetime / 運動名: Exercise Name, exercise, exercise_name
+        重量: Weight, weight_kg / レップ数: Reps / 時間: Seconds, duration（秒または mm:ss）
+        距離: Distance, distance_km / 重量の単位: Weight Unit（kg / lbs）/ メモ: Notes, note
+        カテゴリ: category / 筋肉群: muscle_group, body_part
+    JSON: 上記のキーを持つオブジェクトの配列、または JSON Lines。
+        {"exercise_name": ..., "recorded_at": ..., "sets": [{"reps": 10, "weight": 50}]}
+        のように運動ログ単位のオブジェクトも受け付ける
+
+使用方法:
+    cd app/adk
+    export CLOUD_SQL_INSTANCE=aizap-dev:asia-northeast1:aizap-postgres-dev
+    export DB_NAME=aizap
+    uv run python -m agents.health_advisor.db.import_workouts \\
+        --user-id U1234567890 strong_export.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import re
+import sys
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, TextIO
+
+from ..logger import get_logger
+from ..utils import JST
+from .config import get_async_session
+from .models import Exercise, ExerciseLog
+from .repositories import ExerciseLogRepository, UserSessionRepository
+
+logger = get_logger(__name__)
+
+# インポートした運動ログの ID の名前空間（uuid5）
+IMPORT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "aizap:exercise-logs:import")
+
+# 1 回の INSERT で書き込む運動ログ数
+DEFAULT_BATCH_SIZE = 500
+
+# JSON 配列を読み込む単位（文字数）
+JSON_CHUNK_SIZE = 64 * 1024
+
+# ポンド → kg / マイル → km
+LBS_TO_KG = 0.45359237
+MILES_TO_KM = 1.609344
+
+# 入力の列名（正規化後）→ フィールド名
+FIELD_ALIASES = {
+    "recorded_at": ("recorded_at", "date", "datetime", "start_time", "日時", "日付"),
+    "exercise_name": ("exercise_name", "exercise", "name", "運動名", "種目"),
+    "weight": ("weight", "weight_kg", "重量"),
+    "reps": ("reps", "repetitions", "レップ数", "回数"),
+    "duration": ("duration", "seconds", "duration_seconds", "時間"),
+    "distance": ("distance", "distance_km", "距離"),
+    "weight_unit": ("weight_unit",),
+    "note": ("note", "notes", "memo", "メモ"),
+    "category": ("category", "カテゴリ"),
+    "muscle_group": ("muscle_group", "body_part", "筋肉群", "部位"),
+    "sets": ("sets",),
+}
+_FIELD_BY_ALIAS = {alias: field for field, aliases in FIELD_ALIASES.items() for alias in aliases}
+
+
+@dataclass
+class ImportStats:
+    """インポート結果"""
+
+    rows: int = 0
+    invalid_rows: int = 0
+    logs: int = 0
+    created: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def skipped(self) -> int:
+        """既にインポート済みでスキップした運動ログ数"""
+        return self.logs - self.created
+
+    def summary(self) -> str:
+        elapsed = max(self.elapsed, 1e-9)
+        return (
+            f"{self.rows} 行（不正 {self.invalid_rows} 行）→ 運動ログ {self.logs} 件"
+            f"（作成 {self.created} 件、重複スキップ {self.skipped} 件）/ "
+            f"{self.elapsed:.1f} 秒（{self.rows / elapsed:.0f} 行/秒、"
+            f"{self.logs / elapsed:.0f} ログ/秒）"
+        )
+
+
+def _field_name(key: str) -> str | None:
+    """入力の列名をフィールド名に変換する（"Weight (kg)" → "weight"）。"""
+    normalized = re.sub(r"\(.*?\)|（.*?）", "", key).strip().lower()
+    return _FIELD_BY_ALIAS.get(re.sub(r"[\s\-]+", "_", normalized))
+
+
+def _normalize_item(item: dict[str, Any]) -> dict[str, Any]:
+    """入力の 1 行（またはオブジェクト）のキーをフィールド名に揃える。"""
+    normalized = {}
+    for key, value in item.items():
+        field = _field_name(str(key))
+        if field is not None and field not in normalized:
+            normalized[field] = value
+    return normalized
+
+
+def _number(value: Any) -> float | None:
+    """数値に変換する。空・0 以下・数値でない値は None。"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        value = value.replace(",", "").strip()
+        if not value:
+            return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+def _seconds(value: Any) -> int | None:
+    """秒数に変換する。"mm:ss" / "hh:mm:ss" 形式も受け付ける。"""
+    if isinstance(value, str) and ":" in value:
+        try:
+            parts = [float(p) for p in value.strip().split(":")]
+        except ValueError:
+            return None
+        seconds = 0.0
+        for part in parts:
+            seconds = seconds * 60 + part
+        return int(seconds) or None
+    number = _number(value)
+    return int(number) if number is not None else None
+
+
+def _parse_datetime(value: Any) -> datetime:
+    """日時に変換する。タイムゾーンなしの日時は JST とみなす。
+
+    Raises:
+        ValueError: 日時の形式が不正な場合
+    """
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"日時が不正です: {value!r}")
+    parsed = datetime.fromisoformat(value.strip().replace("/", "-"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=JST)
+
+
+def _build_set(item: dict[str, Any], weight_unit: str, distance_unit: str) -> dict[str, Any]:
+    """1 行分のセットの辞書を作る（値のないキーは含めない）。"""
+    weight = _number(item.get("weight"))
+    unit = str(item.get("weight_unit") or weight_unit).strip().lower()
+    if weight is not None and unit.startswith("lb"):
+        weight = round(weight * LBS_TO_KG, 2)
+    distance = _number(item.get("distance"))
+    if distance is not None and distance_unit == "mi":
+        distance = round(distance * MILES_TO_KM, 3)
+    reps = _number(item.get("reps"))
+    s = {
+        "reps": int(reps) if reps is not None else None,
+        "weight": weight,
+        "duration": _seconds(item.get("duration")),
+        "distance": distance,
+    }
+    return {k: v for k, v in s.items() if v is not None}
+
+
+def read_csv(stream: TextIO) -> Iterator[dict[str, Any]]:
+    """CSV を 1 行ずつ読む。"""
+    yield from csv.DictReader(stream)
+
+
+def read_json(stream: TextIO, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[dict[str, Any]]:
+    """JSON 配列または JSON Lines を 1 オブジェクトずつ読む。
+
+    配列は chunk_size 文字ずつ読み込みながら要素ごとにデコードするため、
+    メモリに載るのは読み込み中のチャンクと要素 1 つ分だけになる。
+    """
+    decoder = json.JSONDecoder()
+    buffer = stream.read(chunk_size)
+    start = len(buffer) - len(buffer.lstrip())
+    if buffer[start : start + 1] != "[":
+        # JSON Lines（読み込み済みの先頭チャンクから続けて行ごとに読む）
+        for line in _lines(buffer, stream):
+            if line.strip():
+                yield json.loads(line)
+        return
+
+    pos = start + 1
+    eof = False
+    while True:
+        # 区切りの空白とカンマを読み飛ばす
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer, pos = stream.read(chunk_size), 0
+            eof = not buffer
+        if pos >= len(buffer) or buffer[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield item
+        pos = end
+
+
+def _lines(head: str, stream: TextIO) -> Iterator[str]:
+    """読み込み済みの先頭部分と残りのストリームを行ごとに返す。"""
+    rest = ""
+    for line in head.splitlines(keepends=True):
+        if line.endswith(("\n", "\r")):
+            yield rest + line
+            rest = ""
+        else:
+            rest += line
+    for line in stream:
+        yield rest + line
+        rest = ""
+    if rest:
+        yield rest
+
+
+def iter_set_rows(
+    items: Iterable[dict[str, Any]],
+    stats: ImportStats,
+    weight_unit: str = "kg",
+    distance_unit: str = "km",
+) -> Iterator[dict[str, Any]]:
+    """入力の行をセット単位の行に変換する。
+
+    運動ログ単位のオブジェクト（sets を持つ）はセットごとに展開する。
+    日時・運動名が不正な行は stats.invalid_rows に数えて読み飛ばす。
+
+    Yields:
+        recorded_at, exercise_name, set, note, category, muscle_group を持つ辞書
+        （set は値がない場合 None）
+    """
+    for raw in items:
+        stats.rows += 1
+        item = _normalize_item(raw) if isinstance(raw, dict) else {}
+        try:
+            recorded_at = _parse_datetime(item.get("recorded_at"))
+        except ValueError as e:
+            stats.invalid_rows += 1
+            logger.warning("不正な行を読み飛ばしました", row=stats.rows, error=str(e))
+            continue
+        exercise_name = str(item.get("exercise_name") or "").strip()
+        if not exercise_name:
+            stats.invalid_rows += 1
+            logger.warning("運動名のない行を読み飛ばしました", row=stats.rows)
+            continue
+
+        base = {
+            "recorded_at": recorded_at,
+            "exercise_name": exercise_name,
+            "note": item.get("note") or None,
+            "category": item.get("category") or None,
+            "muscle_group": item.get("muscle_group") or None,
+        }
+        sets = item.get("sets")
+        if isinstance(sets, list):
+            for s in sets:
+                s = _normalize_item(s) if isinstance(s, dict) else {}
+                yield {**base, "set": _build_set(s, weight_unit, distance_unit) or None}
+        else:
+            yield {**base, "set": _build_set(item, weight_unit, distance_unit) or None}
+
+
+def iter_logs(user_id: str, set_rows: Iterable[dict[str, Any]]) -> Iterator[ExerciseLog]:
+    """連続する同じ日時・同じ種目のセットを 1 件の運動ログにまとめる。
+
+    ID は（ユーザー、運動名、日時、同じ日時での出現順）から uuid5 で生成する。
+    セットが 1 つもないログは作らない。
+    """
+    occurrences: dict[str, int] = {}
+    current_at: datetime | None = None
+
+    for (recorded_at, exercise_name), group in itertools.groupby(
+        set_rows, key=lambda r: (r["recorded_at"], r["exercise_name"])
+    ):
+        rows = list(group)
+        sets = [r["set"] for r in rows if r["set"]]
+        if not sets:
+            continue
+
+        # 出現順は日時ごとに数える（日時が変わったらリセットしてメモリを抑える）
+        if recorded_at != current_at:
+            occurrences.clear()
+            current_at = recorded_at
+        occurrence = occurrences.get(exercise_name, 0)
+        occurrences[exercise_name] = occurrence + 1
+
+        reps = [s["reps"] for s in sets if "reps" in s]
+        durations = [s["duration"] for s in sets if "duration" in s]
+        distances = [s["distance"] for s in sets if "distance" in s]
+        volume = sum(s.get("reps", 0) * s.get("weight", 0) for s in sets)
+        notes = list(dict.fromkeys(r["note"] for r in rows if r["note"]))
+
+        log = ExerciseLog(
+            id=str(
+                uuid.uuid5(
+                    IMPORT_NAMESPACE,
+                    f"{user_id}|{exercise_name}|{recorded_at.isoformat()}|{occurrence}",
+                )
+            ),
+            user_id=user_id,
+            exercise_name=exercise_name,
+            category=next((r["category"] for r in rows if r["category"]), None),
+            muscle_group=next((r["muscle_group"] for r in rows if r["muscle_group"]), None),
+            total_sets=len(sets),
+            total_reps=sum(reps) if reps else None,
+            total_duration=sum(durations) if durations else None,
+            total_distance=round(sum(distances), 3) if distances else None,
+            total_volume=round(volume, 2) if volume else None,
+            note="\n".join(notes) or None,
+            recorded_at=recorded_at,
+        )
+        log.sets = sets
+        yield log
+
+
+async def import_workouts(
+    path: Path,
+    user_id: str,
+    file_format: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    weight_unit: str = "kg",
+    distance_unit: str = "km",
+    dry_run: bool = False,
+) -> ImportStats:
+    """エクスポートファイルを読み込み、運動ログとして一括登録する。
+
+    Args:
+        path: 入力ファイル
+        user_id: インポート先のユーザー ID
+        file_format: "csv" または "json"（省略時は拡張子から判定）
+        batch_size: 1 回の INSERT で書き込む運動ログ数（バッチごとにコミットする）
+        weight_unit: 重量の単位列がない場合の単位（"kg" または "lbs"）
+        distance_unit: 距離の単位（"km" または "mi"）
+        dry_run: True の場合は書き込まずに件数だけ数える
+
+    Returns:
+        ImportStats
+
+    Raises:
+        ValueError: ユーザーが存在しない場合、形式が不明な場合
+    """
+    file_format = file_format or ("csv" if path.suffix.lower() == ".csv" else "json")
+    if file_format not in ("csv", "json"):
+        raise ValueError(f"未対応の形式です: {file_format}")
+
+    stats = ImportStats()
+    started = time.perf_counter()
+    exercises: dict[str, Exercise | None] = {}
+
+    with path.open(encoding="utf-8-sig", newline="") as stream:
+        items = read_csv(stream) if file_format == "csv" else read_json(stream)
+        logs = iter_logs(user_id, iter_set_rows(items, stats, weight_unit, distance_unit))
+
+        if dry_run:
+            stats.logs = sum(1 for _ in logs)
+            stats.elapsed = time.perf_counter() - started
+            return stats
+
+        async with get_async_session() as session:
+            if await UserSessionRepository(session).get_by_user_id(user_id) is None:
+                raise ValueError(f"ユーザーが存在しません: {user_id}")
+
+            repo = ExerciseLogRepository(session)
+            for batch in itertools.batched(logs, max(batch_size, 1)):
+                created = await repo.create_logs(list(batch), exercises=exercises)
+                await session.commit()
+                stats.logs += len(batch)
+                stats.created += len(created)
+                stats.elapsed = time.perf_counter() - started
+                logger.info(
+                    "運動ログをインポートしました",
+                    user_id=user_id,
+                    logs=stats.logs,
+                    created=stats.created,
+                    rows_per_second=round(stats.rows / max(stats.elapsed, 1e-9)),
+                )
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="過去の運動記録を一括インポートする")
+    parser.add_argument("path", type=Path, help="エクスポートファイル（CSV / JSON / JSON Lines）")
+    parser.add_argument("--user-id", required=True, help="インポート先のユーザー ID")
+    parser.add_argument("--format", choices=("csv", "json"), help="形式（省略時は拡張子から判定）")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--weight-unit", choices=("kg", "lbs"), default="kg")
+    parser.add_argument("--distance-unit", choices=("km", "mi"), default="km")
+    parser.add_argument("--dry-run", action="store_true", help="書き込まずに件数だけ確認する")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = asyncio.run(
+            import_workouts(
+                args.path,
+                args.user_id,
+                file_format=args.format,
+                batch_size=args.batch_size,
+                weight_unit=args.weight_unit,
+                distance_unit=args.distance_unit,
+                dry_run=args.dry_run,
+            )
+        )
+    except (OSError, ValueError) as e:
+        print(f"✗ インポートに失敗しました: {e}", file=sys.stderr)
+        return 1
+
+    print(f"✓ {'確認' if args.dry_run else 'インポート'}完了: {stats.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,15 +8,22 @@ Prisma スキーマ (app/worker/prisma/schema.prisma) と同じテーブル構
 from .base import Base
 from .user_session import UserSession
 from .goal import Goal
+from .exercise import Exercise, ExerciseAlias
 from .exercise_log import ExerciseLog
 from .diet_log import DietLog
 from .habit import Habit
+from .personal_record import PersonalRecord
+from .weekly_muscle_volume import WeeklyMuscleVolume
 
 __all__ = [
     "Base",
     "UserSession",
     "Goal",
+    "Exercise",
+    "ExerciseAlias",
     "ExerciseLog",
     "DietLog",
     "Habit",
+    "PersonalRecord",
+    "WeeklyMuscleVolume",
 ]
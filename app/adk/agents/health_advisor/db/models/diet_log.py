@@ -48,6 +48,7 @@ class DietLog(Base):
     estimation_source: Mapped[str] = mapped_column(String, nullable=False)  # "text", "image"
     is_user_corrected: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     image_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    image_hash: Mapped[str | None] = mapped_column(String, nullable=True)  # 画像のコンテンツハッシュ
 
     # メタデータ
     note: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -73,6 +74,8 @@ class DietLog(Base):
             "meal_type",
             recorded_at.desc(),
         ),
+        Index("ix_diet_logs_user_id_name", "user_id", "name"),
+        Index("ix_diet_logs_user_id_image_hash", "user_id", "image_hash"),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,65 @@
+"""Exercise / ExerciseAlias モデル
+
+運動種目のカタログと、表記ゆれ（別名）の索引を管理する。
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+
+
+class Exercise(Base):
+    """運動種目
+
+    Prisma モデル: Exercise
+    テーブル名: exercises
+
+    全ユーザー共通のカタログ。未登録の運動名は記録時に自動で追加される。
+    """
+
+    __tablename__ = "exercises"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    canonical_name: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    category: Mapped[str | None] = mapped_column(String, nullable=True)
+    muscle_group: Mapped[str | None] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), server_default=func.now()
+    )
+
+    # リレーション
+    aliases: Mapped[list["ExerciseAlias"]] = relationship(
+        "ExerciseAlias", back_populates="exercise", cascade="all, delete-orphan"
+    )
+
+    def __repr__(self) -> str:
+        return f"<Exercise(id={self.id}, canonical_name={self.canonical_name})>"
+
+
+class ExerciseAlias(Base):
+    """運動種目の別名
+
+    Prisma モデル: ExerciseAlias
+    テーブル名: exercise_aliases
+
+    alias は normalize_exercise_name で正規化した文字列を保存する。
+    """
+
+    __tablename__ = "exercise_aliases"
+
+    alias: Mapped[str] = mapped_column(String, primary_key=True)
+    exercise_id: Mapped[str] = mapped_column(
+        String, ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False
+    )
+
+    # リレーション
+    exercise: Mapped["Exercise"] = relationship("Exercise", back_populates="aliases")
+
+    # インデックス（Prisma と同じ）
+    __table_args__ = (Index("ix_exercise_aliases_exercise_id", "exercise_id"),)
+
+    def __repr__(self) -> str:
+        return f"<ExerciseAlias(alias={self.alias}, exercise_id={self.exercise_id})>"
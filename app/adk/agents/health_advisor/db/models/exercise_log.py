@@ -1,13 +1,32 @@
 """ExerciseLog モデル
 
 運動ログを管理する。
+
+セット情報は、数値のみのセット（reps / weight / duration / distance）であれば
+指標ごとの配列カラム（set_reps 等）にコンパクトに保存し、sets（JSONB）は NULL にする。
+それ以外のキーや数値でない値を含む場合は従来どおり sets に保存する（セットがない場合は []）。
+どちらの場合も ExerciseLog.sets はセットの辞書リストを返す。
+
+max_set_weight（セットの最大重量）は sets の書き込み時に計算して保存し、
+「100kg 以上のセットがあるログ」のような検索の絞り込みに B-tree インデックスで使う。
 """
 
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text, func
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import (
+    CheckConstraint,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -15,6 +34,82 @@ from .base import Base
 if TYPE_CHECKING:
     from .user_session import UserSession
 
+# 配列カラムに保存できるセットのキー（キー → 整数かどうか）
+SET_METRICS = {
+    "reps": True,
+    "weight": False,
+    "duration": True,
+    "distance": False,
+}
+
+
+def encode_sets(sets: Any) -> dict[str, list[Any]] | None:
+    """セットの辞書リストを指標ごとの配列に変換する。
+
+    配列カラムで表せない場合（空のセット、未知のキー、数値でない値、整数であるべき値が
+    小数）は None。セットにない指標は NULL 要素になり、全セットにない指標は配列ごと None。
+
+    Args:
+        sets: セット情報のリスト
+
+    Returns:
+        {"reps": [...], "weight": [...], "duration": [...], "distance": [...]} または None
+    """
+    if not isinstance(sets, list) or not sets:
+        return None
+
+    columns: dict[str, list[Any]] = {key: [] for key in SET_METRICS}
+    for s in sets:
+        if not isinstance(s, dict) or not s or not set(s) <= SET_METRICS.keys():
+            return None
+        for key, is_int in SET_METRICS.items():
+            value = s.get(key)
+            if value is not None:
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    return None
+                if is_int and value != int(value):
+                    return None
+                value = int(value) if is_int else float(value)
+            columns[key].append(value)
+    return {
+        key: values if any(v is not None for v in values) else None
+        for key, values in columns.items()
+    }
+
+
+def _decode_value(value: Any) -> Any:
+    # 配列カラムは倍精度で保存するため、整数値（60.0 等）は JSONB と同じ int に戻す
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def max_set_weight(sets: Any) -> float | None:
+    """セットの最大重量（数値の weight がなければ None）。"""
+    if not isinstance(sets, list):
+        return None
+    weights = [
+        float(s["weight"])
+        for s in sets
+        if isinstance(s, dict)
+        and isinstance(s.get("weight"), (int, float))
+        and not isinstance(s.get("weight"), bool)
+    ]
+    return max(weights, default=None)
+
+
+def decode_sets(columns: dict[str, list[Any] | None]) -> list[dict[str, Any]]:
+    """指標ごとの配列をセットの辞書リストに戻す（NULL 要素のキーは含めない）。"""
+    length = max((len(values) for values in columns.values() if values), default=0)
+    return [
+        {
+            key: _decode_value(values[i])
+            for key, values in columns.items()
+            if values and i < len(values) and values[i] is not None
+        }
+        for i in range(length)
+    ]
+
 
 class ExerciseLog(Base):
     """運動ログ
@@ -30,7 +125,22 @@ class ExerciseLog(Base):
         String, ForeignKey("user_sessions.user_id", ondelete="CASCADE"), nullable=False
     )
     exercise_name: Mapped[str] = mapped_column(String, nullable=False)
-    sets: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    # 運動種目カタログの ID（表記ゆれをまとめる）
+    canonical_exercise_id: Mapped[str | None] = mapped_column(
+        String, ForeignKey("exercises.id", ondelete="SET NULL"), nullable=True
+    )
+    # セット情報（コンパクト形式で保存した場合は NULL）。読み書きは sets を使う
+    # none_as_null: None を JSON の null ではなく SQL の NULL として保存する
+    sets_json: Mapped[list[dict[str, Any]] | None] = mapped_column(
+        "sets", JSONB(none_as_null=True), nullable=True
+    )
+    # セット情報のコンパクト形式（指標ごとの配列、セットにない値は NULL 要素）
+    set_reps: Mapped[list[int | None] | None] = mapped_column(ARRAY(Integer), nullable=True)
+    set_weights: Mapped[list[float | None] | None] = mapped_column(ARRAY(Float), nullable=True)
+    set_durations: Mapped[list[int | None] | None] = mapped_column(ARRAY(Integer), nullable=True)
+    set_distances: Mapped[list[float | None] | None] = mapped_column(ARRAY(Float), nullable=True)
+    # セットの最大重量（sets の書き込み時に計算する。重量の閾値検索の絞り込み用）
+    max_set_weight: Mapped[float | None] = mapped_column(Float, nullable=True)
     category: Mapped[str | None] = mapped_column(String, nullable=True)
     muscle_group: Mapped[str | None] = mapped_column(String, nullable=True)
     total_sets: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -60,7 +170,53 @@ class ExerciseLog(Base):
             "exercise_name",
             recorded_at.desc(),
         ),
+        Index(
+            "ix_exercise_logs_user_id_canonical_exercise_id_recorded_at",
+            "user_id",
+            "canonical_exercise_id",
+            recorded_at.desc(),
+        ),
+        # 重量の閾値検索（max_set_weight >= 100 で候補を絞り込む）
+        Index("ix_exercise_logs_user_id_max_set_weight", "user_id", "max_set_weight"),
+        # どちらかの形式でセット情報を持つ
+        CheckConstraint(
+            "sets IS NOT NULL"
+            " OR COALESCE(set_reps, set_weights, set_durations, set_distances) IS NOT NULL",
+            name="exercise_logs_sets_present_check",
+        ),
     )
 
+    @hybrid_property
+    def sets(self) -> list[dict[str, Any]]:
+        """セット情報（保存形式に関わらず辞書のリスト）"""
+        if self.sets_json is not None:
+            return self.sets_json
+        return decode_sets(
+            {
+                "reps": self.set_reps,
+                "weight": self.set_weights,
+                "duration": self.set_durations,
+                "distance": self.set_distances,
+            }
+        )
+
+    @sets.inplace.setter
+    def _sets_setter(self, value: list[dict[str, Any]]) -> None:
+        columns = encode_sets(value)
+        # 配列カラムで表せない場合は JSONB に保存する（セットがない場合も [] として保存）
+        self.sets_json = (value if value is not None else []) if columns is None else None
+        self.max_set_weight = max_set_weight(value)
+        columns = columns or {}
+        self.set_reps = columns.get("reps")
+        self.set_weights = columns.get("weight")
+        self.set_durations = columns.get("duration")
+        self.set_distances = columns.get("distance")
+
+    @sets.inplace.expression
+    @classmethod
+    def _sets_expression(cls):
+        # SQL 上は JSONB カラムを指す（コンパクト形式の行は NULL）
+        return cls.sets_json
+
     def __repr__(self) -> str:
         return f"<ExerciseLog(id={self.id}, exercise_name={self.exercise_name})>"
@@ -1,12 +1,15 @@
 """Goal モデル
 
 健康目標を管理する。
+
+details / habits は文章のまま保存し、そこから取り出した数値目標（目標カロリー・PFC・
+目標体重・期限・週あたりの運動回数）を型付きカラムに保存する。
 """
 
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -31,6 +34,14 @@ class Goal(Base):
     )
     details: Mapped[str] = mapped_column(Text, nullable=False)
     habits: Mapped[str] = mapped_column(Text, nullable=False)
+    # 数値目標（保存時に details / habits から取り出す。見つからない項目は NULL）
+    daily_calorie_target: Mapped[int | None] = mapped_column(Integer, nullable=True)  # kcal
+    target_proteins: Mapped[int | None] = mapped_column(Integer, nullable=True)  # g/日
+    target_fats: Mapped[int | None] = mapped_column(Integer, nullable=True)  # g/日
+    target_carbohydrates: Mapped[int | None] = mapped_column(Integer, nullable=True)  # g/日
+    target_weight: Mapped[float | None] = mapped_column(Float, nullable=True)  # kg
+    deadline: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    weekly_exercise_sessions: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=func.now(), server_default=func.now()
     )
@@ -41,5 +52,11 @@ class Goal(Base):
         "Habit", back_populates="goal"
     )
 
+    # インデックス（Prisma と同じ）
+    __table_args__ = (
+        # 目標の履歴のキーセットページネーション
+        Index("ix_goals_user_id_created_at_id", "user_id", created_at.desc(), id.desc()),
+    )
+
     def __repr__(self) -> str:
         return f"<Goal(id={self.id}, user_id={self.user_id})>"
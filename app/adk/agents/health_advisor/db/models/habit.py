@@ -4,10 +4,10 @@
 """
 
 from datetime import datetime
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING
 
 from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -64,7 +64,7 @@ class Habit(Base):
 
     # スケジュール設定
     frequency: Mapped[str] = mapped_column(String, nullable=False)
-    days_of_week: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    days_of_week: Mapped[list[str] | None] = mapped_column(JSONB, nullable=True)
     time_of_day: Mapped[str | None] = mapped_column(String, nullable=True)
 
     # ステータスと期間
@@ -0,0 +1,69 @@
+"""PersonalRecord モデル
+
+運動種目ごとの自己ベストを管理する。
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+
+if TYPE_CHECKING:
+    from .user_session import UserSession
+
+
+class PersonalRecord(Base):
+    """自己ベスト
+
+    Prisma モデル: PersonalRecord
+    テーブル名: personal_records
+
+    ExerciseLogRepository.create_log で運動ログと同じトランザクション内で更新する。
+    """
+
+    __tablename__ = "personal_records"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    user_id: Mapped[str] = mapped_column(
+        String, ForeignKey("user_sessions.user_id", ondelete="CASCADE"), nullable=False
+    )
+    exercise_name: Mapped[str] = mapped_column(String, nullable=False)
+    # "max_weight", "max_reps", "best_e1rm", "longest_distance", "fastest_pace"
+    metric: Mapped[str] = mapped_column(String, nullable=False)
+    # max_reps の対象重量（kg）。それ以外の指標は 0
+    weight: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    value: Mapped[float] = mapped_column(Float, nullable=False)
+    exercise_log_id: Mapped[str | None] = mapped_column(
+        String, ForeignKey("exercise_logs.id", ondelete="SET NULL"), nullable=True
+    )
+    achieved_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), server_default=func.now(), onupdate=func.now()
+    )
+
+    # リレーション
+    user: Mapped["UserSession"] = relationship("UserSession")
+
+    # インデックス（Prisma と同じ）
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "exercise_name",
+            "metric",
+            "weight",
+            name="personal_records_user_id_exercise_name_metric_weight_key",
+        ),
+        Index("ix_personal_records_user_id_achieved_at", "user_id", achieved_at.desc()),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<PersonalRecord(exercise_name={self.exercise_name}, "
+            f"metric={self.metric}, value={self.value})>"
+        )
@@ -0,0 +1,63 @@
+"""WeeklyMuscleVolume モデル
+
+ユーザー × ISO 週 × 筋肉群ごとのトレーニング量の集計を管理する。
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+
+if TYPE_CHECKING:
+    from .user_session import UserSession
+
+
+class WeeklyMuscleVolume(Base):
+    """週ごと・筋肉群ごとのトレーニング量
+
+    Prisma モデル: WeeklyMuscleVolume
+    テーブル名: weekly_muscle_volumes
+
+    ExerciseLogRepository.create_log で運動ログと同じトランザクション内で加算する。
+    """
+
+    __tablename__ = "weekly_muscle_volumes"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    user_id: Mapped[str] = mapped_column(
+        String, ForeignKey("user_sessions.user_id", ondelete="CASCADE"), nullable=False
+    )
+    # JST の ISO 週（"2026-W42" 形式）
+    iso_week: Mapped[str] = mapped_column(String, nullable=False)
+    # 筋肉群（未設定の場合は "unknown"）
+    muscle_group: Mapped[str] = mapped_column(String, nullable=False)
+    sessions: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    sets: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    reps: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    volume: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    duration: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), server_default=func.now(), onupdate=func.now()
+    )
+
+    # リレーション
+    user: Mapped["UserSession"] = relationship("UserSession")
+
+    # インデックス（Prisma と同じ）
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "iso_week",
+            "muscle_group",
+            name="weekly_muscle_volumes_user_id_iso_week_muscle_group_key",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<WeeklyMuscleVolume(iso_week={self.iso_week}, "
+            f"muscle_group={self.muscle_group}, sets={self.sets})>"
+        )
@@ -5,14 +5,20 @@
 
 from .user_session import UserSessionRepository
 from .goal import GoalRepository
+from .exercise import ExerciseRepository
 from .exercise_log import ExerciseLogRepository
 from .diet_log import DietLogRepository
 from .habit import HabitRepository
+from .personal_record import PersonalRecordRepository
+from .weekly_muscle_volume import WeeklyMuscleVolumeRepository
 
 __all__ = [
     "UserSessionRepository",
     "GoalRepository",
+    "ExerciseRepository",
     "ExerciseLogRepository",
     "DietLogRepository",
     "HabitRepository",
+    "PersonalRecordRepository",
+    "WeeklyMuscleVolumeRepository",
 ]
@@ -3,17 +3,94 @@
 共通の CRUD 操作を提供する。
 """
 
+from datetime import date, datetime, timedelta
 from typing import Any, Generic, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import Date, Integer, Select, cast, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
 from ..models import Base
+from ...utils import to_utc
 
 # 型変数: SQLAlchemy モデル
 ModelT = TypeVar("ModelT", bound=Base)
 
 
+def jst_date(column: Any) -> ColumnElement:
+    """日時カラムを JST の日付に変換する SQL 式を返す。
+
+    Prisma は DateTime を TIMESTAMP(3)（タイムゾーンなし、UTC）で保存するため、
+    UTC として解釈してから Asia/Tokyo に変換する。
+    GROUP BY でも同じ式として扱われるよう、タイムゾーン名はバインドパラメータに
+    せずリテラルで埋め込む。
+
+    Args:
+        column: 日時カラム
+
+    Returns:
+        JST の日付（DATE）を表す SQL 式
+    """
+    return cast(
+        func.timezone(
+            literal_column("'Asia/Tokyo'"),
+            func.timezone(literal_column("'UTC'"), column),
+        ),
+        Date,
+    )
+
+
+def day_streaks(column: Any, *conditions: Any, today: date) -> Select:
+    """記録のある JST の日の連続記録（ストリーク）を集計する SELECT を返す。
+
+    gaps-and-islands で連続する日をまとめる。記録のある日から日付順の連番を引いた値は
+    連続している間は同じになるため、その値ごとに連続期間を集計する。
+    履歴の長さに関わらず 1 行を返す。
+
+    Args:
+        column: 日時カラム（recorded_at 等）
+        *conditions: 対象の行の条件（user_id 等）
+        today: JST の今日の日付。今日または昨日まで続いている連続期間を現在のストリークとする
+
+    Returns:
+        current, current_start, longest, longest_start, longest_end,
+        last_active_date, active_days を持つ 1 行の SELECT
+    """
+    days = select(jst_date(column).label("day")).where(*conditions).distinct().subquery()
+    islands = select(
+        days.c.day,
+        (days.c.day - cast(func.row_number().over(order_by=days.c.day), Integer)).label("island"),
+    ).subquery()
+    runs = (
+        select(
+            func.min(islands.c.day).label("start"),
+            func.max(islands.c.day).label("end"),
+            func.count().label("length"),
+        )
+        .group_by(islands.c.island)
+        .subquery()
+    )
+    alive = runs.c.end >= today - timedelta(days=1)
+    by_length = (runs.c.length.desc(), runs.c.end.desc())
+    return select(
+        func.coalesce(func.max(runs.c.length).filter(alive), 0).label("current"),
+        func.max(runs.c.start).filter(alive).label("current_start"),
+        func.coalesce(func.max(runs.c.length), 0).label("longest"),
+        array_agg(aggregate_order_by(runs.c.start, *by_length))[1].label("longest_start"),
+        array_agg(aggregate_order_by(runs.c.end, *by_length))[1].label("longest_end"),
+        func.max(runs.c.end).label("last_active_date"),
+        cast(func.coalesce(func.sum(runs.c.length), 0), Integer).label("active_days"),
+    )
+
+
+def _comparable(value: Any) -> Any:
+    """比較用の値（日時は UTC に揃える。DB のタイムゾーンなしの日時は UTC）。"""
+    if isinstance(value, datetime):
+        return to_utc(value)
+    return value
+
+
 class BaseRepository(Generic[ModelT]):
     """リポジトリ基底クラス
 
@@ -97,6 +174,46 @@ class BaseRepository(Generic[ModelT]):
         await self._session.refresh(instance)
         return instance
 
+    async def update_changed(
+        self,
+        id: str,
+        changes: dict[str, Any],
+        user_id: str | None = None,
+    ) -> tuple[ModelT | None, dict[str, dict[str, Any]]]:
+        """指定したカラムのうち、現在の値と異なるものだけを更新する。
+
+        changes は更新スキーマ（db.schemas）で検証済みの値を渡すこと。
+        値が変わらない場合は UPDATE を発行しない（onupdate の updated_at も更新されない）。
+
+        Args:
+            id: レコードの ID
+            changes: カラム名 → 新しい値
+            user_id: 指定した場合、このユーザーのレコードでなければ None を返す
+
+        Returns:
+            (レコード, 差分)。差分はカラム名 → {"from": 旧値, "to": 新値}。
+            レコードが存在しない場合は (None, {})
+        """
+        instance = await self.get_by_id(id)
+        if instance is None or (
+            user_id is not None and getattr(instance, "user_id", None) != user_id
+        ):
+            return None, {}
+
+        diff = {
+            key: {"from": getattr(instance, key), "to": value}
+            for key, value in changes.items()
+            if _comparable(getattr(instance, key)) != _comparable(value)
+        }
+        if not diff:
+            return instance, {}
+
+        for key, change in diff.items():
+            setattr(instance, key, change["to"])
+        await self._session.flush()
+        await self._session.refresh(instance)
+        return instance, diff
+
     async def delete(self, id: str) -> bool:
         """レコードを削除する。
 
@@ -4,13 +4,19 @@
 """
 
 import uuid
-from datetime import datetime
+from datetime import date, datetime
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import Float, case, cast, func, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import DietLog
-from .base import BaseRepository
+from ..models import DietLog, Goal, Habit
+from .base import BaseRepository, day_streaks, jst_date
+from .habit import scheduled_on
+from ...utils import get_jst_now
+
+# いつもの食事検索で、ユーザーが修正した記録に与える重み
+USUAL_MEAL_CORRECTED_WEIGHT = 3.0
 
 
 class DietLogRepository(BaseRepository[DietLog]):
@@ -78,6 +84,252 @@ class DietLogRepository(BaseRepository[DietLog]):
         result = await self._session.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_totals(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict[str, Any]:
+        """期間内の食事記録数と栄養素合計を 1 クエリで取得する。
+
+        Args:
+            user_id: ユーザー ID
+            start_date: 開始日時
+            end_date: 終了日時（この日時を含まない）
+
+        Returns:
+            meal_count, calories, proteins, fats, carbohydrates を持つ辞書
+        """
+        stmt = (
+            select(
+                func.count().label("meal_count"),
+                func.coalesce(func.sum(DietLog.calories), 0.0).label("calories"),
+                func.coalesce(func.sum(DietLog.proteins), 0.0).label("proteins"),
+                func.coalesce(func.sum(DietLog.fats), 0.0).label("fats"),
+                func.coalesce(func.sum(DietLog.carbohydrates), 0.0).label("carbohydrates"),
+            )
+            .where(DietLog.user_id == user_id)
+            .where(DietLog.recorded_at >= start_date)
+            .where(DietLog.recorded_at < end_date)
+        )
+        result = await self._session.execute(stmt)
+        return dict(result.mappings().one())
+
+    async def get_daily_totals_by_meal_type(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[dict[str, Any]]:
+        """日付（JST）と食事種別ごとの栄養素合計を取得する。
+
+        PFC 達成率の計算に使用する。行単位ではなく DB 側で集計する。
+
+        Args:
+            user_id: ユーザー ID
+            start_date: 開始日時
+            end_date: 終了日時（この日時を含まない）
+
+        Returns:
+            date, meal_type, meal_count, calories, proteins, fats, carbohydrates を
+            持つ辞書のリスト（日付の昇順）
+        """
+        day = jst_date(DietLog.recorded_at)
+        stmt = (
+            select(
+                day.label("date"),
+                DietLog.meal_type,
+                func.count().label("meal_count"),
+                func.sum(DietLog.calories).label("calories"),
+                func.sum(DietLog.proteins).label("proteins"),
+                func.sum(DietLog.fats).label("fats"),
+                func.sum(DietLog.carbohydrates).label("carbohydrates"),
+            )
+            .where(DietLog.user_id == user_id)
+            .where(DietLog.recorded_at >= start_date)
+            .where(DietLog.recorded_at < end_date)
+            .group_by(day, DietLog.meal_type)
+            .order_by(day)
+        )
+        result = await self._session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def get_calorie_context(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        weekday: str,
+    ) -> dict[str, Any]:
+        """期間内の摂取カロリーと、その曜日の目標カロリーを 1 クエリで取得する。
+
+        目標カロリーは、その曜日に予定されているアクティブな食事習慣の
+        target_calories の合計とする。最新の健康目標の daily_calorie_target も併せて返す。
+
+        Args:
+            user_id: ユーザー ID
+            start_date: 開始日時
+            end_date: 終了日時（この日時を含まない）
+            weekday: 曜日名（"monday" 等、Habit.days_of_week の形式）
+
+        Returns:
+            consumed_calories, meal_count, habit_calorie_target, goal_calorie_target を持つ辞書
+            （目標が設定された食事習慣・健康目標がない場合はそれぞれ None）
+        """
+        consumed = (
+            select(
+                func.coalesce(func.sum(DietLog.calories), 0.0).label("calories"),
+                func.count().label("meal_count"),
+            )
+            .where(DietLog.user_id == user_id)
+            .where(DietLog.recorded_at >= start_date)
+            .where(DietLog.recorded_at < end_date)
+            .subquery()
+        )
+
+        habit_target = (
+            select(func.sum(Habit.target_calories))
+            .where(Habit.user_id == user_id)
+            .where(Habit.habit_type == "meal")
+            .where(Habit.is_active.is_(True))
+            .where(Habit.start_date < end_date)
+            .where(or_(Habit.end_date.is_(None), Habit.end_date >= start_date))
+            .where(scheduled_on(weekday))
+            .scalar_subquery()
+        )
+
+        goal_target = (
+            select(Goal.daily_calorie_target)
+            .where(Goal.user_id == user_id)
+            .order_by(Goal.created_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+        stmt = select(
+            consumed.c.calories.label("consumed_calories"),
+            consumed.c.meal_count,
+            habit_target.label("habit_calorie_target"),
+            goal_target.label("goal_calorie_target"),
+        )
+        result = await self._session.execute(stmt)
+        return dict(result.mappings().one())
+
+    async def get_activity_streaks(self, user_id: str, today: date | None = None) -> dict[str, Any]:
+        """食事ログのある JST の日の連続記録（ストリーク）を 1 クエリで集計する。
+
+        Args:
+            user_id: ユーザー ID
+            today: JST の今日の日付（省略時は現在の JST の日付）
+
+        Returns:
+            current（今日または昨日まで続いている連続日数、途切れていれば 0）, current_start,
+            longest, longest_start, longest_end, last_active_date, active_days を持つ辞書
+        """
+        stmt = day_streaks(
+            DietLog.recorded_at,
+            DietLog.user_id == user_id,
+            today=today or get_jst_now().date(),
+        )
+        result = await self._session.execute(stmt)
+        return dict(result.mappings().one())
+
+    async def get_latest_by_image_hash(
+        self,
+        user_id: str,
+        image_hash: str,
+    ) -> DietLog | None:
+        """画像のコンテンツハッシュで直近の食事記録を取得する。
+
+        同じ画像が再送された場合に、前回の分析結果を再利用するために使用する。
+
+        Args:
+            user_id: ユーザー ID
+            image_hash: 画像のコンテンツハッシュ
+
+        Returns:
+            直近の DietLog、存在しない場合は None
+        """
+        stmt = (
+            select(DietLog)
+            .where(DietLog.user_id == user_id)
+            .where(DietLog.image_hash == image_hash)
+            .order_by(DietLog.recorded_at.desc())
+            .limit(1)
+        )
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def search_usual_meals(
+        self,
+        user_id: str,
+        query: str | None = None,
+        meal_type: str | None = None,
+        limit: int = 5,
+    ) -> list[dict[str, Any]]:
+        """過去の食事記録から「いつもの食事」の候補を検索する。
+
+        料理名（食材内訳を除いた部分）ごとに 1 クエリで集計し、記録回数と
+        ユーザー修正の有無でスコアリングする。栄養素はユーザー修正済みの記録を
+        重み付けした加重平均を返す。
+
+        Args:
+            user_id: ユーザー ID
+            query: 料理名の部分一致キーワード（省略時は全件から頻出順）
+            meal_type: 食事種別でフィルタ（"breakfast", "lunch", "dinner", "snack"）
+            limit: 取得件数の上限
+
+        Returns:
+            候補の辞書リスト（スコアの降順）
+        """
+        # record_meal は「料理名 (食材, ...)」形式で保存するため、料理名部分でまとめる
+        dish_name = func.split_part(DietLog.name, " (", 1)
+        weight = case(
+            (DietLog.is_user_corrected.is_(True), USUAL_MEAL_CORRECTED_WEIGHT),
+            else_=1.0,
+        )
+
+        def weighted_avg(column):
+            # NULL の記録は分母からも除外する
+            numerator = func.sum(column * weight)
+            denominator = func.sum(case((column.is_not(None), weight)))
+            return numerator / func.nullif(denominator, 0)
+
+        corrected_count = func.count().filter(DietLog.is_user_corrected.is_(True))
+        score = func.sum(weight)
+
+        stmt = (
+            select(
+                dish_name.label("dish_name"),
+                func.mode().within_group(DietLog.meal_type).label("meal_type"),
+                func.count().label("times_logged"),
+                corrected_count.label("corrected_count"),
+                weighted_avg(DietLog.calories).label("calories"),
+                weighted_avg(DietLog.proteins).label("proteins"),
+                weighted_avg(DietLog.fats).label("fats"),
+                weighted_avg(DietLog.carbohydrates).label("carbohydrates"),
+                weighted_avg(DietLog.sodium).label("sodium"),
+                weighted_avg(DietLog.fiber).label("fiber"),
+                weighted_avg(DietLog.sugar).label("sugar"),
+                func.max(DietLog.recorded_at).label("last_recorded_at"),
+            )
+            .where(DietLog.user_id == user_id)
+            .group_by(dish_name)
+            .order_by(
+                cast(score, Float).desc(),
+                func.max(DietLog.recorded_at).desc(),
+            )
+            .limit(limit)
+        )
+
+        if query:
+            stmt = stmt.where(DietLog.name.ilike(f"%{query}%"))
+        if meal_type is not None:
+            stmt = stmt.where(DietLog.meal_type == meal_type)
+
+        result = await self._session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
     async def create_log(
         self,
         user_id: str,
@@ -94,6 +346,7 @@ class DietLogRepository(BaseRepository[DietLog]):
         sugar: float | None = None,
         is_user_corrected: bool = False,
         image_url: str | None = None,
+        image_hash: str | None = None,
         note: str | None = None,
     ) -> DietLog:
         """食事記録を作成する。
@@ -113,6 +366,7 @@ class DietLogRepository(BaseRepository[DietLog]):
             sugar: 糖質 (g)
             is_user_corrected: ユーザー修正有無
             image_url: 食事画像URL
+            image_hash: 画像のコンテンツハッシュ
             note: メモ
 
         Returns:
@@ -135,5 +389,45 @@ class DietLogRepository(BaseRepository[DietLog]):
             sugar=sugar,
             is_user_corrected=is_user_corrected,
             image_url=image_url,
+            image_hash=image_hash,
             note=note,
         )
+
+    async def create_logs(
+        self,
+        user_id: str,
+        logs: list[dict[str, Any]],
+    ) -> list[str]:
+        """複数の食事記録を 1 回の INSERT でまとめて作成する。
+
+        Args:
+            user_id: ユーザー ID
+            logs: create_log と同じキー（user_id を除く）を持つ辞書のリスト
+
+        Returns:
+            作成された食事記録の ID のリスト（logs と同じ順序）
+        """
+        if not logs:
+            return []
+
+        optional_keys = (
+            "sodium",
+            "fiber",
+            "sugar",
+            "image_url",
+            "image_hash",
+            "note",
+        )
+        # 複数行 VALUES では全行のカラムを揃える必要がある
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "is_user_corrected": False,
+                **{key: None for key in optional_keys},
+                **log,
+            }
+            for log in logs
+        ]
+        await self._session.execute(insert(DietLog).values(rows))
+        return [row["id"] for row in rows]
@@ -0,0 +1,165 @@
+"""Exercise リポジトリ
+
+運動種目カタログと別名索引の操作を提供する。
+
+運動名は normalize_exercise_name で正規化した別名で引く。
+「ベンチ」「ベンチプレス」「bench press」のような表記ゆれは、
+同じ運動種目を指す別名として exercise_aliases に登録しておく。
+「Bench Press (Barbell)」のような器具の括弧書きは、未登録の場合に除いて解決する。
+"""
+
+import re
+import unicodedata
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..models import Exercise, ExerciseAlias
+from .base import BaseRepository
+
+# カタカナ → ひらがな（ァ..ヶ → ぁ..ゖ）
+_KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+# 区切り文字（空白、中黒、ハイフン、アンダースコア、スラッシュ、ピリオド）
+_SEPARATOR_PATTERN = re.compile(r"[\s・\-_/.]+")
+
+# 末尾の括弧書き（"Bench Press (Barbell)" の "(Barbell)" 等）
+_SUFFIX_PATTERN = re.compile(r"\s*[(（][^()（）]*[)）]\s*$")
+
+
+def normalize_exercise_name(name: str) -> str:
+    """運動名を別名索引のキーに正規化する。
+
+    NFKC 正規化（全角英数・半角カナの統一）、小文字化、カタカナのひらがな化、
+    区切り文字の除去を行う。ローマ字表記はひらがなに変換せず、別名として登録する。
+    マイグレーションの SQL（normalize / translate / regexp_replace）と同じ結果になる。
+
+    Args:
+        name: 運動名
+
+    Returns:
+        正規化した運動名（例: "ベンチ・プレス" → "べんちぷれす"、"Bench Press" → "benchpress"）
+    """
+    normalized = unicodedata.normalize("NFKC", name).lower()
+    normalized = normalized.translate(_KATAKANA_TO_HIRAGANA)
+    return _SEPARATOR_PATTERN.sub("", normalized)
+
+
+def canonical_exercise_id(exercise_name: str) -> ColumnElement:
+    """運動名を別名索引で引き、運動種目 ID を返すスカラーサブクエリ。
+
+    未登録の運動名の場合は NULL になる。
+    """
+    return (
+        select(ExerciseAlias.exercise_id)
+        .where(ExerciseAlias.alias == normalize_exercise_name(exercise_name))
+        .scalar_subquery()
+    )
+
+
+def canonical_exercise_name(exercise_name: str) -> ColumnElement:
+    """運動名を別名索引で引き、正規名を返す SQL 式。
+
+    未登録の運動名の場合は入力した運動名をそのまま返す。
+    """
+    return func.coalesce(
+        select(Exercise.canonical_name)
+        .join(ExerciseAlias, ExerciseAlias.exercise_id == Exercise.id)
+        .where(ExerciseAlias.alias == normalize_exercise_name(exercise_name))
+        .scalar_subquery(),
+        exercise_name,
+    )
+
+
+class ExerciseRepository(BaseRepository[Exercise]):
+    """Exercise リポジトリ"""
+
+    def __init__(self, session: AsyncSession):
+        """リポジトリを初期化する。
+
+        Args:
+            session: SQLAlchemy 非同期セッション
+        """
+        super().__init__(session, Exercise)
+
+    async def get_by_name(self, exercise_name: str) -> Exercise | None:
+        """運動名（別名を含む）で運動種目を取得する。
+
+        Args:
+            exercise_name: 運動名
+
+        Returns:
+            Exercise、または未登録の場合は None
+        """
+        alias = normalize_exercise_name(exercise_name)
+        if not alias:
+            return None
+        stmt = (
+            select(Exercise)
+            .join(ExerciseAlias, ExerciseAlias.exercise_id == Exercise.id)
+            .where(ExerciseAlias.alias == alias)
+        )
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def resolve_or_create(
+        self,
+        exercise_name: str,
+        category: str | None = None,
+        muscle_group: str | None = None,
+    ) -> Exercise | None:
+        """運動名から運動種目を解決し、未登録の場合はカタログに追加する。
+
+        未登録の運動名は末尾の括弧書き（器具の種類等）を除いた名前で解決し、
+        入力した運動名をその運動種目の別名として登録する。括弧書きを除いても
+        未登録の場合は、除いた名前を正規名としてカタログに追加する。
+        追加は ON CONFLICT DO NOTHING で行い、同時に同じ運動名が記録された場合も
+        同じ運動種目に解決されるようにする。
+
+        Args:
+            exercise_name: 運動名
+            category: カテゴリ（新規登録時のみ使用）
+            muscle_group: 筋肉群（新規登録時のみ使用）
+
+        Returns:
+            Exercise、または正規化後の運動名が空の場合は None
+        """
+        exercise = await self.get_by_name(exercise_name)
+        if exercise is not None or not normalize_exercise_name(exercise_name):
+            return exercise
+
+        canonical_name = _SUFFIX_PATTERN.sub("", exercise_name).strip() or exercise_name.strip()
+        exercise = await self.get_by_name(canonical_name)
+        if exercise is None:
+            await self._session.execute(
+                insert(Exercise)
+                .values(
+                    id=str(uuid.uuid4()),
+                    canonical_name=canonical_name,
+                    category=category,
+                    muscle_group=muscle_group,
+                )
+                .on_conflict_do_nothing(index_elements=[Exercise.canonical_name])
+            )
+            exercise_id = (
+                select(Exercise.id)
+                .where(Exercise.canonical_name == canonical_name)
+                .scalar_subquery()
+            )
+        else:
+            exercise_id = exercise.id
+
+        aliases = dict.fromkeys(
+            alias
+            for alias in map(normalize_exercise_name, (exercise_name, canonical_name))
+            if alias
+        )
+        await self._session.execute(
+            insert(ExerciseAlias)
+            .values([{"alias": alias, "exercise_id": exercise_id} for alias in aliases])
+            .on_conflict_do_nothing(index_elements=[ExerciseAlias.alias])
+        )
+        return await self.get_by_name(exercise_name)
@@ -4,17 +4,59 @@
 """
 
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Float,
+    String,
+    and_,
+    case,
+    cast,
+    column,
+    exists,
+    func,
+    literal_column,
+    or_,
+    select,
+    true,
+    tuple_,
+    union_all,
+    values,
+)
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by, array_agg, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Subquery
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.orm import aliased
 
-from ..models import ExerciseLog
-from .base import BaseRepository
+from ..models import Exercise, ExerciseAlias, ExerciseLog
+from .base import BaseRepository, day_streaks, jst_date
+from .exercise import ExerciseRepository, canonical_exercise_id, normalize_exercise_name
+from .personal_record import PersonalRecordRepository
+from .weekly_muscle_volume import WeeklyMuscleVolumeRepository
 from ...utils import get_jst_now
 
 
+# セットの値を数値として扱う文字列のパターン（"自重" 等は除外する）
+NUMERIC_PATTERN = r"^[0-9]+(\.[0-9]+)?$"
+
+# Brzycki 式が有効なレップ数の上限（37 レップで分母が 0 になる）
+BRZYCKI_MAX_REPS = 36
+
+
+def exercise_filter(exercise_name: str) -> ColumnElement:
+    """運動名で運動ログを絞り込む条件を返す。
+
+    別名索引で運動種目を解決し、同じ運動種目のログ（表記ゆれを含む）を対象にする。
+    運動種目が未解決の古いログのため、運動名の完全一致も含める。
+    """
+    return or_(
+        ExerciseLog.canonical_exercise_id == canonical_exercise_id(exercise_name),
+        ExerciseLog.exercise_name == exercise_name,
+    )
+
+
 class ExerciseLogRepository(BaseRepository[ExerciseLog]):
     """ExerciseLog リポジトリ"""
 
@@ -71,7 +113,7 @@ class ExerciseLogRepository(BaseRepository[ExerciseLog]):
         stmt = (
             select(ExerciseLog)
             .where(ExerciseLog.user_id == user_id)
-            .where(ExerciseLog.exercise_name == exercise_name)
+            .where(exercise_filter(exercise_name))
             .order_by(ExerciseLog.recorded_at.desc())
             .limit(limit)
         )
@@ -85,6 +127,7 @@ class ExerciseLogRepository(BaseRepository[ExerciseLog]):
         end_date: datetime,
         exercise_name: str | None = None,
         limit: int | None = None,
+        offset: int = 0,
     ) -> list[ExerciseLog]:
         """ユーザー ID と日付範囲で運動ログを取得する。
 
@@ -94,6 +137,7 @@ class ExerciseLogRepository(BaseRepository[ExerciseLog]):
             end_date: 終了日時（この日時以前のログを取得）
             exercise_name: 運動名（省略時は全運動種目）
             limit: 取得件数の上限（省略時は制限なし）
+            offset: 取得開始位置
 
         Returns:
             ExerciseLog のリスト（記録日時の降順）
@@ -106,16 +150,485 @@ class ExerciseLogRepository(BaseRepository[ExerciseLog]):
         )
 
         if exercise_name is not None:
-            stmt = stmt.where(ExerciseLog.exercise_name == exercise_name)
+            stmt = stmt.where(exercise_filter(exercise_name))
 
         stmt = stmt.order_by(ExerciseLog.recorded_at.desc())
 
         if limit is not None:
             stmt = stmt.limit(limit)
+        if offset:
+            stmt = stmt.offset(offset)
+
+        result = await self._session.execute(stmt)
+        return list(result.scalars().all())
+
+    def expanded_sets(self, *conditions: Any) -> Subquery:
+        """運動ログの sets をセット単位の行に展開するサブクエリを返す。
+
+        セット単位の分析は全てこのサブクエリを経由する。JSONB 形式の行は
+        jsonb_array_elements で、コンパクト形式（配列カラム）の行は unnest で展開し、
+        UNION ALL でまとめる。数値でない値は NULL にする。
+
+        Args:
+            *conditions: ExerciseLog に対する WHERE 条件
+
+        Returns:
+            log_id, user_id, exercise_name, recorded_at, set_index, weight, reps,
+            duration, distance を持つサブクエリ
+        """
+        sets = ExerciseLog.sets
+        elements = (
+            func.jsonb_array_elements(
+                case(
+                    (func.jsonb_typeof(sets) == "array", sets),
+                    else_=literal_column("'[]'::jsonb"),
+                )
+            )
+            .table_valued(column("value", JSONB), with_ordinality="set_index")
+            .render_derived(name="s")
+        )
+
+        def number(key: str) -> Any:
+            text = elements.c.value[key].astext
+            return case((text.op("~")(NUMERIC_PATTERN), cast(text, Float)))
+
+        json_rows = (
+            select(
+                ExerciseLog.id.label("log_id"),
+                ExerciseLog.user_id,
+                ExerciseLog.exercise_name,
+                ExerciseLog.recorded_at,
+                elements.c.set_index,
+                number("weight").label("weight"),
+                number("reps").label("reps"),
+                number("duration").label("duration"),
+                number("distance").label("distance"),
+            )
+            .select_from(ExerciseLog)
+            .join(elements, true())
+            .where(ExerciseLog.sets_json.is_not(None))
+        )
+
+        columns = (
+            func.unnest(
+                ExerciseLog.set_weights,
+                ExerciseLog.set_reps,
+                ExerciseLog.set_durations,
+                ExerciseLog.set_distances,
+            )
+            .table_valued(
+                column("weight", Float),
+                column("reps", Float),
+                column("duration", Float),
+                column("distance", Float),
+                with_ordinality="set_index",
+            )
+            .render_derived(name="c")
+        )
+        compact_rows = (
+            select(
+                ExerciseLog.id.label("log_id"),
+                ExerciseLog.user_id,
+                ExerciseLog.exercise_name,
+                ExerciseLog.recorded_at,
+                columns.c.set_index,
+                cast(columns.c.weight, Float).label("weight"),
+                cast(columns.c.reps, Float).label("reps"),
+                cast(columns.c.duration, Float).label("duration"),
+                cast(columns.c.distance, Float).label("distance"),
+            )
+            .select_from(ExerciseLog)
+            .join(columns, true())
+            .where(ExerciseLog.sets_json.is_(None))
+        )
+
+        for condition in conditions:
+            json_rows = json_rows.where(condition)
+            compact_rows = compact_rows.where(condition)
+        return union_all(json_rows, compact_rows).subquery("sets")
+
+    async def get_by_set_threshold(
+        self,
+        user_id: str,
+        min_weight: float | None = None,
+        min_reps: float | None = None,
+        exercise_name: str | None = None,
+        limit: int = 20,
+    ) -> list[ExerciseLog]:
+        """条件を満たすセットを 1 つ以上含む運動ログを取得する。
+
+        例: min_weight=100 で「100kg 以上のセットがあるセッション」。
+        重量とレップ数の両方を指定した場合は、同じセットで両方を満たすものに限る。
+        重量を指定した場合は max_set_weight の B-tree インデックスで候補を絞り込み、
+        JSONB 形式の行は jsonpath、コンパクト形式の行は配列の unnest で判定する。
+
+        Args:
+            user_id: ユーザー ID
+            min_weight: 重量の下限（kg）
+            min_reps: レップ数の下限
+            exercise_name: 運動名（省略時は全運動種目）
+            limit: 取得件数の上限
+
+        Returns:
+            ExerciseLog のリスト（記録日時の降順）
+        """
+        if min_weight is None and min_reps is None:
+            raise ValueError("min_weight または min_reps を指定してください")
+
+        columns = (
+            func.unnest(ExerciseLog.set_weights, ExerciseLog.set_reps)
+            .table_valued(column("weight", Float), column("reps", Float))
+            .render_derived(name="c")
+        )
+        predicates = []
+        compact_conditions = []
+        if min_weight is not None:
+            predicates.append(f"@.weight >= {float(min_weight)!r}")
+            compact_conditions.append(columns.c.weight >= min_weight)
+        if min_reps is not None:
+            predicates.append(f"@.reps >= {float(min_reps)!r}")
+            compact_conditions.append(columns.c.reps >= min_reps)
+
+        # 値は float に変換済みのため、リテラルとして埋め込んでも安全
+        path = literal_column(f"'$[*] ? ({' && '.join(predicates)})'::jsonpath")
+        compact_match = exists(
+            select(literal_column("1")).select_from(columns).where(*compact_conditions)
+        )
+        stmt = (
+            select(ExerciseLog)
+            .where(ExerciseLog.user_id == user_id)
+            .where(
+                or_(
+                    ExerciseLog.sets.op("@?")(path),
+                    ExerciseLog.sets_json.is_(None) & compact_match,
+                )
+            )
+        )
+        if min_weight is not None:
+            # 条件を満たすセットがあれば最大重量も下限以上（インデックスで絞り込む）
+            stmt = stmt.where(ExerciseLog.max_set_weight >= min_weight)
+        if exercise_name is not None:
+            stmt = stmt.where(exercise_filter(exercise_name))
+        stmt = stmt.order_by(ExerciseLog.recorded_at.desc()).limit(limit)
 
         result = await self._session.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_set_stats(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        exercise_name: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """期間内のセット単位の統計を種目ごとに集計する。
+
+        Args:
+            user_id: ユーザー ID
+            start_date: 開始日時（この日時以降のログを集計）
+            end_date: 終了日時（この日時以前のログを集計）
+            exercise_name: 運動名（省略時は全運動種目）
+
+        Returns:
+            exercise_name, set_count, max_weight, avg_weight, avg_reps, max_reps,
+            volume を持つ辞書のリスト（セット数の降順）
+        """
+        conditions = [
+            ExerciseLog.user_id == user_id,
+            ExerciseLog.recorded_at >= start_date,
+            ExerciseLog.recorded_at <= end_date,
+        ]
+        if exercise_name is not None:
+            conditions.append(exercise_filter(exercise_name))
+        sets = self.expanded_sets(*conditions)
+
+        stmt = (
+            select(
+                sets.c.exercise_name,
+                func.count().label("set_count"),
+                func.max(sets.c.weight).label("max_weight"),
+                func.avg(sets.c.weight).label("avg_weight"),
+                func.avg(sets.c.reps).label("avg_reps"),
+                func.max(sets.c.reps).label("max_reps"),
+                func.coalesce(func.sum(sets.c.weight * sets.c.reps), 0.0).label("volume"),
+            )
+            .group_by(sets.c.exercise_name)
+            .order_by(func.count().desc())
+        )
+        result = await self._session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def get_session_series(
+        self,
+        user_id: str,
+        exercise_name: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """1 種目のセッションごとの指標を時系列で取得する。
+
+        セットを展開し、セッション（運動ログ）ごとのトップセット・推定 1RM・
+        ボリュームを DB 側で集計する。
+
+        Args:
+            user_id: ユーザー ID
+            exercise_name: 運動名
+            start_date: 開始日時（省略時は制限なし）
+            end_date: 終了日時（省略時は制限なし）
+
+        Returns:
+            recorded_at, top_weight, top_reps, e1rm_epley, e1rm_brzycki, volume,
+            set_count を持つ辞書のリスト（記録日時の昇順）。重量の記録がない
+            セッションは含まない
+        """
+        conditions = [
+            ExerciseLog.user_id == user_id,
+            exercise_filter(exercise_name),
+        ]
+        if start_date is not None:
+            conditions.append(ExerciseLog.recorded_at >= start_date)
+        if end_date is not None:
+            conditions.append(ExerciseLog.recorded_at <= end_date)
+        sets = self.expanded_sets(*conditions)
+
+        lifted = (sets.c.weight > 0) & (sets.c.reps > 0)
+        epley = case(
+            (sets.c.reps <= 1, sets.c.weight),
+            else_=sets.c.weight * (1 + sets.c.reps / 30),
+        )
+        brzycki = case(
+            (sets.c.reps <= BRZYCKI_MAX_REPS, sets.c.weight * 36 / (37 - sets.c.reps)),
+        )
+        # 最も重いセット（同重量ならレップ数が多いセット）
+        top_reps = array_agg(
+            aggregate_order_by(sets.c.reps, sets.c.weight.desc(), sets.c.reps.desc())
+        )[1]
+
+        stmt = (
+            select(
+                sets.c.recorded_at,
+                func.max(sets.c.weight).label("top_weight"),
+                top_reps.label("top_reps"),
+                func.max(epley).label("e1rm_epley"),
+                func.max(brzycki).label("e1rm_brzycki"),
+                func.coalesce(func.sum(sets.c.weight * sets.c.reps), 0.0).label("volume"),
+                func.count().label("set_count"),
+            )
+            .where(lifted)
+            .group_by(sets.c.log_id, sets.c.recorded_at)
+            .order_by(sets.c.recorded_at)
+        )
+        result = await self._session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def get_daily_totals_by_habit(
+        self,
+        user_id: str,
+        habit_exercises: dict[str, str],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[dict[str, Any]]:
+        """習慣 × 日付（JST）ごとの運動ログの合計を 1 クエリで取得する。
+
+        習慣の運動名を VALUES で渡し、別名索引で運動種目に解決して運動ログと結合する。
+        運動習慣の実施率の計算に使用する。
+
+        Args:
+            user_id: ユーザー ID
+            habit_exercises: 習慣 ID → 運動名
+            start_date: 開始日時
+            end_date: 終了日時（この日時を含まない）
+
+        Returns:
+            habit_id, date, sessions, sets, reps, duration, distance を持つ辞書のリスト
+            （運動ログのない日は含まない）
+        """
+        if not habit_exercises:
+            return []
+
+        habits = values(
+            column("habit_id", String),
+            column("alias", String),
+            column("exercise_name", String),
+            name="habit_exercises",
+        ).data(
+            [
+                (habit_id, normalize_exercise_name(name), name)
+                for habit_id, name in habit_exercises.items()
+            ]
+        )
+        day = jst_date(ExerciseLog.recorded_at)
+        stmt = (
+            select(
+                habits.c.habit_id,
+                day.label("date"),
+                func.count().label("sessions"),
+                func.coalesce(func.sum(ExerciseLog.total_sets), 0).label("sets"),
+                func.coalesce(func.sum(ExerciseLog.total_reps), 0).label("reps"),
+                func.coalesce(func.sum(ExerciseLog.total_duration), 0).label("duration"),
+                func.coalesce(func.sum(ExerciseLog.total_distance), 0.0).label("distance"),
+            )
+            .select_from(habits)
+            .outerjoin(ExerciseAlias, ExerciseAlias.alias == habits.c.alias)
+            .join(
+                ExerciseLog,
+                and_(
+                    ExerciseLog.user_id == user_id,
+                    or_(
+                        ExerciseLog.canonical_exercise_id == ExerciseAlias.exercise_id,
+                        ExerciseLog.exercise_name == habits.c.exercise_name,
+                    ),
+                ),
+            )
+            .where(ExerciseLog.recorded_at >= start_date)
+            .where(ExerciseLog.recorded_at < end_date)
+            .group_by(habits.c.habit_id, day)
+        )
+        result = await self._session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def get_activity_streaks(self, user_id: str, today: date | None = None) -> dict[str, Any]:
+        """運動ログのある JST の日の連続記録（ストリーク）を 1 クエリで集計する。
+
+        Args:
+            user_id: ユーザー ID
+            today: JST の今日の日付（省略時は現在の JST の日付）
+
+        Returns:
+            current（今日または昨日まで続いている連続日数、途切れていれば 0）, current_start,
+            longest, longest_start, longest_end, last_active_date, active_days を持つ辞書
+        """
+        stmt = day_streaks(
+            ExerciseLog.recorded_at,
+            ExerciseLog.user_id == user_id,
+            today=today or get_jst_now().date(),
+        )
+        result = await self._session.execute(stmt)
+        return dict(result.mappings().one())
+
+    async def get_period_aggregates(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict[str, Any]:
+        """期間内の運動ログを DB 側で集計する。
+
+        GROUPING SETS で「全体」「カテゴリ別」「種目別」を 1 クエリで集計する。
+        ログの行そのものは取得しない。
+
+        Args:
+            user_id: ユーザー ID
+            start_date: 開始日時（この日時以降のログを集計）
+            end_date: 終了日時（この日時以前のログを集計）
+
+        Returns:
+            以下のキーを持つ辞書:
+            - total: 全体の集計（ログがない場合は None）
+            - by_category: カテゴリ別の集計（カテゴリ未設定は "unknown"）
+            - by_exercise: 種目別の集計
+            各集計は sessions, active_days, total_volume, total_duration,
+            total_distance, total_reps を持つ
+        """
+        category_grouped = func.grouping(ExerciseLog.category)
+        exercise_grouped = func.grouping(ExerciseLog.exercise_name)
+        stmt = (
+            select(
+                category_grouped.label("category_grouped"),
+                exercise_grouped.label("exercise_grouped"),
+                ExerciseLog.category,
+                ExerciseLog.exercise_name,
+                func.count().label("sessions"),
+                func.count(jst_date(ExerciseLog.recorded_at).distinct()).label("active_days"),
+                func.coalesce(func.sum(ExerciseLog.total_volume), 0.0).label("total_volume"),
+                func.coalesce(func.sum(ExerciseLog.total_duration), 0).label("total_duration"),
+                func.coalesce(func.sum(ExerciseLog.total_distance), 0.0).label("total_distance"),
+                func.coalesce(func.sum(ExerciseLog.total_reps), 0).label("total_reps"),
+            )
+            .where(ExerciseLog.user_id == user_id)
+            .where(ExerciseLog.recorded_at >= start_date)
+            .where(ExerciseLog.recorded_at <= end_date)
+            .group_by(
+                func.grouping_sets(
+                    literal_column("()"),
+                    tuple_(ExerciseLog.category),
+                    tuple_(ExerciseLog.exercise_name),
+                )
+            )
+            .order_by(func.count().desc())
+        )
+        result = await self._session.execute(stmt)
+
+        aggregates: dict[str, Any] = {"total": None, "by_category": {}, "by_exercise": {}}
+        metric_keys = (
+            "sessions",
+            "active_days",
+            "total_volume",
+            "total_duration",
+            "total_distance",
+            "total_reps",
+        )
+        for row in result.mappings().all():
+            metrics = {key: row[key] for key in metric_keys}
+            if row["category_grouped"] and row["exercise_grouped"]:
+                # ログが 0 件でも全体の行は返るため、セッション数で判定する
+                aggregates["total"] = metrics if row["sessions"] else None
+            elif not row["category_grouped"]:
+                aggregates["by_category"][row["category"] or "unknown"] = metrics
+            else:
+                aggregates["by_exercise"][row["exercise_name"]] = metrics
+        return aggregates
+
+    async def get_top_sessions_per_exercise(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        per_exercise: int = 3,
+    ) -> list[ExerciseLog]:
+        """期間内の種目ごとの上位セッションを取得する。
+
+        ROW_NUMBER で種目ごとに順位付けし、上位 per_exercise 件だけを返す。
+        順位はボリューム → 時間 → 距離 → 記録日時（新しい順）で決める。
+
+        Args:
+            user_id: ユーザー ID
+            start_date: 開始日時（この日時以降のログを取得）
+            end_date: 終了日時（この日時以前のログを取得）
+            per_exercise: 種目ごとの取得件数
+
+        Returns:
+            ExerciseLog のリスト（種目名、順位の順）
+        """
+        rank = (
+            func.row_number()
+            .over(
+                partition_by=ExerciseLog.exercise_name,
+                order_by=(
+                    ExerciseLog.total_volume.desc().nulls_last(),
+                    ExerciseLog.total_duration.desc().nulls_last(),
+                    ExerciseLog.total_distance.desc().nulls_last(),
+                    ExerciseLog.recorded_at.desc(),
+                ),
+            )
+            .label("rank")
+        )
+        ranked = (
+            select(ExerciseLog, rank)
+            .where(ExerciseLog.user_id == user_id)
+            .where(ExerciseLog.recorded_at >= start_date)
+            .where(ExerciseLog.recorded_at <= end_date)
+            .subquery()
+        )
+        log = aliased(ExerciseLog, ranked)
+        stmt = (
+            select(log)
+            .where(ranked.c.rank <= per_exercise)
+            .order_by(ranked.c.exercise_name, ranked.c.rank)
+        )
+        result = await self._session.execute(stmt)
+        return list(result.scalars().all())
+
     async def create_log(
         self,
         user_id: str,
@@ -130,8 +643,12 @@ class ExerciseLogRepository(BaseRepository[ExerciseLog]):
         total_volume: float | None = None,
         note: str | None = None,
         recorded_at: datetime | None = None,
-    ) -> ExerciseLog:
-        """運動ログを作成する。
+    ) -> tuple[ExerciseLog, list[dict[str, Any]]]:
+        """運動ログを作成し、同じトランザクション内で自己ベストと週ごとの集計を更新する。
+
+        運動名は別名索引で運動種目に解決し（未登録なら追加し）、
+        canonical_exercise_id に保存する。自己ベストは運動種目の正規名で管理する。
+        筋肉群が未指定の場合、週ごとの集計にはカタログの筋肉群を使う。
 
         Args:
             user_id: ユーザー ID
@@ -148,13 +665,18 @@ class ExerciseLogRepository(BaseRepository[ExerciseLog]):
             recorded_at: 記録日時（省略時は現在時刻）
 
         Returns:
-            作成された ExerciseLog
+            (作成された ExerciseLog, 更新された自己ベストのリスト) のタプル。
+            自己ベストの形式は PersonalRecordRepository.update_from_log を参照
         """
+        exercise = await ExerciseRepository(self._session).resolve_or_create(
+            exercise_name, category=category, muscle_group=muscle_group
+        )
         log_id = str(uuid.uuid4())
-        return await self.create(
+        log = await self.create(
             id=log_id,
             user_id=user_id,
             exercise_name=exercise_name,
+            canonical_exercise_id=exercise.id if exercise else None,
             sets=sets,
             total_sets=total_sets,
             category=category,
@@ -166,3 +688,86 @@ class ExerciseLogRepository(BaseRepository[ExerciseLog]):
             note=note,
             recorded_at=recorded_at or get_jst_now(),
         )
+        new_records = await PersonalRecordRepository(self._session).update_from_log(
+            log, exercise_name=exercise.canonical_name if exercise else None
+        )
+        await WeeklyMuscleVolumeRepository(self._session).add_log(
+            log, muscle_group=muscle_group or (exercise.muscle_group if exercise else None)
+        )
+        return log, new_records
+
+    async def create_logs(
+        self,
+        logs: list[ExerciseLog],
+        exercises: dict[str, Exercise | None] | None = None,
+    ) -> list[ExerciseLog]:
+        """複数の運動ログを一括で作成する（一括インポート用）。
+
+        ORM の一括 INSERT（executemany + RETURNING）で書き込み、ID が既に存在する
+        ログは ON CONFLICT DO NOTHING でスキップする。作成できたログについて、
+        create_log と同じく運動種目の解決・自己ベスト・週ごとの集計の更新を行う。
+
+        Args:
+            logs: 作成する運動ログ（セッションに追加していない ExerciseLog、id は設定済み）
+            exercises: 運動名 → 運動種目のキャッシュ（呼び出し間で共有すると解決の
+                クエリを減らせる。未登録の運動名はこのメソッドで追加する）
+
+        Returns:
+            作成できた運動ログのリスト（既存の ID でスキップしたログは含まない）
+        """
+        if not logs:
+            return []
+        exercises = {} if exercises is None else exercises
+        exercise_repo = ExerciseRepository(self._session)
+        for log in logs:
+            if log.exercise_name not in exercises:
+                exercises[log.exercise_name] = await exercise_repo.resolve_or_create(
+                    log.exercise_name, category=log.category, muscle_group=log.muscle_group
+                )
+            exercise = exercises[log.exercise_name]
+            log.canonical_exercise_id = exercise.id if exercise else None
+
+        rows = [
+            {
+                "id": log.id,
+                "user_id": log.user_id,
+                "exercise_name": log.exercise_name,
+                "canonical_exercise_id": log.canonical_exercise_id,
+                "sets_json": log.sets_json,
+                "set_reps": log.set_reps,
+                "set_weights": log.set_weights,
+                "set_durations": log.set_durations,
+                "set_distances": log.set_distances,
+                "max_set_weight": log.max_set_weight,
+                "category": log.category,
+                "muscle_group": log.muscle_group,
+                "total_sets": log.total_sets,
+                "total_reps": log.total_reps,
+                "total_duration": log.total_duration,
+                "total_distance": log.total_distance,
+                "total_volume": log.total_volume,
+                "note": log.note,
+                "recorded_at": log.recorded_at,
+            }
+            for log in logs
+        ]
+        stmt = (
+            insert(ExerciseLog)
+            .on_conflict_do_nothing(index_elements=[ExerciseLog.id])
+            .returning(ExerciseLog.id)
+        )
+        result = await self._session.execute(stmt, rows)
+        inserted = set(result.scalars().all())
+        created = [log for log in logs if log.id in inserted]
+
+        # create_log と同じく、自己ベストは正規名、週ごとの集計はカタログの筋肉群で補う
+        records, volumes = [], []
+        for log in created:
+            exercise = exercises[log.exercise_name]
+            records.append((log, exercise.canonical_name if exercise else log.exercise_name))
+            volumes.append(
+                (log, log.muscle_group or (exercise.muscle_group if exercise else None))
+            )
+        await PersonalRecordRepository(self._session).update_from_logs(records)
+        await WeeklyMuscleVolumeRepository(self._session).add_logs(volumes)
+        return created
@@ -5,11 +5,13 @@
 
 import uuid
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from ..models import Goal
+from ..models import Goal, Habit
 from .base import BaseRepository
 
 
@@ -59,13 +61,64 @@ class GoalRepository(BaseRepository[Goal]):
         result = await self._session.execute(stmt)
         return list(result.scalars().all())
 
-    async def create_goal(self, user_id: str, details: str, habits: str) -> Goal:
+    async def get_history(
+        self,
+        user_id: str,
+        limit: int = 5,
+        before: tuple[datetime, str] | None = None,
+    ) -> tuple[list[tuple[Goal, int]], tuple[datetime, str] | None]:
+        """目標の履歴を新しい順にキーセットページネーションで取得する。
+
+        目標とアクティブな習慣数を 1 クエリで取得し、習慣（habit_details）は
+        selectinload でまとめて読み込む（目標の件数に関わらず合計 2 クエリ）。
+
+        Args:
+            user_id: ユーザー ID
+            limit: 取得件数
+            before: この（作成日時, ID）より古い目標を取得する（前のページの next_before）
+
+        Returns:
+            ((Goal, アクティブな習慣数) のリスト, 次のページの before（最後のページは None）)
+        """
+        active_habit_count = (
+            select(func.count())
+            .where(Habit.goal_id == Goal.id)
+            .where(Habit.is_active.is_(True))
+            .correlate(Goal)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(Goal, active_habit_count.label("active_habit_count"))
+            .where(Goal.user_id == user_id)
+            .options(selectinload(Goal.habit_details))
+            .order_by(Goal.created_at.desc(), Goal.id.desc())
+            .limit(limit + 1)
+        )
+        if before is not None:
+            stmt = stmt.where(tuple_(Goal.created_at, Goal.id) < tuple_(*before))
+
+        rows = (await self._session.execute(stmt)).all()
+        goals = [(row.Goal, row.active_habit_count) for row in rows[:limit]]
+        next_before = None
+        if len(rows) > limit and goals:
+            last = goals[-1][0]
+            next_before = (last.created_at, last.id)
+        return goals, next_before
+
+    async def create_goal(
+        self,
+        user_id: str,
+        details: str,
+        habits: str,
+        targets: dict[str, Any] | None = None,
+    ) -> Goal:
         """健康目標を作成する。
 
         Args:
             user_id: ユーザー ID
             details: 目標の詳細
             habits: 習慣
+            targets: 数値目標（GoalTargets.as_dict() の形式、省略時は全て NULL）
 
         Returns:
             作成された Goal
@@ -76,4 +129,5 @@ class GoalRepository(BaseRepository[Goal]):
             user_id=user_id,
             details=details,
             habits=habits,
+            **(targets or {}),
         )
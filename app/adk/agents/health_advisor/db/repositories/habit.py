@@ -7,14 +7,53 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import Integer, String, column, func, insert, or_, select, update, values
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models import Habit
+from ..schemas import HabitUpdate
 from .base import BaseRepository
 from ...utils import get_jst_now
 
 
+def scheduled_on(weekday: str) -> ColumnElement[bool]:
+    """指定した曜日に予定されている習慣の条件式を返す。
+
+    days_of_week が未設定（NULL / JSON の null）・配列以外の場合は毎日とみなす。
+
+    Args:
+        weekday: 曜日名（"monday" 等）
+
+    Returns:
+        WHERE 句に使う条件式
+    """
+    return or_(
+        Habit.days_of_week.is_(None),
+        func.jsonb_typeof(Habit.days_of_week) != "array",
+        Habit.days_of_week.contains([weekday]),
+    )
+
+
+# create_routine の項目ごとに指定できるフィールド（運動習慣の詳細と、ルーティン全体の設定の上書き）
+ROUTINE_ITEM_FIELDS = (
+    "title",
+    "description",
+    "exercise_name",
+    "category",
+    "muscle_group",
+    "target_sets",
+    "target_reps",
+    "target_duration",
+    "target_distance",
+    "target_weight",
+    "days_of_week",
+    "time_of_day",
+    "notes",
+    "priority",
+)
+
+
 class HabitRepository(BaseRepository[Habit]):
     """Habit リポジトリ"""
 
@@ -58,6 +97,23 @@ class HabitRepository(BaseRepository[Habit]):
         result = await self._session.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_version(self, user_id: str) -> str:
+        """ユーザーの習慣の版（件数と updated_at の最大値）を取得する。
+
+        習慣の作成・更新・削除で変わるため、習慣のキャッシュの検証に使う。
+
+        Args:
+            user_id: ユーザー ID
+
+        Returns:
+            "件数:最終更新日時" 形式の文字列
+        """
+        stmt = select(func.count(), func.max(Habit.updated_at)).where(
+            Habit.user_id == user_id
+        )
+        count, updated_at = (await self._session.execute(stmt)).one()
+        return f"{count}:{updated_at.isoformat() if updated_at else ''}"
+
     async def get_by_goal_id(
         self,
         goal_id: str,
@@ -116,6 +172,50 @@ class HabitRepository(BaseRepository[Habit]):
         result = await self._session.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_active_schedules(
+        self,
+        user_ids: list[str],
+        start: datetime,
+        end: datetime,
+        habit_type: str | None = None,
+    ) -> list[Any]:
+        """複数ユーザーのアクティブな習慣のスケジュール列を 1 回のクエリで取得する。
+
+        有効期間（start_date 〜 end_date）が [start, end) と重なる習慣のみを返す。
+
+        Args:
+            user_ids: ユーザー ID のリスト
+            start: 期間の開始日時
+            end: 期間の終了日時（この日時を含まない）
+            habit_type: 習慣タイプでフィルタ（"exercise" または "meal"）
+
+        Returns:
+            id, user_id, habit_type, title, frequency, days_of_week, time_of_day,
+            start_date, end_date を持つ行のリスト
+        """
+        stmt = (
+            select(
+                Habit.id,
+                Habit.user_id,
+                Habit.habit_type,
+                Habit.title,
+                Habit.frequency,
+                Habit.days_of_week,
+                Habit.time_of_day,
+                Habit.start_date,
+                Habit.end_date,
+            )
+            .where(Habit.user_id.in_(user_ids))
+            .where(Habit.is_active.is_(True))
+            .where(Habit.start_date < end)
+            .where(or_(Habit.end_date.is_(None), Habit.end_date >= start))
+        )
+        if habit_type is not None:
+            stmt = stmt.where(Habit.habit_type == habit_type)
+
+        result = await self._session.execute(stmt)
+        return list(result.all())
+
     async def create_habit(
         self,
         user_id: str,
@@ -224,37 +324,168 @@ class HabitRepository(BaseRepository[Habit]):
     async def update_habit(
         self,
         habit_id: str,
-        **kwargs: Any,
-    ) -> Habit | None:
-        """習慣を更新する。
+        changes: HabitUpdate,
+        user_id: str | None = None,
+    ) -> tuple[Habit | None, dict[str, dict[str, Any]]]:
+        """習慣を更新する（値が変わるカラムのみ）。
 
         Args:
             habit_id: 習慣 ID
-            **kwargs: 更新するフィールド値
+            changes: 更新内容（指定したフィールドのみ更新する）
+            user_id: 指定した場合、このユーザーの習慣のみ更新する
 
         Returns:
-            更新された Habit、存在しない場合は None
+            (Habit, 差分)。存在しない場合は (None, {})。差分が空なら書き込んでいない
         """
-        return await self.update(habit_id, **kwargs)
+        return await self.update_changed(habit_id, changes.changes(), user_id=user_id)
 
-    async def deactivate_habit(self, habit_id: str) -> Habit | None:
-        """習慣を非アクティブ化する。
+    async def deactivate_habit(
+        self,
+        habit_id: str,
+        user_id: str | None = None,
+    ) -> Habit | None:
+        """習慣を非アクティブ化する（既に非アクティブなら書き込まない）。
 
         Args:
             habit_id: 習慣 ID
+            user_id: 指定した場合、このユーザーの習慣のみ更新する
 
         Returns:
             更新された Habit、存在しない場合は None
         """
-        return await self.update(habit_id, is_active=False)
+        habit, _ = await self.update_habit(habit_id, HabitUpdate(is_active=False), user_id)
+        return habit
 
-    async def activate_habit(self, habit_id: str) -> Habit | None:
-        """習慣をアクティブ化する。
+    async def activate_habit(
+        self,
+        habit_id: str,
+        user_id: str | None = None,
+    ) -> Habit | None:
+        """習慣をアクティブ化する（既にアクティブなら書き込まない）。
 
         Args:
             habit_id: 習慣 ID
+            user_id: 指定した場合、このユーザーの習慣のみ更新する
 
         Returns:
             更新された Habit、存在しない場合は None
         """
-        return await self.update(habit_id, is_active=True)
+        habit, _ = await self.update_habit(habit_id, HabitUpdate(is_active=True), user_id)
+        return habit
+
+    async def create_routine(
+        self,
+        user_id: str,
+        routine_name: str,
+        items: list[dict[str, Any]],
+        frequency: str,
+        goal_id: str | None = None,
+        days_of_week: list[str] | None = None,
+        time_of_day: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> list[Habit]:
+        """ルーティン（複数の運動習慣）を 1 回の INSERT で作成する。
+
+        routine_id を発行し、items の順に order_in_routine を 1 から振る。
+
+        Args:
+            user_id: ユーザー ID
+            routine_name: ルーティン名
+            items: 運動習慣のリスト（ROUTINE_ITEM_FIELDS のキーを持つ辞書、title は必須）。
+                days_of_week / time_of_day を指定した項目はルーティン全体の設定を上書きする
+            frequency: 頻度（"daily", "weekly", "custom"）
+            goal_id: 目標 ID（オプション）
+            days_of_week: 曜日リスト（["monday", "wednesday"]等）
+            time_of_day: 時刻（"HH:MM"形式）
+            start_date: 開始日（省略時は現在時刻）
+            end_date: 終了日
+
+        Returns:
+            作成された Habit のリスト（ルーティン内の順序順）
+
+        Raises:
+            ValueError: items が空、title がない、未知のキーを含む場合
+        """
+        if not items:
+            raise ValueError("ルーティンの運動習慣が指定されていません")
+        for i, item in enumerate(items, start=1):
+            unknown = set(item) - set(ROUTINE_ITEM_FIELDS)
+            if unknown:
+                raise ValueError(f"{i} 番目の項目に未知のキーがあります: {', '.join(sorted(unknown))}")
+            if not item.get("title"):
+                raise ValueError(f"{i} 番目の項目に title がありません")
+
+        routine_id = str(uuid.uuid4())
+        start_date = start_date or get_jst_now()
+        rows = [
+            {
+                **{field: None for field in ROUTINE_ITEM_FIELDS},
+                "days_of_week": days_of_week,
+                "time_of_day": time_of_day,
+                **item,
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "goal_id": goal_id,
+                "habit_type": "exercise",
+                "routine_id": routine_id,
+                "routine_name": routine_name,
+                "order_in_routine": order,
+                "frequency": frequency,
+                "is_active": True,
+                "start_date": start_date,
+                "end_date": end_date,
+            }
+            for order, item in enumerate(items, start=1)
+        ]
+        stmt = insert(Habit).values(rows).returning(Habit)
+        result = await self._session.scalars(stmt)
+        return sorted(result.all(), key=lambda h: h.order_in_routine)
+
+    async def reorder_routine(
+        self,
+        user_id: str,
+        routine_id: str,
+        habit_ids: list[str],
+    ) -> int:
+        """ルーティン内の順序を habit_ids の順に書き換える。
+
+        UPDATE ... FROM (VALUES ...) の 1 文でルーティン全体の order_in_routine を更新する。
+
+        Args:
+            user_id: ユーザー ID
+            routine_id: ルーティン ID
+            habit_ids: ルーティンの全ての習慣 ID（新しい順序）
+
+        Returns:
+            更新した件数
+
+        Raises:
+            ValueError: habit_ids がルーティンの習慣と一致しない場合
+        """
+        stmt = (
+            select(Habit.id)
+            .where(Habit.user_id == user_id)
+            .where(Habit.routine_id == routine_id)
+        )
+        current = set((await self._session.scalars(stmt)).all())
+        if not current:
+            raise ValueError(f"ルーティン ID「{routine_id}」が見つかりません")
+        if len(habit_ids) != len(set(habit_ids)) or set(habit_ids) != current:
+            raise ValueError(
+                "habit_ids にはルーティンの全ての習慣 ID を重複なく指定してください"
+                f"（ルーティンの習慣数: {len(current)}）"
+            )
+
+        orders = values(
+            column("id", String), column("order_in_routine", Integer), name="orders"
+        ).data([(habit_id, order) for order, habit_id in enumerate(habit_ids, start=1)])
+        stmt = (
+            update(Habit)
+            .where(Habit.id == orders.c.id)
+            .where(Habit.user_id == user_id)
+            .where(Habit.routine_id == routine_id)
+            .values(order_in_routine=orders.c.order_in_routine, updated_at=func.now())
+        )
+        result = await self._session.execute(stmt)
+        return result.rowcount
@@ -0,0 +1,229 @@
+"""PersonalRecord リポジトリ
+
+自己ベストの取得と、運動ログからの更新を提供する。
+"""
+
+import uuid
+from typing import Any
+
+from sqlalchemy import and_, func, literal_column, not_, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...analytics.records import NO_WEIGHT, RECORD_METRICS, extract_record_candidates
+from ..models import ExerciseLog, PersonalRecord
+from .base import BaseRepository
+from .exercise import canonical_exercise_name
+
+# 小さいほど良い指標
+_LOWER_IS_BETTER = [metric for metric, higher in RECORD_METRICS.items() if not higher]
+
+
+def _upsert_best():
+    """自己ベストの行を INSERT ... ON CONFLICT DO UPDATE で書き込む文を返す。
+
+    行は session.execute(stmt, rows) の executemany で渡す（SQLAlchemy が
+    バインドパラメータの上限に収まるようにバッチに分ける）。
+    既存の値より良い場合のみ更新する（更新されない行は RETURNING に含まれない）。
+    rows に同じ（ユーザー、運動名、指標、重量）の行を複数含めてはいけない。
+    """
+    stmt = insert(PersonalRecord)
+    excluded = stmt.excluded
+    # executemany では展開されるバインドパラメータ（IN）を使えないため、
+    # 指標名（コード内の定数）はリテラルとして埋め込んだ等値条件の OR にする
+    lower_is_better = or_(
+        *(excluded.metric == literal_column(f"'{metric}'") for metric in _LOWER_IS_BETTER)
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            PersonalRecord.user_id,
+            PersonalRecord.exercise_name,
+            PersonalRecord.metric,
+            PersonalRecord.weight,
+        ],
+        set_={
+            "value": excluded.value,
+            "exercise_log_id": excluded.exercise_log_id,
+            "achieved_at": excluded.achieved_at,
+            "updated_at": func.now(),
+        },
+        where=or_(
+            and_(lower_is_better, excluded.value < PersonalRecord.value),
+            and_(not_(lower_is_better), excluded.value > PersonalRecord.value),
+        ),
+    )
+
+
+class PersonalRecordRepository(BaseRepository[PersonalRecord]):
+    """PersonalRecord リポジトリ"""
+
+    def __init__(self, session: AsyncSession):
+        """リポジトリを初期化する。
+
+        Args:
+            session: SQLAlchemy 非同期セッション
+        """
+        super().__init__(session, PersonalRecord)
+
+    async def get_by_user_id(
+        self,
+        user_id: str,
+        exercise_name: str | None = None,
+    ) -> list[PersonalRecord]:
+        """ユーザーの自己ベストを取得する。
+
+        Args:
+            user_id: ユーザー ID
+            exercise_name: 運動名（省略時は全運動種目）。別名索引で正規名に解決する
+
+        Returns:
+            PersonalRecord のリスト（運動名、指標、重量の順）
+        """
+        stmt = select(PersonalRecord).where(PersonalRecord.user_id == user_id)
+        if exercise_name is not None:
+            stmt = stmt.where(
+                PersonalRecord.exercise_name == canonical_exercise_name(exercise_name)
+            )
+        stmt = stmt.order_by(
+            PersonalRecord.exercise_name,
+            PersonalRecord.metric,
+            PersonalRecord.weight,
+        )
+        result = await self._session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def update_from_log(
+        self,
+        log: ExerciseLog,
+        exercise_name: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """運動ログから自己ベストを更新する。
+
+        候補値を INSERT ... ON CONFLICT DO UPDATE で書き込み、
+        既存の値より良い場合のみ更新する。
+
+        Args:
+            log: 作成した運動ログ
+            exercise_name: 自己ベストを記録する運動名（省略時は log.exercise_name）。
+                表記ゆれをまとめるため、通常は運動種目の正規名を渡す
+
+        Returns:
+            更新（または初登録）された自己ベストの辞書リスト。
+            metric, weight, value, previous_value（初登録の場合は None）を持つ
+        """
+        exercise_name = exercise_name or log.exercise_name
+
+        # 更新前の値（新記録の伸び幅と、max_reps の対象重量の判定に使う）
+        existing_stmt = (
+            select(PersonalRecord.metric, PersonalRecord.weight, PersonalRecord.value)
+            .where(PersonalRecord.user_id == log.user_id)
+            .where(PersonalRecord.exercise_name == exercise_name)
+        )
+        existing = {
+            (row.metric, row.weight): row.value
+            for row in (await self._session.execute(existing_stmt)).all()
+        }
+
+        candidates = extract_record_candidates(
+            log.sets,
+            log.total_distance,
+            previous_max_weight=existing.get(("max_weight", NO_WEIGHT)),
+        )
+        if not candidates:
+            return []
+
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": log.user_id,
+                "exercise_name": exercise_name,
+                "metric": c.metric,
+                "weight": c.weight,
+                "value": c.value,
+                "exercise_log_id": log.id,
+                "achieved_at": log.recorded_at,
+            }
+            for c in candidates
+        ]
+        stmt = _upsert_best().returning(
+            PersonalRecord.metric, PersonalRecord.weight, PersonalRecord.value
+        )
+        result = await self._session.execute(stmt, rows)
+        return [
+            {
+                "metric": row.metric,
+                "weight": row.weight,
+                "value": row.value,
+                "previous_value": existing.get((row.metric, row.weight)),
+            }
+            for row in result.all()
+        ]
+
+    async def update_from_logs(
+        self,
+        logs: list[tuple[ExerciseLog, str]],
+    ) -> int:
+        """複数の運動ログからまとめて自己ベストを更新する（一括インポート用）。
+
+        運動ログごとの候補値を Python 側で（運動名、指標、重量）ごとのベストにまとめ、
+        INSERT ... ON CONFLICT DO UPDATE の executemany で書き込む（行数が多くても
+        バインドパラメータの上限を超えないよう、SQLAlchemy がバッチに分ける）。
+
+        Args:
+            logs: (運動ログ, 自己ベストを記録する運動名) のリスト
+
+        Returns:
+            更新（または初登録）された自己ベストの件数
+        """
+        # max_reps の対象重量の判定に使う最大重量（既存の自己ベストとこのバッチの最大値）
+        max_weights: dict[tuple[str, str], float] = {}
+        for log, exercise_name in logs:
+            for c in extract_record_candidates(log.sets):
+                if c.metric == "max_weight":
+                    key = (log.user_id, exercise_name)
+                    max_weights[key] = max(max_weights.get(key, 0.0), c.value)
+        if max_weights:
+            existing_stmt = (
+                select(PersonalRecord.user_id, PersonalRecord.exercise_name, PersonalRecord.value)
+                .where(PersonalRecord.metric == "max_weight")
+                .where(
+                    tuple_(PersonalRecord.user_id, PersonalRecord.exercise_name).in_(
+                        list(max_weights)
+                    )
+                )
+            )
+            for row in (await self._session.execute(existing_stmt)).all():
+                key = (row.user_id, row.exercise_name)
+                max_weights[key] = max(max_weights[key], row.value)
+
+        best: dict[tuple[str, str, str, float], dict[str, Any]] = {}
+        for log, exercise_name in logs:
+            for c in extract_record_candidates(
+                log.sets,
+                log.total_distance,
+                previous_max_weight=max_weights.get((log.user_id, exercise_name)),
+            ):
+                key = (log.user_id, exercise_name, c.metric, c.weight)
+                current = best.get(key)
+                if current is not None and not (
+                    c.value > current["value"]
+                    if RECORD_METRICS[c.metric]
+                    else c.value < current["value"]
+                ):
+                    continue
+                best[key] = {
+                    "id": str(uuid.uuid4()),
+                    "user_id": log.user_id,
+                    "exercise_name": exercise_name,
+                    "metric": c.metric,
+                    "weight": c.weight,
+                    "value": c.value,
+                    "exercise_log_id": log.id,
+                    "achieved_at": log.recorded_at,
+                }
+        if not best:
+            return 0
+
+        stmt = _upsert_best().returning(PersonalRecord.id)
+        result = await self._session.execute(stmt, list(best.values()))
+        return len(result.all())
@@ -0,0 +1,146 @@
+"""WeeklyMuscleVolume リポジトリ
+
+週ごと・筋肉群ごとのトレーニング量の加算と取得を提供する。
+"""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import ExerciseLog, WeeklyMuscleVolume
+from .base import BaseRepository
+from ...utils import JST
+
+# 筋肉群が未設定の運動ログの muscle_group
+UNKNOWN_MUSCLE_GROUP = "unknown"
+
+
+def iso_week_key(value: datetime | date) -> str:
+    """日時（または日付）が属する JST の ISO 週を "YYYY-Www" 形式で返す。
+
+    タイムゾーンなしの日時は UTC として扱う（Prisma の TIMESTAMP と同じ）。
+    マイグレーションの to_char(..., 'IYYY-"W"IW') と同じ形式になる。
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        value = value.astimezone(JST).date()
+    year, week, _ = value.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def previous_iso_week_key(value: datetime | date) -> str:
+    """日時（または日付）の前週の ISO 週を返す。"""
+    return iso_week_key(value - timedelta(weeks=1))
+
+
+class WeeklyMuscleVolumeRepository(BaseRepository[WeeklyMuscleVolume]):
+    """WeeklyMuscleVolume リポジトリ"""
+
+    def __init__(self, session: AsyncSession):
+        """リポジトリを初期化する。
+
+        Args:
+            session: SQLAlchemy 非同期セッション
+        """
+        super().__init__(session, WeeklyMuscleVolume)
+
+    async def get_by_weeks(
+        self,
+        user_id: str,
+        iso_weeks: list[str],
+    ) -> list[WeeklyMuscleVolume]:
+        """指定した ISO 週の集計を取得する。
+
+        Args:
+            user_id: ユーザー ID
+            iso_weeks: ISO 週のリスト（"2026-W42" 形式）
+
+        Returns:
+            WeeklyMuscleVolume のリスト（ISO 週、セット数の降順）
+        """
+        stmt = (
+            select(WeeklyMuscleVolume)
+            .where(WeeklyMuscleVolume.user_id == user_id)
+            .where(WeeklyMuscleVolume.iso_week.in_(iso_weeks))
+            .order_by(WeeklyMuscleVolume.iso_week, WeeklyMuscleVolume.sets.desc())
+        )
+        result = await self._session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def add_log(
+        self,
+        log: ExerciseLog,
+        muscle_group: str | None = None,
+    ) -> None:
+        """運動ログの量を週ごと・筋肉群ごとの集計に加算する。
+
+        Args:
+            log: 作成した運動ログ
+            muscle_group: 集計する筋肉群（省略時は log.muscle_group、どちらもなければ "unknown"）
+        """
+        await self.add_logs([(log, muscle_group)])
+
+    async def add_logs(
+        self,
+        logs: list[tuple[ExerciseLog, str | None]],
+    ) -> None:
+        """複数の運動ログの量を週ごと・筋肉群ごとの集計に加算する。
+
+        Python 側で（ユーザー、ISO 週、筋肉群）ごとに合計し、
+        INSERT ... ON CONFLICT DO UPDATE の executemany で既存の行に加算する
+        （行数が多くてもバインドパラメータの上限を超えないよう、SQLAlchemy がバッチに分ける）。
+
+        Args:
+            logs: (運動ログ, 集計する筋肉群) のリスト。筋肉群の扱いは add_log と同じ
+        """
+        rows: dict[tuple[str, str, str], dict[str, Any]] = {}
+        for log, muscle_group in logs:
+            key = (
+                log.user_id,
+                iso_week_key(log.recorded_at),
+                muscle_group or log.muscle_group or UNKNOWN_MUSCLE_GROUP,
+            )
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {
+                    "id": str(uuid.uuid4()),
+                    "user_id": key[0],
+                    "iso_week": key[1],
+                    "muscle_group": key[2],
+                    "sessions": 0,
+                    "sets": 0,
+                    "reps": 0,
+                    "volume": 0.0,
+                    "duration": 0,
+                }
+            row["sessions"] += 1
+            row["sets"] += log.total_sets or 0
+            row["reps"] += log.total_reps or 0
+            row["volume"] += log.total_volume or 0.0
+            row["duration"] += log.total_duration or 0
+        if not rows:
+            return
+
+        stmt = insert(WeeklyMuscleVolume)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                WeeklyMuscleVolume.user_id,
+                WeeklyMuscleVolume.iso_week,
+                WeeklyMuscleVolume.muscle_group,
+            ],
+            set_={
+                "sessions": WeeklyMuscleVolume.sessions + excluded.sessions,
+                "sets": WeeklyMuscleVolume.sets + excluded.sets,
+                "reps": WeeklyMuscleVolume.reps + excluded.reps,
+                "volume": WeeklyMuscleVolume.volume + excluded.volume,
+                "duration": WeeklyMuscleVolume.duration + excluded.duration,
+                "updated_at": func.now(),
+            },
+        )
+        await self._session.execute(stmt, list(rows.values()))
@@ -0,0 +1,101 @@
+"""更新スキーマ
+
+モデルごとに更新してよいカラムと値の型・範囲を定義する。
+リポジトリの update_changed に渡すと、指定されたカラムのうち現在の値と異なるものだけを
+UPDATE する（何も変わらない場合は書き込まない）。
+
+指定しなかったフィールドは更新しない（model_dump(exclude_unset=True) で取り出す）。
+NULL を許すカラムは None を指定すると NULL に更新する。
+"""
+
+from datetime import datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from ..analytics.schedule import WEEKDAY_NAMES
+from ..utils import as_jst, parse_datetime_jst
+
+
+class _UpdateBase(BaseModel):
+    """共通: 未知のフィールドを拒否し、代入時にも検証する。"""
+
+    model_config = ConfigDict(extra="forbid", validate_assignment=True)
+
+    def changes(self) -> dict[str, Any]:
+        """指定されたフィールドだけを辞書で返す。"""
+        return self.model_dump(exclude_unset=True)
+
+
+class HabitUpdate(_UpdateBase):
+    """Habit の更新スキーマ
+
+    user_id, goal_id, habit_type, routine_id 等の関連・分類のカラムは更新できない
+    （ルーティン内の順序は reorder_routine で変更する）。
+    """
+
+    title: str = Field(default=None, min_length=1)
+    description: str | None = None
+    exercise_name: str | None = None
+    category: str | None = None
+    muscle_group: str | None = None
+    target_sets: int | None = Field(default=None, ge=0)
+    target_reps: int | None = Field(default=None, ge=0)
+    target_duration: int | None = Field(default=None, ge=0)
+    target_distance: float | None = Field(default=None, ge=0)
+    target_weight: float | None = Field(default=None, ge=0)
+    meal_type: str | None = None
+    target_calories: int | None = Field(default=None, ge=0)
+    target_proteins: int | None = Field(default=None, ge=0)
+    target_fats: int | None = Field(default=None, ge=0)
+    target_carbohydrates: int | None = Field(default=None, ge=0)
+    meal_guidelines: str | None = None
+    frequency: Literal["daily", "weekly", "custom"] = None
+    days_of_week: list[str] | None = None
+    time_of_day: str | None = Field(default=None, pattern=r"^([01]\d|2[0-3]):[0-5]\d$")
+    is_active: bool = None
+    start_date: datetime = None
+    end_date: datetime | None = None
+    notes: str | None = None
+    priority: int | None = Field(default=None, ge=1, le=5)
+
+    @field_validator("days_of_week")
+    @classmethod
+    def _normalize_days(cls, value: list[str] | None) -> list[str] | None:
+        """曜日名を小文字の正式名（"monday" 等）にそろえる（"Mon" なども許容する）。"""
+        if value is None:
+            return None
+        days = []
+        for name in value:
+            key = name.strip().lower()[:3]
+            day = next((d for d in WEEKDAY_NAMES if key and d.startswith(key)), None)
+            if day is None:
+                raise ValueError(f"不正な曜日です: {name}")
+            if day not in days:
+                days.append(day)
+        return days
+
+    @field_validator("start_date", "end_date", mode="before")
+    @classmethod
+    def _to_jst(cls, value: Any) -> Any:
+        """タイムゾーンのない日時は JST とみなす（習慣の作成時と同じ parse_datetime_jst）。"""
+        if isinstance(value, str):
+            return parse_datetime_jst(value)
+        if isinstance(value, datetime):
+            return as_jst(value)
+        return value
+
+
+class DietLogUpdate(_UpdateBase):
+    """DietLog の更新スキーマ（栄養素とメモ）"""
+
+    name: str = Field(default=None, min_length=1)
+    calories: float = Field(default=None, ge=0)
+    proteins: float = Field(default=None, ge=0)
+    fats: float = Field(default=None, ge=0)
+    carbohydrates: float = Field(default=None, ge=0)
+    sodium: float | None = Field(default=None, ge=0)
+    fiber: float | None = Field(default=None, ge=0)
+    sugar: float | None = Field(default=None, ge=0)
+    note: str | None = None
+    is_user_corrected: bool = None
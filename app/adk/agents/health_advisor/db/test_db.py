@@ -182,7 +182,7 @@ async def test_crud() -> bool:
 
             # Create
             print("\n[CREATE] ExerciseLog を作成...")
-            log = await repo.create_log(
+            log, _ = await repo.create_log(
                 user_id=test_user_id,
                 exercise_name="テストウォーキング",
                 sets=[{"reps": 1, "duration": 1800}],
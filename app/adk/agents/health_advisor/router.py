@@ -0,0 +1,209 @@
+"""ルートエージェントの事前ルーティング
+
+ユーザーの発話をキーワード・正規表現・メディアの種類でローカルに分類し、
+明らかなケース（食事の画像、「〇〇食べた」、「ベンチ 50kg×10」等）は root_agent の
+LLM を呼ばずにサブエージェントへ転送する。確信度が閾値に届かない場合は従来どおり
+root_agent の LLM に判断を任せる。
+
+root_agent の before_model_callback として登録する。LlmResponse として
+transfer_to_agent の関数呼び出しを返すと、ADK がそのままサブエージェントへ転送する。
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from .logger import get_logger
+from .utils import get_jst_now
+
+logger = get_logger(__name__)
+
+MEAL_RECORD_AGENT = "meal_record_agent"
+EXERCISE_MANAGER_AGENT = "exercise_manager_agent"
+GOAL_SETTING_AGENT = "goal_setting_agent"
+
+# 目標設定の会話の開始日時を保存する state のキー（goal_setting_agent が開始時に書き込み、
+# 目標の保存時に None に戻す）。会話中の「はい」「それで」等は LLM に判断を任せる
+GOAL_SETTING_STARTED_AT_STATE_KEY = "goal_setting_started_at"
+
+# 目標設定の会話が続いているとみなす時間
+GOAL_SETTING_ACTIVE_WINDOW = timedelta(minutes=30)
+
+# 事前ルーティングした呼び出しの ID を保存する state のキー（同じ呼び出しで 2 回転送しない）
+PRE_ROUTED_INVOCATION_STATE_KEY = "pre_routed_invocation_id"
+
+# 転送に必要な確信度と、2 番目の候補との差
+ROUTE_THRESHOLD = 0.8
+ROUTE_MARGIN = 0.3
+
+# (エージェント, パターン, 重み)。同じエージェントの重みは noisy-OR で合成する
+_RULES: tuple[tuple[str, re.Pattern[str], float], ...] = tuple(
+    (agent, re.compile(pattern, re.IGNORECASE), weight)
+    for agent, pattern, weight in (
+        # 運動: 重量×回数・回数×セット（「ベンチ 50kg×10」「10回×3セット」）
+        (EXERCISE_MANAGER_AGENT, r"\d+(?:\.\d+)?\s*(?:kg|キロ|lbs?)\s*[x×*]\s*\d+", 0.85),
+        (EXERCISE_MANAGER_AGENT, r"\d+\s*(?:回|reps?)\s*[x×*]?\s*\d+\s*(?:セット|sets?)", 0.85),
+        (EXERCISE_MANAGER_AGENT, r"\d+\s*(?:セット|sets?)", 0.5),
+        (
+            EXERCISE_MANAGER_AGENT,
+            r"ベンチ|スクワット|デッドリフト|懸垂|腕立て|腹筋|プランク|ラットプル|ショルダープレス"
+            r"|ダンベル|バーベル|筋トレ|ジム|ランニング|ジョギング|ウォーキング|ヨガ|水泳",
+            0.55,
+        ),
+        (EXERCISE_MANAGER_AGENT, r"\d+(?:\.\d+)?\s*(?:km|キロ)\s*(?:走|歩|泳|こい)", 0.85),
+        (EXERCISE_MANAGER_AGENT, r"(?:走|歩|泳)(?:った|りました|きました|ぎました)|トレーニングした", 0.6),
+        (EXERCISE_MANAGER_AGENT, r"運動(?:した|しました|の記録|の計画|習慣|メニュー)", 0.75),
+        # 食事: 「〇〇食べた」、食事の時間帯、カロリー・レシピの相談
+        (MEAL_RECORD_AGENT, r"食べ(?:た|ました|てる)|飲んだ|飲みました", 0.85),
+        (
+            MEAL_RECORD_AGENT,
+            r"朝(?:食|ごはん|ご飯)|昼(?:食|ごはん|ご飯)|(?:夕|夜|晩)(?:食|ごはん|ご飯)"
+            r"|ランチ|ディナー|間食|おやつ",
+            0.6,
+        ),
+        (MEAL_RECORD_AGENT, r"kcal|カロリー|PFC|タンパク質|たんぱく質|脂質|炭水化物", 0.5),
+        (MEAL_RECORD_AGENT, r"レシピ|お腹(?:すいた|空いた)|何(?:を)?食べ", 0.85),
+        # 目標
+        (GOAL_SETTING_AGENT, r"目標(?:を)?(?:設定|変更|決め|立て|見直|確認)", 0.85),
+        (GOAL_SETTING_AGENT, r"痩せたい|やせたい|ダイエットしたい|減量したい|健康になりたい", 0.8),
+    )
+)
+
+# 目標に関係なく、ルートが直接答える・判断すべき発話（挨拶・日時・機能の質問）
+_ROOT_ONLY = re.compile(
+    r"^(?:こんにちは|こんばんは|おはよう|はじめまして|ありがとう)|何ができ|今(?:何時|日は何日)|日付|曜日"
+)
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    """事前ルーティングの判定結果"""
+
+    agent_name: str
+    confidence: float
+    reason: str
+
+
+def classify_message(text: str, mime_types: list[str]) -> RouteDecision | None:
+    """発話とメディアの種類から転送先のサブエージェントを判定する。
+
+    Args:
+        text: ユーザーの発話（テキスト部分）
+        mime_types: 添付メディアの MIME タイプ
+
+    Returns:
+        確信度が閾値を超え、2 番目の候補との差も十分な場合は RouteDecision。それ以外は None
+    """
+    text = unicodedata.normalize("NFKC", text or "").strip()
+    if text and _ROOT_ONLY.search(text):
+        return None
+
+    misses: dict[str, float] = {}
+    reasons: dict[str, list[str]] = {}
+
+    def add(agent: str, weight: float, reason: str) -> None:
+        misses[agent] = misses.get(agent, 1.0) * (1.0 - weight)
+        reasons.setdefault(agent, []).append(reason)
+
+    # ルートの指示どおり、画像・動画・音声は食事記録に渡す（食事の写真がほとんど）
+    for mime_type in mime_types:
+        if mime_type.startswith("image/"):
+            add(MEAL_RECORD_AGENT, 0.9, mime_type)
+        elif mime_type.startswith(("video/", "audio/")):
+            add(MEAL_RECORD_AGENT, 0.6, mime_type)
+
+    for agent, pattern, weight in _RULES:
+        match = pattern.search(text)
+        if match:
+            add(agent, weight, match.group(0))
+
+    if not misses:
+        return None
+
+    scores = sorted(
+        ((1.0 - miss, agent) for agent, miss in misses.items()), reverse=True
+    )
+    best, agent = scores[0]
+    runner_up = scores[1][0] if len(scores) > 1 else 0.0
+    if best < ROUTE_THRESHOLD or best - runner_up < ROUTE_MARGIN:
+        return None
+    return RouteDecision(agent, round(best, 3), ", ".join(reasons[agent]))
+
+
+def mark_goal_setting_started(callback_context: CallbackContext) -> None:
+    """目標設定の会話の開始を記録する（goal_setting_agent の before_agent_callback）。"""
+    callback_context.state[GOAL_SETTING_STARTED_AT_STATE_KEY] = get_jst_now().isoformat()
+
+
+def _goal_setting_in_progress(callback_context: CallbackContext) -> bool:
+    started_at = callback_context.state.get(GOAL_SETTING_STARTED_AT_STATE_KEY)
+    if not started_at:
+        return False
+    try:
+        return get_jst_now() - datetime.fromisoformat(started_at) < GOAL_SETTING_ACTIVE_WINDOW
+    except (TypeError, ValueError):
+        return False
+
+
+def pre_route(
+    callback_context: CallbackContext,
+    llm_request: LlmRequest,
+) -> LlmResponse | None:
+    """明らかなケースは root_agent の LLM を呼ばずにサブエージェントへ転送する。
+
+    呼び出しの最初の LLM 呼び出し（最後のコンテンツがユーザーの発話そのもの）のみ対象とし、
+    サブエージェントから戻ってきた後やツール呼び出しの続きでは何もしない。
+
+    Returns:
+        転送する場合は transfer_to_agent の関数呼び出しを含む LlmResponse、
+        LLM に判断を任せる場合は None
+    """
+    user_content = callback_context.user_content
+    if (
+        user_content is None
+        or not user_content.parts
+        or not llm_request.contents
+        or llm_request.contents[-1] != user_content
+    ):
+        return None
+    if callback_context.state.get(PRE_ROUTED_INVOCATION_STATE_KEY) == callback_context.invocation_id:
+        return None
+    if _goal_setting_in_progress(callback_context):
+        return None
+
+    text = " ".join(part.text for part in user_content.parts if part.text)
+    mime_types = [
+        media.mime_type
+        for part in user_content.parts
+        for media in (part.inline_data, part.file_data)
+        if media is not None and media.mime_type
+    ]
+    decision = classify_message(text, mime_types)
+    if decision is None:
+        return None
+
+    callback_context.state[PRE_ROUTED_INVOCATION_STATE_KEY] = callback_context.invocation_id
+    logger.info(
+        "事前ルーティングでサブエージェントに転送します",
+        agent_name=decision.agent_name,
+        confidence=decision.confidence,
+        reason=decision.reason,
+    )
+    return LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[
+                types.Part(
+                    function_call=types.FunctionCall(
+                        name="transfer_to_agent",
+                        args={"agent_name": decision.agent_name},
+                    )
+                )
+            ],
+        )
+    )
@@ -0,0 +1,5 @@
+"""サービス層
+
+複数のツールから共有される DB 読み取りを、キャッシュ付きで提供する。
+書き込みを行うツールは、対応するサービスの invalidate を呼び出すこと。
+"""
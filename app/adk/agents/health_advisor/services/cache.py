@@ -0,0 +1,59 @@
+"""プロセス内 TTL キャッシュ
+
+Agent Engine のインスタンス内で共有される、有効期限付きの簡易キャッシュ。
+イベントループに依存するオブジェクト（セッション等）は格納しないこと。
+"""
+
+import time
+from typing import Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """有効期限付きのキー・バリューキャッシュ
+
+    使用例:
+        cache: TTLCache[dict] = TTLCache(ttl_seconds=300)
+        value = cache.get(user_id)
+        if value is None:
+            value = await load(user_id)
+            cache.set(user_id, value)
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024):
+        """キャッシュを初期化する。
+
+        Args:
+            ttl_seconds: 有効期限（秒）
+            maxsize: 保持するエントリ数の上限（超えた場合は古いものから削除）
+        """
+        self._ttl = ttl_seconds
+        self._maxsize = maxsize
+        self._entries: dict[Hashable, tuple[float, V]] = {}
+
+    def get(self, key: Hashable) -> V | None:
+        """値を取得する。存在しない・期限切れの場合は None。"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """値を保存する。"""
+        if key not in self._entries and len(self._entries) >= self._maxsize:
+            # dict は挿入順を保持するため、先頭が最も古いエントリ
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """値を削除する。"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """全ての値を削除する。"""
+        self._entries.clear()
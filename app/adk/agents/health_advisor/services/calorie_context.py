@@ -0,0 +1,75 @@
+"""カロリーコンテキストの提供
+
+今日（JST）の摂取カロリーと目標カロリー（健康目標の daily_calorie_target、
+なければ食事習慣の目標の合計）を DB から 1 クエリで取得し、
+ユーザーごとに TTL 付きでキャッシュする。食事記録の書き込み時は
+invalidate_calorie_context を呼び出してキャッシュを破棄する。
+"""
+
+from typing import Any
+
+from ..analytics.schedule import WEEKDAY_NAMES
+from ..db.config import get_async_session
+from ..db.repositories import DietLogRepository
+from ..logger import get_logger
+from ..utils import get_today_range_jst
+from .cache import TTLCache
+
+logger = get_logger(__name__)
+
+# 食事記録の書き込みで破棄されるため、TTL は目標値の変更を拾うための上限
+CALORIE_CONTEXT_TTL_SECONDS = 300
+
+_cache: TTLCache[dict[str, Any]] = TTLCache(ttl_seconds=CALORIE_CONTEXT_TTL_SECONDS)
+
+
+async def get_calorie_context(user_id: str) -> dict[str, Any]:
+    """今日の摂取カロリーと目標カロリーを取得する。
+
+    Args:
+        user_id: ユーザー ID
+
+    Returns:
+        以下のキーを持つ辞書:
+        - date: 対象日（JST, "YYYY-MM-DD"）
+        - today_calories: 今日の摂取カロリー
+        - meal_count: 今日の食事記録数
+        - daily_calorie_target: 目標カロリー（未設定の場合は None）
+        - remaining_calories: 残りカロリー（0 未満にはしない。目標未設定の場合は None）
+    """
+    today, tomorrow = get_today_range_jst()
+    date_str = today.strftime("%Y-%m-%d")
+
+    cached = _cache.get(user_id)
+    # 日付が変わった場合はキャッシュを使わない
+    if cached is not None and cached["date"] == date_str:
+        return cached
+
+    async with get_async_session() as session:
+        row = await DietLogRepository(session).get_calorie_context(
+            user_id,
+            today,
+            tomorrow,
+            weekday=WEEKDAY_NAMES[today.weekday()],
+        )
+
+    today_calories = float(row["consumed_calories"])
+    # 食事習慣は一部の食事（夕食のみ等）にしか目標がないことがあるため、
+    # 1 日の目標には健康目標を優先する
+    target = row["goal_calorie_target"] or row["habit_calorie_target"]
+    context = {
+        "date": date_str,
+        "today_calories": today_calories,
+        "meal_count": row["meal_count"],
+        "daily_calorie_target": target,
+        "remaining_calories": max(target - today_calories, 0.0) if target else None,
+    }
+    _cache.set(user_id, context)
+
+    logger.info("カロリーコンテキストを取得しました", user_id=user_id, **context)
+    return context
+
+
+def invalidate_calorie_context(user_id: str) -> None:
+    """ユーザーのカロリーコンテキストのキャッシュを破棄する。"""
+    _cache.invalidate(user_id)
@@ -0,0 +1,122 @@
+"""健康目標の提供
+
+ユーザーの最新の健康目標を DB から取得し、プロセス内キャッシュ（TTL 付き）と
+tool_context.state の health_goal に保持する。get_current_goal と
+get_user_health_goal の両ツールはこのサービスを経由する。
+
+目標の保存時は、保存した内容を store_current_goal でキャッシュと state に
+書き込む（write-through）。目標が変わらない限り、DB の読み取りはセッションあたり最大 1 回。
+"""
+
+from typing import Any
+
+from ..db.config import get_async_session
+from ..db.models import Goal
+from ..db.repositories import GoalRepository
+from ..logger import get_logger
+from ..utils import JST, to_utc
+from .cache import TTLCache
+
+logger = get_logger(__name__)
+
+# tool_context.state のキー（目標が未設定の場合は空の辞書）
+HEALTH_GOAL_STATE_KEY = "health_goal"
+
+# 目標は set_user_health_goal でしか変わらないため、TTL は他のインスタンスでの変更を拾うための上限
+GOAL_TTL_SECONDS = 600
+
+# 値は {"goal": 目標の辞書または None}（未設定もキャッシュする）
+_cache: TTLCache[dict[str, Any]] = TTLCache(ttl_seconds=GOAL_TTL_SECONDS)
+
+
+def _to_dict(goal: Goal) -> dict[str, Any]:
+    """Goal をツールの戻り値・state に入れる辞書にする。
+
+    日時は JST で返す（DB から読み込んだタイムゾーンなしの日時は UTC）。
+    """
+    return {
+        "id": goal.id,
+        "details": goal.details,
+        "habits": goal.habits,
+        "daily_calorie_target": goal.daily_calorie_target,
+        "target_proteins": goal.target_proteins,
+        "target_fats": goal.target_fats,
+        "target_carbohydrates": goal.target_carbohydrates,
+        "target_weight": goal.target_weight,
+        "deadline": (
+            to_utc(goal.deadline).astimezone(JST).isoformat() if goal.deadline else None
+        ),
+        "weekly_exercise_sessions": goal.weekly_exercise_sessions,
+        "created_at": to_utc(goal.created_at).astimezone(JST).isoformat(),
+    }
+
+
+def _remember(user_id: str, goal: dict[str, Any] | None, state: Any | None) -> None:
+    """目標をキャッシュと state に保存する。"""
+    _cache.set(user_id, {"goal": goal})
+    if state is not None:
+        state[HEALTH_GOAL_STATE_KEY] = goal or {}
+
+
+async def get_current_goal(
+    user_id: str,
+    state: Any | None = None,
+) -> dict[str, Any] | None:
+    """ユーザーの最新の健康目標を取得する。
+
+    Args:
+        user_id: ユーザー ID
+        state: tool_context.state（省略時はプロセス内キャッシュのみ使う）
+
+    Returns:
+        id, details, habits, 数値目標（daily_calorie_target 等）, created_at を持つ辞書。
+        未設定の場合は None
+    """
+    if state is not None and HEALTH_GOAL_STATE_KEY in state:
+        goal = state[HEALTH_GOAL_STATE_KEY]
+        if not goal or "id" in goal:
+            return goal or None
+
+    cached = _cache.get(user_id)
+    if cached is not None:
+        goal = cached["goal"]
+    else:
+        async with get_async_session() as session:
+            row = await GoalRepository(session).get_by_user_id(user_id)
+        goal = _to_dict(row) if row is not None else None
+        logger.info(
+            "健康目標を取得しました",
+            user_id=user_id,
+            goal_id=goal["id"] if goal else None,
+        )
+
+    _remember(user_id, goal, state)
+    return goal
+
+
+def store_current_goal(
+    user_id: str,
+    goal: Goal,
+    state: Any | None = None,
+) -> dict[str, Any]:
+    """保存した健康目標をキャッシュと state に書き込む（write-through）。
+
+    目標を保存するツールは、書き込みの前に invalidate_current_goal を、
+    保存後にこの関数を呼び出すこと。
+
+    Args:
+        user_id: ユーザー ID
+        goal: 保存した Goal
+        state: tool_context.state
+
+    Returns:
+        目標の辞書（get_current_goal と同じ形式）
+    """
+    saved = _to_dict(goal)
+    _remember(user_id, saved, state)
+    return saved
+
+
+def invalidate_current_goal(user_id: str) -> None:
+    """ユーザーの健康目標のキャッシュを破棄する。"""
+    _cache.invalidate(user_id)
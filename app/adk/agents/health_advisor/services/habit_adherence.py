@@ -0,0 +1,56 @@
+"""運動習慣の実施状況の提供
+
+アクティブな運動習慣と、その運動名に一致する運動ログの日別合計を取得し、
+analytics.adherence で習慣ごとの実施率を計算する。
+運動習慣の実施率ツールと運動レトロスペクティブで共有する。
+"""
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from ..analytics.adherence import ExerciseTarget, compute_habit_adherence
+from ..db.config import get_async_session
+from ..db.repositories import ExerciseLogRepository
+from ..logger import get_logger
+from .habit_snapshot import get_active_habits
+
+logger = get_logger(__name__)
+
+
+async def get_habit_adherence(
+    user_id: str,
+    start: datetime,
+    end: datetime,
+) -> list[dict[str, Any]]:
+    """期間内の運動習慣ごとの実施状況を計算する。
+
+    Args:
+        user_id: ユーザー ID
+        start: 期間の開始日（JST の 0:00）
+        end: 期間の終了日（JST の 0:00、この日を含む）
+
+    Returns:
+        compute_habit_adherence の結果（運動名のある運動習慣がない場合は空リスト）
+    """
+    habits = [h for h in await get_active_habits(user_id) if h.habit_type == "exercise"]
+    targets = [t for t in map(ExerciseTarget.from_habit, habits) if t is not None]
+    if not targets:
+        return []
+
+    async with get_async_session() as session:
+        daily_totals = await ExerciseLogRepository(session).get_daily_totals_by_habit(
+            user_id,
+            {t.habit_id: t.exercise_name for t in targets},
+            start,
+            end + timedelta(days=1),
+        )
+
+    results = compute_habit_adherence(targets, daily_totals, start.date(), end.date())
+    logger.info(
+        "運動習慣の実施状況を計算しました",
+        user_id=user_id,
+        start_date=start.date().isoformat(),
+        end_date=end.date().isoformat(),
+        habit_count=len(results),
+    )
+    return results
@@ -0,0 +1,75 @@
+"""習慣の予定の提供
+
+複数ユーザーのアクティブな習慣のスケジュールを 1 回のクエリで取得し、
+analytics.schedule で期間内の予定（日付・時刻順）に展開する。
+「今日やること」の表示、リマインド、実施率の計算で共有する。
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from ..analytics.schedule import HabitSchedule, Occurrence, expand_occurrences
+from ..db.config import get_async_session
+from ..db.repositories import HabitRepository
+from ..logger import get_logger
+from ..utils import JST
+
+logger = get_logger(__name__)
+
+
+async def get_habit_schedules(
+    user_ids: list[str],
+    start: date,
+    end: date,
+    habit_type: str | None = None,
+) -> list[HabitSchedule]:
+    """期間内に有効なアクティブな習慣のスケジュールを取得する。
+
+    Args:
+        user_ids: ユーザー ID のリスト
+        start: 期間の開始日（JST）
+        end: 期間の終了日（JST、この日を含む）
+        habit_type: 習慣タイプでフィルタ（"exercise" または "meal"）
+
+    Returns:
+        HabitSchedule のリスト
+    """
+    if not user_ids:
+        return []
+    async with get_async_session() as session:
+        rows = await HabitRepository(session).get_active_schedules(
+            user_ids,
+            datetime.combine(start, time.min, tzinfo=JST),
+            datetime.combine(end + timedelta(days=1), time.min, tzinfo=JST),
+            habit_type=habit_type,
+        )
+    return [HabitSchedule.from_habit(row) for row in rows]
+
+
+async def get_occurrences(
+    user_ids: list[str],
+    start: date,
+    end: date,
+    habit_type: str | None = None,
+) -> list[Occurrence]:
+    """複数ユーザーの習慣を期間内の予定に展開する。
+
+    Args:
+        user_ids: ユーザー ID のリスト
+        start: 期間の開始日（JST）
+        end: 期間の終了日（JST、この日を含む）
+        habit_type: 習慣タイプでフィルタ（"exercise" または "meal"）
+
+    Returns:
+        予定のリスト（日付, 時刻, ユーザー ID, 習慣 ID の順）
+    """
+    schedules = await get_habit_schedules(user_ids, start, end, habit_type)
+    occurrences = list(expand_occurrences(schedules, start, end))
+    logger.info(
+        "習慣の予定を展開しました",
+        user_count=len(user_ids),
+        habit_count=len(schedules),
+        occurrence_count=len(occurrences),
+        start_date=start.isoformat(),
+        end_date=end.isoformat(),
+    )
+    return occurrences
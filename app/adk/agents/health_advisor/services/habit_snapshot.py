@@ -0,0 +1,116 @@
+"""アクティブな習慣のスナップショットの提供
+
+ユーザーのアクティブな習慣をまとめて取得し、プロセス内キャッシュと
+tool_context.state（同じセッション内の後続の呼び出し）に保持する。
+
+- tool_context.state のスナップショットはそのまま使う（DB にアクセスしない）
+- プロセス内キャッシュは習慣の版（件数と updated_at の最大値）を 1 クエリで確認してから使う
+- 習慣を書き込むツールは invalidate_habit_snapshot を呼び出して両方を破棄する
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any
+
+from ..db.config import get_async_session
+from ..db.models import Habit
+from ..db.repositories import HabitRepository
+from ..logger import get_logger
+from .cache import TTLCache
+
+logger = get_logger(__name__)
+
+# tool_context.state のキー
+HABIT_SNAPSHOT_STATE_KEY = "habit_snapshot"
+
+# 版を確認してから使うため、TTL はメモリを解放するための上限
+HABIT_SNAPSHOT_TTL_SECONDS = 1800
+
+# スナップショットに含める習慣数の上限
+MAX_SNAPSHOT_HABITS = 1000
+
+_DATETIME_FIELDS = ("start_date", "end_date", "created_at", "updated_at")
+
+_cache: TTLCache[dict[str, Any]] = TTLCache(ttl_seconds=HABIT_SNAPSHOT_TTL_SECONDS)
+
+
+def _serialize(habit: Habit) -> dict[str, Any]:
+    """Habit を JSON に変換できる辞書にする（日時は ISO 8601 文字列）。"""
+    return {
+        column.key: value.isoformat() if isinstance(value, datetime) else value
+        for column in Habit.__table__.columns
+        for value in (getattr(habit, column.key),)
+    }
+
+
+def _to_view(data: dict[str, Any]) -> SimpleNamespace:
+    """スナップショットの辞書を Habit と同じ属性で読めるオブジェクトにする。"""
+    return SimpleNamespace(
+        **{
+            key: datetime.fromisoformat(value)
+            if key in _DATETIME_FIELDS and value is not None
+            else value
+            for key, value in data.items()
+        }
+    )
+
+
+async def _load_snapshot(user_id: str) -> dict[str, Any]:
+    """プロセス内キャッシュを版で検証し、古ければ DB から取得し直す。"""
+    cached = _cache.get(user_id)
+    async with get_async_session() as session:
+        repo = HabitRepository(session)
+        version = await repo.get_version(user_id)
+        if cached is not None and cached["version"] == version:
+            return cached
+
+        habits = await repo.get_by_user_id(
+            user_id, is_active=True, limit=MAX_SNAPSHOT_HABITS
+        )
+
+    snapshot = {
+        "user_id": user_id,
+        "version": version,
+        "habits": [_serialize(habit) for habit in habits],
+    }
+    _cache.set(user_id, snapshot)
+    logger.info(
+        "習慣のスナップショットを取得しました",
+        user_id=user_id,
+        version=version,
+        count=len(habits),
+    )
+    return snapshot
+
+
+async def get_active_habits(
+    user_id: str,
+    state: Any | None = None,
+) -> list[SimpleNamespace]:
+    """ユーザーのアクティブな習慣を取得する。
+
+    Args:
+        user_id: ユーザー ID
+        state: tool_context.state（省略時はプロセス内キャッシュのみ使う）
+
+    Returns:
+        Habit と同じ属性を持つオブジェクトのリスト（開始日の降順）
+    """
+    snapshot = state.get(HABIT_SNAPSHOT_STATE_KEY) if state is not None else None
+    if not snapshot or snapshot.get("user_id") != user_id:
+        snapshot = await _load_snapshot(user_id)
+        if state is not None:
+            state[HABIT_SNAPSHOT_STATE_KEY] = snapshot
+    return [_to_view(data) for data in snapshot["habits"]]
+
+
+def invalidate_habit_snapshot(user_id: str, state: Any | None = None) -> None:
+    """ユーザーの習慣のスナップショットを破棄する。
+
+    Args:
+        user_id: ユーザー ID
+        state: tool_context.state（指定した場合はセッションのスナップショットも破棄する）
+    """
+    _cache.invalidate(user_id)
+    if state is not None and state.get(HABIT_SNAPSHOT_STATE_KEY) is not None:
+        state[HABIT_SNAPSHOT_STATE_KEY] = None
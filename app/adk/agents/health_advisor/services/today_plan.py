@@ -0,0 +1,153 @@
+"""今日の予定の提供
+
+今日（JST）に予定されているアクティブな運動・食事習慣（習慣のスナップショット）と、
+今日の運動ログ・食事ログを 1 つのセッションでまとめて取得し、習慣ごとの実施状況（done / partial / pending）を返す。
+曜日指定のない週単位の運動習慣は、今週の運動ログで判定する。
+"""
+
+from datetime import timedelta
+from typing import Any
+
+from ..analytics.adherence import ExerciseTarget, day_credit
+from ..analytics.schedule import WEEKDAY_NAMES, HabitSchedule, expand_occurrences
+from ..db.config import get_async_session
+from ..db.repositories import DietLogRepository, ExerciseLogRepository
+from ..logger import get_logger
+from ..utils import get_today_range_jst
+from .habit_snapshot import get_active_habits
+
+logger = get_logger(__name__)
+
+
+def _status(credit: float) -> str:
+    """部分達成度を実施状況に変換する。"""
+    if credit >= 1.0:
+        return "done"
+    return "partial" if credit > 0 else "pending"
+
+
+def _exercise_item(
+    habit: Any,
+    schedule: HabitSchedule,
+    rows: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """運動習慣の今日の実施状況を作る（rows は習慣の日別合計）。"""
+    target = ExerciseTarget.from_habit(habit)
+    targets = target.targets if target is not None else {}
+    best = max(rows, key=lambda row: day_credit(targets, row), default=None)
+    credit = day_credit(targets, best)
+    return {
+        "exercise_name": habit.exercise_name,
+        "routine_name": habit.routine_name,
+        "order_in_routine": habit.order_in_routine,
+        "targets": targets,
+        "actual": (
+            {k: best[k] for k in ("sessions", "sets", "reps", "duration", "distance")}
+            if best
+            else None
+        ),
+        "credit": round(credit, 2),
+        "status": _status(credit),
+        "weekly": schedule.weekly,
+    }
+
+
+def _meal_item(habit: Any, totals: dict[str, Any] | None) -> dict[str, Any]:
+    """食事習慣の今日の実施状況を作る（totals は同じ食事種別の合計）。"""
+    eaten = bool(totals and totals["meal_count"])
+    return {
+        "meal_type": habit.meal_type,
+        "target_calories": habit.target_calories,
+        "actual_calories": round(float(totals["calories"]), 1) if eaten else None,
+        "status": "done" if eaten else "pending",
+    }
+
+
+async def get_today_plan(user_id: str, state: Any | None = None) -> dict[str, Any]:
+    """今日の予定と実施状況を取得する。
+
+    Args:
+        user_id: ユーザー ID
+        state: tool_context.state（習慣のスナップショットの保持に使う）
+
+    Returns:
+        以下のキーを持つ辞書:
+        - date: 対象日（JST, "YYYY-MM-DD"）
+        - weekday: 曜日名（"monday" 等）
+        - items: 予定ごとの実施状況（時刻順、時刻未指定は末尾）
+        - done_count, pending_count: 完了・未完了（partial を含む）の件数
+    """
+    today, tomorrow = get_today_range_jst()
+    day = today.date()
+    week_start = today - timedelta(days=today.weekday())
+
+    habits = await get_active_habits(user_id, state)
+    schedules = {habit.id: HabitSchedule.from_habit(habit) for habit in habits}
+    scheduled_ids = {
+        occurrence.habit_id for occurrence in expand_occurrences(schedules.values(), day, day)
+    }
+    planned = [habit for habit in habits if habit.id in scheduled_ids]
+
+    async with get_async_session() as session:
+        exercises = [h for h in planned if h.habit_type == "exercise" and h.exercise_name]
+        exercise_totals = await ExerciseLogRepository(session).get_daily_totals_by_habit(
+            user_id,
+            {habit.id: habit.exercise_name for habit in exercises},
+            week_start if any(schedules[h.id].weekly for h in exercises) else today,
+            tomorrow,
+        )
+        meal_totals = (
+            await DietLogRepository(session).get_daily_totals_by_meal_type(
+                user_id, today, tomorrow
+            )
+            if any(habit.habit_type == "meal" for habit in planned)
+            else []
+        )
+
+    by_habit: dict[str, list[dict[str, Any]]] = {}
+    for row in exercise_totals:
+        by_habit.setdefault(row["habit_id"], []).append(row)
+    by_meal_type = {row["meal_type"]: row for row in meal_totals}
+
+    items = []
+    for habit in planned:
+        schedule = schedules[habit.id]
+        item = {
+            "habit_id": habit.id,
+            "habit_type": habit.habit_type,
+            "title": habit.title,
+            "time_of_day": habit.time_of_day,
+        }
+        if habit.habit_type == "meal":
+            item.update(_meal_item(habit, by_meal_type.get(habit.meal_type)))
+        else:
+            rows = [
+                row
+                for row in by_habit.get(habit.id, [])
+                if schedule.weekly or row["date"] == day
+            ]
+            item.update(_exercise_item(habit, schedule, rows))
+        items.append(item)
+    items.sort(
+        key=lambda item: (
+            item["time_of_day"] or "99:99",
+            item.get("routine_name") or "",
+            item.get("order_in_routine") or 0,
+        )
+    )
+
+    done_count = sum(1 for item in items if item["status"] == "done")
+    logger.info(
+        "今日の予定を取得しました",
+        user_id=user_id,
+        date=day.isoformat(),
+        item_count=len(items),
+        done_count=done_count,
+    )
+    return {
+        "date": day.isoformat(),
+        "weekday": WEEKDAY_NAMES[day.weekday()],
+        "items": items,
+        "done_count": done_count,
+        "pending_count": len(items) - done_count,
+    }
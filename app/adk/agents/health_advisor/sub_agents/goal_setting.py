@@ -1,16 +1,25 @@
 import uuid
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from google.adk.agents import Agent
 from google.adk.tools import AgentTool, ToolContext
 
+from ..analytics.goal_targets import extract_goal_targets
 from ..db.config import get_async_session
 from ..models import DEFAULT_MODEL, DEFAULT_PLANNER
+from ..router import GOAL_SETTING_STARTED_AT_STATE_KEY, mark_goal_setting_started
 from ..schemas import GoalSettingAgentOutput
 from ..db.repositories import GoalRepository, UserSessionRepository
 from ..logger import get_logger
+from ..services.calorie_context import invalidate_calorie_context
+from ..services.goal_service import (
+    get_current_goal,
+    invalidate_current_goal,
+    store_current_goal,
+)
 from ..tools.util_tools import finish_task
+from ..utils import JST, get_jst_now, to_utc
 
 logger = get_logger(__name__)
 
@@ -19,39 +28,117 @@ logger = get_logger(__name__)
 async def get_user_health_goal(tool_context: ToolContext) -> dict:
     """ユーザーの健康目標をDBから取得します。
 
-    DBから健康目標を読み取ります。
+    DBから健康目標を読み取ります（同じ会話内ではキャッシュを使います）。
     設定されていない場合は、未設定であることを返します。
     """
     user_id = tool_context.user_id
 
     try:
-        async with get_async_session() as session:
-            repo = GoalRepository(session)
-            goal = await repo.get_by_user_id(user_id)
+        goal = await get_current_goal(user_id, tool_context.state)
+        if goal is None:
+            return {
+                "status": "not_set",
+                "message": "健康目標がまだ設定されていません。目標を設定しましょう！",
+            }
+        return {"status": "success", "health_goal": goal}
 
-            if goal is None:
-                logger.info("健康目標が見つかりません", user_id=user_id)
-                return {
-                    "status": "not_set",
-                    "message": "健康目標がまだ設定されていません。目標を設定しましょう！",
-                }
+    except Exception as e:
+        logger.error("健康目標の取得に失敗", user_id=user_id, error=str(e))
+        return {
+            "status": "error",
+            "message": "健康目標の取得中にエラーが発生しました。",
+        }
+
+
+async def get_goal_history(
+    tool_context: ToolContext,
+    limit: int = 5,
+    cursor: Optional[str] = None,
+) -> dict:
+    """過去の健康目標の履歴を新しい順に取得します。
+
+    目標ごとに、紐づく習慣計画と、そのうちアクティブな習慣の数も返します。
+    「前の目標はどうだった？」「これまでの目標を振り返りたい」などに使います。
+
+    Args:
+        tool_context: ADKが提供するToolContext。
+        limit: 取得件数（1〜20、デフォルト: 5）
+        cursor: 続きを取得する場合に、前回の next_cursor を渡す
+
+    Returns:
+        - status: "success" | "not_found" | "error"
+        - goals: 目標のリスト（id, details, habits, 数値目標, created_at,
+          habit_count, active_habit_count, habit_plans）
+        - next_cursor: 続きがある場合のカーソル（最後のページは None）
+    """
+    user_id = tool_context.user_id
+    limit = max(1, min(limit, 20))
+
+    before = None
+    if cursor:
+        try:
+            created_at, goal_id = cursor.split("|", 1)
+            before = (datetime.fromisoformat(created_at), goal_id)
+        except ValueError:
+            return {"status": "error", "message": "cursor の形式が不正です。"}
+
+    try:
+        async with get_async_session() as session:
+            goals, next_before = await GoalRepository(session).get_history(
+                user_id, limit=limit, before=before
+            )
 
-            logger.info("健康目標を取得しました", user_id=user_id, goal_id=goal.id)
+        if not goals:
             return {
-                "status": "success",
-                "health_goal": {
+                "status": "not_found",
+                "message": "健康目標の履歴がありません。",
+                "goals": [],
+                "next_cursor": None,
+            }
+
+        logger.info("健康目標の履歴を取得しました", user_id=user_id, count=len(goals))
+        return {
+            "status": "success",
+            "goals": [
+                {
                     "id": goal.id,
                     "details": goal.details,
                     "habits": goal.habits,
-                    "created_at": goal.created_at.isoformat(),
-                },
-            }
+                    "daily_calorie_target": goal.daily_calorie_target,
+                    "target_weight": goal.target_weight,
+                    "deadline": (
+                        to_utc(goal.deadline).astimezone(JST).isoformat()
+                        if goal.deadline
+                        else None
+                    ),
+                    "weekly_exercise_sessions": goal.weekly_exercise_sessions,
+                    "created_at": to_utc(goal.created_at).astimezone(JST).isoformat(),
+                    "habit_count": len(goal.habit_details),
+                    "active_habit_count": active_habit_count,
+                    "habit_plans": [
+                        {
+                            "id": habit.id,
+                            "habit_type": habit.habit_type,
+                            "title": habit.title,
+                            "is_active": habit.is_active,
+                        }
+                        for habit in sorted(
+                            goal.habit_details, key=lambda h: h.start_date, reverse=True
+                        )
+                    ],
+                }
+                for goal, active_habit_count in goals
+            ],
+            "next_cursor": (
+                f"{next_before[0].isoformat()}|{next_before[1]}" if next_before else None
+            ),
+        }
 
     except Exception as e:
-        logger.error("健康目標の取得に失敗", user_id=user_id, error=str(e))
+        logger.error("健康目標の履歴の取得に失敗", user_id=user_id, error=str(e))
         return {
             "status": "error",
-            "message": "健康目標の取得中にエラーが発生しました。",
+            "message": "健康目標の履歴の取得中にエラーが発生しました。",
         }
 
 
@@ -59,20 +146,58 @@ async def set_user_health_goal(
     tool_context: ToolContext,
     details: str,
     habits: str,
+    daily_calorie_target: Optional[int] = None,
+    target_proteins: Optional[int] = None,
+    target_fats: Optional[int] = None,
+    target_carbohydrates: Optional[int] = None,
+    target_weight: Optional[float] = None,
+    deadline: Optional[str] = None,
+    weekly_exercise_sessions: Optional[int] = None,
 ) -> dict:
     """ユーザーの健康目標をDBに保存します。
 
     全てのhabits（運動・食事・睡眠）がユーザーと合意できた後に使用します。
     設定後、会話履歴はクリアされます。
 
+    数値目標（目標カロリー・PFC・目標体重・期限・週の運動回数）は details / habits の文章から
+    自動で取り出して保存します。引数で指定した値は、文章から取り出した値より優先されます。
+
     Args:
         tool_context: ADKが提供するToolContext。
         details: 目標の詳細（例：「3ヶ月で5kg減量して体脂肪率を20%以下にする」）
         habits: 運動・食事・睡眠の行動計画を箇条書きで記述（例：「- 運動：毎日3km走る\n- 食事：1日の摂取カロリーを1800kcal以下に抑える\n- 睡眠：毎日23時までに寝る」）
+        daily_calorie_target: 1日の目標摂取カロリー（kcal）
+        target_proteins: 1日の目標タンパク質（g）
+        target_fats: 1日の目標脂質（g）
+        target_carbohydrates: 1日の目標炭水化物（g）
+        target_weight: 目標体重（kg）
+        deadline: 期限（YYYY-MM-DD 形式）
+        weekly_exercise_sessions: 週あたりの運動回数
     """
     user_id = tool_context.user_id
 
     try:
+        now = get_jst_now()
+        deadline_dt = None
+        if deadline:
+            try:
+                deadline_dt = datetime.fromisoformat(deadline)
+                if deadline_dt.tzinfo is None:
+                    deadline_dt = deadline_dt.replace(tzinfo=JST)
+            except ValueError as e:
+                logger.warning("deadline の解析に失敗しました", deadline=deadline, error=str(e))
+
+        targets = extract_goal_targets(details, habits, now).merged(
+            daily_calorie_target=daily_calorie_target,
+            target_proteins=target_proteins,
+            target_fats=target_fats,
+            target_carbohydrates=target_carbohydrates,
+            target_weight=target_weight,
+            deadline=deadline_dt,
+            weekly_exercise_sessions=weekly_exercise_sessions,
+        )
+
+        invalidate_current_goal(user_id)
         async with get_async_session() as session:
             # goals は user_sessions への外部キー制約があるため、
             # 先に user_sessions にユーザーが存在することを保証する
@@ -89,23 +214,31 @@ async def set_user_health_goal(
                 user_id=user_id,
                 details=details,
                 habits=habits,
+                targets=targets.as_dict(),
             )
 
-            logger.info("健康目標を保存しました", user_id=user_id, goal_id=goal.id)
+            logger.info(
+                "健康目標を保存しました",
+                user_id=user_id,
+                goal_id=goal.id,
+                daily_calorie_target=goal.daily_calorie_target,
+                weekly_exercise_sessions=goal.weekly_exercise_sessions,
+            )
 
-            # 会話履歴をクリア
-            tool_context.state["goal_setting_history"] = []
+        health_goal = store_current_goal(user_id, goal, tool_context.state)
+        # 目標カロリーが変わるため破棄する
+        invalidate_calorie_context(user_id)
 
-            return {
-                "status": "success",
-                "message": "健康目標を設定しました",
-                "health_goal": {
-                    "id": goal.id,
-                    "details": goal.details,
-                    "habits": goal.habits,
-                    "created_at": goal.created_at.isoformat(),
-                },
-            }
+        # 会話履歴をクリア
+        tool_context.state["goal_setting_history"] = []
+        # 目標設定の会話が終わったため、事前ルーティングを再開する
+        tool_context.state[GOAL_SETTING_STARTED_AT_STATE_KEY] = None
+
+        return {
+            "status": "success",
+            "message": "健康目標を設定しました",
+            "health_goal": health_goal,
+        }
 
     except Exception as e:
         logger.error("健康目標の保存に失敗", user_id=user_id, error=str(e))
@@ -175,6 +308,7 @@ goalもhabitsもエージェントが一方的に決めてはいけない。必
 
 ## 使用するツール
 - `get_user_health_goal`: 正式に設定された健康目標を確認
+- `get_goal_history`: 過去の健康目標と、それぞれに紐づく習慣計画を新しい順に取得（「前の目標を振り返りたい」など。続きは next_cursor を cursor に渡す）
 - `set_user_health_goal`: 健康目標を正式に設定（全てのhabitsがユーザーと合意できてから使用）
 - `finish_task`: 目標設定完了時に呼び出し、対話権をルートエージェントに戻す（set_user_health_goal 成功後に必ず呼ぶ）
 
@@ -189,6 +323,9 @@ set_user_health_goalで保存する際は以下の形式で箇条書きにする
 - 食事：1日の摂取カロリーを1800kcal以下に抑える
 - 睡眠：毎日23時までに寝る
 
+数値（1日のkcal、タンパク質・脂質・炭水化物のg、目標体重kg、期限、週の運動回数）は文章に書けば自動で保存される。
+ユーザーと合意した数値が文章に書きにくい場合は、set_user_health_goal の daily_calorie_target などの引数で渡す。
+
 ## カロリー目標の目安
 習慣に含めるカロリー目標の参考値:
 
@@ -222,9 +359,11 @@ set_user_health_goalで保存する際は以下の形式で箇条書きにする
 """,
     tools=[
         get_user_health_goal,
+        get_goal_history,
         set_user_health_goal,
         finish_task,
     ],
     output_schema=GoalSettingAgentOutput,
     output_key="goal_setting_output",
+    before_agent_callback=mark_goal_setting_started,
 )
\ No newline at end of file
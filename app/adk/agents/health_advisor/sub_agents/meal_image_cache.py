@@ -0,0 +1,124 @@
+"""食事画像の分析キャッシュモジュール
+
+Single Responsibility: 同一画像の再送時に、過去の分析結果を再利用するためのキー計算を担う
+
+Worker は LINE の画像を GCS にアップロードし、gs:// URI を file_data として渡してくる。
+画像本体はダウンロードせず、GCS オブジェクトのメタデータ（MD5 / CRC32C）を
+コンテンツハッシュとして使用する。同じ画像であれば別メッセージとして再送されても
+同じハッシュになる。
+"""
+
+import asyncio
+from typing import Optional
+
+from google.adk.tools import ToolContext
+from google.cloud import storage
+
+from ..logger import get_logger
+
+logger = get_logger(__name__)
+
+# 直近の画像情報を保存する state のキー
+LAST_MEAL_IMAGE_STATE_KEY = "last_meal_image"
+
+# キャッシュのヒット率（プロセス単位）
+_metrics = {"hit": 0, "miss": 0}
+
+_storage_client: Optional[storage.Client] = None
+
+
+def _get_storage_client() -> storage.Client:
+    """Storage クライアントを取得する。"""
+    global _storage_client
+    if _storage_client is None:
+        _storage_client = storage.Client()
+    return _storage_client
+
+
+def _parse_gcs_uri(uri: str) -> Optional[tuple[str, str]]:
+    """gs://bucket/path を (bucket, path) に分解する。"""
+    if not uri.startswith("gs://"):
+        return None
+    bucket, _, name = uri[len("gs://") :].partition("/")
+    if not bucket or not name:
+        return None
+    return bucket, name
+
+
+def _fetch_gcs_hash(bucket_name: str, blob_name: str) -> Optional[str]:
+    """GCS オブジェクトのメタデータからコンテンツハッシュを取得する（同期）。"""
+    blob = _get_storage_client().bucket(bucket_name).get_blob(blob_name)
+    if blob is None:
+        return None
+    # コンポジットオブジェクトには MD5 が無いため CRC32C にフォールバック
+    if blob.md5_hash:
+        return f"md5:{blob.md5_hash}"
+    if blob.crc32c:
+        return f"crc32c:{blob.crc32c}"
+    return None
+
+
+def extract_image_uri(tool_context: ToolContext) -> Optional[str]:
+    """ユーザーの発話に含まれる画像の URI を取得する。"""
+    user_content = tool_context.user_content
+    if user_content is None or not user_content.parts:
+        return None
+    for part in user_content.parts:
+        file_data = part.file_data
+        if file_data and (file_data.mime_type or "").startswith("image/"):
+            return file_data.file_uri
+    return None
+
+
+async def resolve_image_hash(
+    tool_context: ToolContext,
+    image_url: Optional[str] = None,
+) -> tuple[Optional[str], Optional[str]]:
+    """画像の URI とコンテンツハッシュを取得する。
+
+    同じターン内で既に計算済みの場合は state の値を再利用する。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        image_url: 画像の URI（省略時はユーザーの発話から取得）
+
+    Returns:
+        (画像 URI, コンテンツハッシュ) のタプル。取得できない場合は None
+    """
+    uri = image_url or extract_image_uri(tool_context)
+    if not uri:
+        return None, None
+
+    cached = tool_context.state.get(LAST_MEAL_IMAGE_STATE_KEY)
+    if cached and cached.get("uri") == uri and cached.get("hash"):
+        return uri, cached["hash"]
+
+    parsed = _parse_gcs_uri(uri)
+    if parsed is None:
+        return uri, None
+
+    try:
+        image_hash = await asyncio.to_thread(_fetch_gcs_hash, *parsed)
+    except Exception as e:
+        logger.warning("画像ハッシュの取得に失敗", uri=uri, error=str(e))
+        return uri, None
+
+    if image_hash:
+        tool_context.state[LAST_MEAL_IMAGE_STATE_KEY] = {"uri": uri, "hash": image_hash}
+    return uri, image_hash
+
+
+def record_cache_result(hit: bool) -> dict:
+    """キャッシュのヒット / ミスを記録し、現在の集計を返す。"""
+    _metrics["hit" if hit else "miss"] += 1
+    return get_cache_metrics()
+
+
+def get_cache_metrics() -> dict:
+    """キャッシュのヒット / ミス件数とヒット率を返す。"""
+    total = _metrics["hit"] + _metrics["miss"]
+    return {
+        "hit": _metrics["hit"],
+        "miss": _metrics["miss"],
+        "hit_rate": round(_metrics["hit"] / total, 3) if total else None,
+    }
@@ -1,5 +1,5 @@
-from datetime import timedelta
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Any, Optional
 
 from google.adk.agents import Agent
 from google.adk.tools import ToolContext
@@ -7,14 +7,22 @@ from google.adk.tools import ToolContext
 from ..db.config import get_async_session
 from ..models import DEFAULT_MODEL, DEFAULT_PLANNER
 from ..schemas import MealRecordAgentOutput
+from ..analytics.pfc import MealTarget, compute_pfc_achievement
 from ..db.repositories import DietLogRepository
+from ..db.schemas import DietLogUpdate
 from ..logger import get_logger
+from ..services.calorie_context import invalidate_calorie_context
+from ..services.goal_service import get_current_goal
+from ..services.habit_snapshot import get_active_habits
 from ..utils import (
     get_current_datetime,
     get_jst_now,
     get_today_range_jst,
     parse_date_jst,
 )
+from ..tools.habit_tools import get_today_plan
+from ..tools.util_tools import get_activity_streaks
+from .meal_image_cache import record_cache_result, resolve_image_hash
 from .recipe_generator import generate_custom_recipe
 
 logger = get_logger(__name__)
@@ -83,6 +91,154 @@ async def get_diet_logs_from_db(
         }
 
 
+async def find_usual_meals(
+    tool_context: ToolContext,
+    keyword: Optional[str] = None,
+    meal_type: Optional[str] = None,
+    limit: int = 5,
+) -> dict:
+    """過去の記録から「いつもの食事」の候補を取得します。
+
+    「いつもの朝ごはん」「いつものやつ」など、以前と同じ食事を記録したい場合に使用する。
+    候補の栄養素はユーザーが修正した記録を優先した値なので、そのまま record_meal に渡せる。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        keyword: 料理名のキーワード（例: "納豆", "トースト"、オプション）
+        meal_type: 食事の種類でフィルタ（breakfast, lunch, dinner, snack、オプション）
+        limit: 取得件数の上限
+
+    Returns:
+        dict: 候補の食事リスト（よく食べている順）
+    """
+    user_id = tool_context.user_id
+
+    try:
+        async with get_async_session() as session:
+            repo = DietLogRepository(session)
+
+            candidates = await repo.search_usual_meals(
+                user_id, query=keyword, meal_type=meal_type, limit=limit
+            )
+
+            if not candidates:
+                return {
+                    "status": "not_found",
+                    "message": "該当する過去の食事記録がありません。",
+                    "candidates": [],
+                }
+
+            def _round(value: Optional[float]) -> Optional[float]:
+                return round(value, 1) if value is not None else None
+
+            logger.info(
+                "いつもの食事候補を取得しました",
+                user_id=user_id,
+                keyword=keyword,
+                meal_type=meal_type,
+                count=len(candidates),
+            )
+
+            return {
+                "status": "success",
+                "candidates": [
+                    {
+                        "dish_name": c["dish_name"],
+                        "meal_type": c["meal_type"],
+                        "times_logged": c["times_logged"],
+                        "corrected_count": c["corrected_count"],
+                        "calories": _round(c["calories"]),
+                        "protein_g": _round(c["proteins"]),
+                        "fat_g": _round(c["fats"]),
+                        "carbs_g": _round(c["carbohydrates"]),
+                        "sodium_mg": _round(c["sodium"]),
+                        "fiber_g": _round(c["fiber"]),
+                        "sugar_g": _round(c["sugar"]),
+                        "last_recorded_at": c["last_recorded_at"].isoformat(),
+                    }
+                    for c in candidates
+                ],
+            }
+    except Exception as e:
+        logger.error("いつもの食事候補の取得に失敗", user_id=user_id, error=str(e))
+        return {
+            "status": "error",
+            "message": "過去の食事記録の検索中にエラーが発生しました。",
+        }
+
+
+async def lookup_meal_image(
+    tool_context: ToolContext,
+    image_url: Optional[str] = None,
+) -> dict:
+    """送られてきた食事画像が過去に分析・記録済みかを確認します。
+
+    画像を分析する前に呼び出す。同じ画像が再送された場合は、前回の料理名と
+    栄養素の推定値を返すので、画像を分析し直さずにそのまま使える。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        image_url: 画像の URI（省略時はユーザーが送信した画像を使用）
+
+    Returns:
+        dict: キャッシュヒット時は前回の分析結果、ミス時は status="miss"
+    """
+    user_id = tool_context.user_id
+
+    try:
+        uri, image_hash = await resolve_image_hash(tool_context, image_url)
+        if image_hash is None:
+            return {
+                "status": "miss",
+                "message": "画像のキャッシュキーを取得できませんでした。画像を分析してください。",
+            }
+
+        async with get_async_session() as session:
+            repo = DietLogRepository(session)
+            log = await repo.get_latest_by_image_hash(user_id, image_hash)
+
+        metrics = record_cache_result(hit=log is not None)
+        logger.info(
+            "食事画像キャッシュを確認しました",
+            user_id=user_id,
+            hit=log is not None,
+            **metrics,
+        )
+
+        if log is None:
+            return {
+                "status": "miss",
+                "message": "初めての画像です。画像を分析してください。",
+                "image_url": uri,
+            }
+
+        return {
+            "status": "hit",
+            "message": "この画像は以前に記録済みです。前回の分析結果を使えます。",
+            "image_url": uri,
+            "cached": {
+                "log_id": log.id,
+                "dish_name": log.name,
+                "meal_type": log.meal_type,
+                "calories": log.calories,
+                "protein_g": log.proteins,
+                "fat_g": log.fats,
+                "carbs_g": log.carbohydrates,
+                "sodium_mg": log.sodium,
+                "fiber_g": log.fiber,
+                "sugar_g": log.sugar,
+                "is_user_corrected": log.is_user_corrected,
+                "recorded_at": log.recorded_at.isoformat(),
+            },
+        }
+    except Exception as e:
+        logger.error("食事画像キャッシュの確認に失敗", user_id=user_id, error=str(e))
+        return {
+            "status": "miss",
+            "message": "キャッシュの確認に失敗しました。画像を分析してください。",
+        }
+
+
 async def get_today_diet_summary(tool_context: ToolContext) -> dict:
     """本日の食事記録サマリーを取得します。
 
@@ -202,8 +358,10 @@ async def update_meal(
             if note is not None:
                 update_kwargs["note"] = note
 
-            # 更新実行
-            updated_log = await repo.update(log_id, **update_kwargs)
+            # 更新実行（値が変わるカラムのみ書き込む）
+            updated_log, _ = await repo.update_changed(
+                log_id, DietLogUpdate(**update_kwargs).changes()
+            )
 
             # 変更後の値
             after = {
@@ -244,25 +402,28 @@ async def update_meal(
             today, tomorrow = get_today_range_jst()
             today_logs = await repo.get_by_date_range(user_id, today, tomorrow)
 
-            today_calories = sum(log.calories for log in today_logs)
-            today_proteins = sum(log.proteins for log in today_logs)
-            today_fats = sum(log.fats for log in today_logs)
-            today_carbs = sum(log.carbohydrates for log in today_logs)
+        # コミット後に破棄する（コミット前に再取得されると古い値がキャッシュされる）
+        invalidate_calorie_context(user_id)
 
-            return {
-                "status": "success",
-                "message": f"食事記録を更新しました: {updated_log.name}",
-                "log_id": log_id,
-                "before": before,
-                "after": after,
-                "diff": diff,
-                "today_total": {
-                    "calories": today_calories,
-                    "protein_g": today_proteins,
-                    "fat_g": today_fats,
-                    "carbs_g": today_carbs,
-                },
-            }
+        today_calories = sum(log.calories for log in today_logs)
+        today_proteins = sum(log.proteins for log in today_logs)
+        today_fats = sum(log.fats for log in today_logs)
+        today_carbs = sum(log.carbohydrates for log in today_logs)
+
+        return {
+            "status": "success",
+            "message": f"食事記録を更新しました: {updated_log.name}",
+            "log_id": log_id,
+            "before": before,
+            "after": after,
+            "diff": diff,
+            "today_total": {
+                "calories": today_calories,
+                "protein_g": today_proteins,
+                "fat_g": today_fats,
+                "carbs_g": today_carbs,
+            },
+        }
 
     except Exception as e:
         logger.error(
@@ -377,11 +538,207 @@ async def get_meals_by_date(
         }
 
 
+async def get_pfc_achievement(
+    tool_context: ToolContext,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> dict:
+    """食事習慣の目標（カロリー・PFC）に対する達成状況を取得します。
+
+    アクティブな食事習慣ごとに、期間内の達成率・平均達成比・平均不足量・
+    連続達成日数を返す。「目標どおり食べられてる？」「最近のPFCどう？」などに使用する。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        start_date: 期間の開始日（"YYYY-MM-DD" 形式、省略時は終了日の6日前）
+        end_date: 期間の終了日（"YYYY-MM-DD" 形式、省略時は今日）
+
+    Returns:
+        dict: 食事習慣ごとの達成状況
+    """
+    user_id = tool_context.user_id
+
+    try:
+        try:
+            end = parse_date_jst(end_date) if end_date else get_today_range_jst()[0]
+            start = parse_date_jst(start_date) if start_date else end - timedelta(days=6)
+        except ValueError:
+            return {
+                "status": "invalid_date",
+                "message": "日付の形式が不正です。YYYY-MM-DD 形式で指定してください。",
+            }
+
+        if start > end:
+            return {
+                "status": "invalid_date",
+                "message": "開始日は終了日より前である必要があります。",
+            }
+
+        habits = [
+            habit
+            for habit in await get_active_habits(user_id, tool_context.state)
+            if habit.habit_type == "meal"
+        ]
+        targets = [t for t in map(MealTarget.from_habit, habits) if t is not None]
+        if not targets:
+            return {
+                "status": "not_found",
+                "message": "目標値が設定された食事習慣がありません。",
+                "habits": [],
+            }
+
+        async with get_async_session() as session:
+            daily_totals = await DietLogRepository(session).get_daily_totals_by_meal_type(
+                user_id, start, end + timedelta(days=1)
+            )
+
+        results = compute_pfc_achievement(
+            targets, daily_totals, start.date(), end.date()
+        )
+
+        logger.info(
+            "PFC 達成状況を計算しました",
+            user_id=user_id,
+            start_date=start.date().isoformat(),
+            end_date=end.date().isoformat(),
+            habit_count=len(results),
+        )
+
+        return {
+            "status": "success",
+            "start_date": start.date().isoformat(),
+            "end_date": end.date().isoformat(),
+            "habits": results,
+        }
+
+    except Exception as e:
+        logger.error("PFC 達成状況の計算に失敗", user_id=user_id, error=str(e))
+        return {
+            "status": "error",
+            "message": "PFC 達成状況の計算中にエラーが発生しました。",
+        }
+
+
 # =============================================================================
 # 食事記録 tool
 # =============================================================================
 
 
+def _validate_meal(total_calories: float, confidence: float, source_type: str) -> list[str]:
+    """カロリーと信頼度の妥当性をチェックし、警告メッセージを返す。"""
+    warnings = []
+
+    # カロリー妥当性チェック
+    if total_calories < CALORIE_MIN:
+        warnings.append(f"カロリーが極端に低いです（{total_calories}kcal）")
+    elif total_calories > CALORIE_MAX:
+        warnings.append(f"カロリーが極端に高いです（{total_calories}kcal）")
+
+    # 信頼度チェック
+    if confidence < CONFIDENCE_THRESHOLD:
+        if source_type == "image":
+            warnings.append("画像が不鮮明または食事以外の可能性があります")
+        else:
+            warnings.append("入力内容が曖昧なため、推定精度が低い可能性があります")
+
+    return warnings
+
+
+def _build_log_name(dish_name: str, ingredients: Optional[list]) -> str:
+    """食材名をカンマ区切りで結合して食事名を作成する。"""
+    if not ingredients:
+        return dish_name
+
+    try:
+        # ingredients が辞書のリストの場合
+        ingredient_names = []
+        for ing in ingredients:
+            if isinstance(ing, dict):
+                # "name" キーがあればそれを使用、なければ最初のキーの値を使用
+                if "name" in ing:
+                    ingredient_names.append(str(ing["name"]))
+                elif ing:
+                    # 辞書の最初の値を使用
+                    first_value = next(iter(ing.values()), None)
+                    if first_value:
+                        ingredient_names.append(str(first_value))
+            elif isinstance(ing, str):
+                # 文字列の場合はそのまま使用
+                ingredient_names.append(ing)
+        if ingredient_names:
+            return f"{dish_name} ({', '.join(ingredient_names)})"
+        return dish_name
+    except Exception as e:
+        logger.warning("食材名の解析に失敗", error=str(e), ingredients=ingredients)
+        return dish_name
+
+
+def _resolve_recorded_at(
+    meal_type: str,
+    meal_date: Optional[str],
+    meal_hour: Optional[int],
+) -> datetime:
+    """JST で記録時刻を決定する。
+
+    meal_date / meal_hour が指定されている場合はそちらを優先する。
+    """
+    now_jst = get_jst_now()
+    if not meal_date:
+        return now_jst
+
+    # meal_type から代表的な時刻を設定
+    meal_type_hours = {
+        "breakfast": 8,
+        "lunch": 12,
+        "dinner": 19,
+        "snack": 15,
+    }
+    # 時刻を設定（meal_hour があればその時刻、なければ meal_type から推定）
+    hour = meal_hour if meal_hour is not None else meal_type_hours.get(meal_type, 12)
+
+    try:
+        return parse_date_jst(meal_date).replace(hour=hour, minute=0)
+    except ValueError:
+        # パース失敗時は現在時刻を使用
+        logger.warning(
+            "meal_date / meal_hour が不正、現在時刻を使用",
+            meal_date=meal_date,
+            meal_hour=meal_hour,
+        )
+        return now_jst
+
+
+def _validate_meal_hour(meal_hour: Optional[int]) -> Optional[str]:
+    """meal_hour が 0-23 の整数でなければエラーメッセージを返す。"""
+    if meal_hour is None:
+        return None
+    if isinstance(meal_hour, bool) or not isinstance(meal_hour, int) or not 0 <= meal_hour <= 23:
+        return f"meal_hour は 0〜23 の整数で指定してください: {meal_hour}"
+    return None
+
+
+def _summarize_ingredients(ingredients: Optional[list]) -> Optional[list[str]]:
+    """食材内訳テキストを生成する。"""
+    if not ingredients:
+        return None
+
+    try:
+        summary = []
+        for ing in ingredients:
+            if isinstance(ing, dict):
+                ing_name = ing.get("name", "")
+                ing_amount = ing.get("amount", "")
+                ing_calories = ing.get("calories", "?")
+                if ing_name:
+                    summary.append(f"{ing_name} {ing_amount}: {ing_calories}kcal")
+            elif isinstance(ing, str):
+                summary.append(ing)
+        return summary or None
+    except Exception as e:
+        logger.warning("食材内訳の生成に失敗", error=str(e))
+        return None
+
+
 async def record_meal(
     tool_context: ToolContext,
     dish_name: str,
@@ -430,80 +787,20 @@ async def record_meal(
     """
     user_id = tool_context.user_id
 
-    # 警告メッセージを収集
-    warnings = []
+    error = _validate_meal_hour(meal_hour)
+    if error:
+        return {"status": "error", "message": error}
 
-    # カロリー妥当性チェック
-    if total_calories < CALORIE_MIN:
-        warnings.append(f"カロリーが極端に低いです（{total_calories}kcal）")
-    elif total_calories > CALORIE_MAX:
-        warnings.append(f"カロリーが極端に高いです（{total_calories}kcal）")
+    warnings = _validate_meal(total_calories, confidence, source_type)
+    name = _build_log_name(dish_name, ingredients)
+    recorded_at = _resolve_recorded_at(meal_type, meal_date, meal_hour)
 
-    # 信頼度チェック
-    if confidence < CONFIDENCE_THRESHOLD:
+    try:
+        # 画像の場合はコンテンツハッシュを保存し、再送時の分析キャッシュに使う
+        image_hash = None
         if source_type == "image":
-            warnings.append("画像が不鮮明または食事以外の可能性があります")
-        else:
-            warnings.append("入力内容が曖昧なため、推定精度が低い可能性があります")
-
-    # 食材名をカンマ区切りで結合して食事名を作成
-    if ingredients:
-        try:
-            # ingredients が辞書のリストの場合
-            ingredient_names = []
-            for ing in ingredients:
-                if isinstance(ing, dict):
-                    # "name" キーがあればそれを使用、なければ最初のキーの値を使用
-                    if "name" in ing:
-                        ingredient_names.append(str(ing["name"]))
-                    elif ing:
-                        # 辞書の最初の値を使用
-                        first_value = next(iter(ing.values()), None)
-                        if first_value:
-                            ingredient_names.append(str(first_value))
-                elif isinstance(ing, str):
-                    # 文字列の場合はそのまま使用
-                    ingredient_names.append(ing)
-            if ingredient_names:
-                name = f"{dish_name} ({', '.join(ingredient_names)})"
-            else:
-                name = dish_name
-        except Exception as e:
-            logger.warning("食材名の解析に失敗", error=str(e), ingredients=ingredients)
-            name = dish_name
-    else:
-        name = dish_name
-
-    # JST で記録時刻を設定
-    # meal_date / meal_hour が指定されている場合はそちらを優先
-    now_jst = get_jst_now()
-    if meal_date:
-        try:
-            recorded_at = parse_date_jst(meal_date)
-            # 時刻を設定（meal_hour があればその時刻、なければ meal_type から推定）
-            if meal_hour is not None:
-                recorded_at = recorded_at.replace(hour=meal_hour, minute=0)
-            else:
-                # meal_type から代表的な時刻を設定
-                meal_type_hours = {
-                    "breakfast": 8,
-                    "lunch": 12,
-                    "dinner": 19,
-                    "snack": 15,
-                }
-                recorded_at = recorded_at.replace(
-                    hour=meal_type_hours.get(meal_type, 12), minute=0
-                )
-        except ValueError:
-            # パース失敗時は現在時刻を使用
-            logger.warning(
-                "meal_date のパースに失敗、現在時刻を使用", meal_date=meal_date
-            )
-            recorded_at = now_jst
-    else:
-        recorded_at = now_jst
+            image_url, image_hash = await resolve_image_hash(tool_context, image_url)
 
-    try:
         async with get_async_session() as session:
             repo = DietLogRepository(session)
 
@@ -522,6 +819,7 @@ async def record_meal(
                 fiber=fiber_g,
                 sugar=sugar_g,
                 image_url=image_url,
+                image_hash=image_hash,
                 note=note,
             )
 
@@ -529,15 +827,14 @@ async def record_meal(
 
             # JST の「今日」を基準に合計を計算
             today, tomorrow = get_today_range_jst()
-            today_logs = await repo.get_by_date_range(user_id, today, tomorrow)
+            totals = await repo.get_totals(user_id, today, tomorrow)
+            today_calories = totals["calories"]
 
-            today_calories = sum(log.calories for log in today_logs)
-            today_proteins = sum(log.proteins for log in today_logs)
-            today_fats = sum(log.fats for log in today_logs)
-            today_carbs = sum(log.carbohydrates for log in today_logs)
+        # コミット後に破棄する
+        invalidate_calorie_context(user_id)
 
         # 目標カロリーと残りカロリーを計算
-        health_goal = tool_context.state.get("health_goal")
+        health_goal = await get_current_goal(user_id, tool_context.state)
         daily_calorie_target = None
         remaining_calories = None
 
@@ -545,27 +842,7 @@ async def record_meal(
             daily_calorie_target = health_goal["daily_calorie_target"]
             remaining_calories = daily_calorie_target - today_calories
 
-        # 食材内訳テキストを生成
-        ingredients_summary = None
-        if ingredients:
-            try:
-                ingredients_summary = []
-                for ing in ingredients:
-                    if isinstance(ing, dict):
-                        ing_name = ing.get("name", "")
-                        ing_amount = ing.get("amount", "")
-                        ing_calories = ing.get("calories", "?")
-                        if ing_name:
-                            ingredients_summary.append(
-                                f"{ing_name} {ing_amount}: {ing_calories}kcal"
-                            )
-                    elif isinstance(ing, str):
-                        ingredients_summary.append(ing)
-                if not ingredients_summary:
-                    ingredients_summary = None
-            except Exception as e:
-                logger.warning("食材内訳の生成に失敗", error=str(e))
-                ingredients_summary = None
+        ingredients_summary = _summarize_ingredients(ingredients)
 
         return {
             "status": "success",
@@ -588,11 +865,211 @@ async def record_meal(
             "today_total_calories": today_calories,
             "daily_calorie_target": daily_calorie_target,
             "remaining_calories": remaining_calories,
-            "today_meal_count": len(today_logs),
+            "today_meal_count": totals["meal_count"],
             "today_total_pfc": {
-                "protein_g": today_proteins,
-                "fat_g": today_fats,
-                "carbs_g": today_carbs,
+                "protein_g": totals["proteins"],
+                "fat_g": totals["fats"],
+                "carbs_g": totals["carbohydrates"],
+            },
+        }
+
+    except Exception as e:
+        logger.error("食事記録の保存に失敗", user_id=user_id, error=str(e))
+        return {
+            "status": "error",
+            "message": "食事記録の保存中にエラーが発生しました。",
+        }
+
+
+# record_meals の各料理で必須のキー
+MEAL_ITEM_REQUIRED_KEYS = (
+    "dish_name",
+    "total_calories",
+    "protein_g",
+    "fat_g",
+    "carbs_g",
+    "confidence",
+)
+
+# record_meals の各料理で数値であるべきキー（必須 / オプション）
+MEAL_ITEM_NUMBER_KEYS = ("total_calories", "protein_g", "fat_g", "carbs_g", "confidence")
+MEAL_ITEM_OPTIONAL_NUMBER_KEYS = ("sodium_mg", "fiber_g", "sugar_g")
+
+
+def _normalize_meal_item(item: Any) -> tuple[Optional[dict], Optional[str]]:
+    """record_meals の料理を検証し、数値項目を float に変換した辞書を返す。
+
+    Returns:
+        (正規化した料理, None) または (None, エラーメッセージ)
+    """
+    if not isinstance(item, dict):
+        return None, "料理の形式が不正です"
+
+    missing = [key for key in MEAL_ITEM_REQUIRED_KEYS if item.get(key) is None]
+    if missing:
+        return None, f"必須項目がありません: {', '.join(missing)}"
+    if not isinstance(item["dish_name"], str):
+        return None, "dish_name は文字列で指定してください"
+
+    normalized = dict(item)
+    for key in MEAL_ITEM_NUMBER_KEYS + MEAL_ITEM_OPTIONAL_NUMBER_KEYS:
+        value = item.get(key)
+        if value is None:
+            continue
+        try:
+            if isinstance(value, bool):
+                raise TypeError
+            normalized[key] = float(value)
+        except (TypeError, ValueError):
+            return None, f"{key} は数値で指定してください: {value}"
+    return normalized, None
+
+
+async def record_meals(
+    tool_context: ToolContext,
+    items: list[dict],
+    meal_type: str,
+    source_type: str,
+    image_url: Optional[str] = None,
+    meal_date: Optional[str] = None,
+    meal_hour: Optional[int] = None,
+) -> dict:
+    """1 回の食事に含まれる複数の料理をまとめて DB に記録します。
+
+    定食やお盆の写真など、ご飯・味噌汁・主菜のように料理が複数ある場合に使う。
+    全ての料理を検証してから 1 つのトランザクションで保存する。
+    ユーザーに「いつの食事か」を確認してから呼び出すこと。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        items: 料理のリスト。各要素は以下のキーを持つ辞書:
+            dish_name, total_calories, protein_g, fat_g, carbs_g, confidence（必須）
+            ingredients, sodium_mg, fiber_g, sugar_g, note（オプション）
+        meal_type: 食事の種類（breakfast, lunch, dinner, snack）
+        source_type: 分析元（"image" または "text"）
+        image_url: 食事画像URL（オプション）
+        meal_date: 食事の日付（"YYYY-MM-DD" 形式、オプション）。省略時は現在の日本時間の日付を使用。
+        meal_hour: 食事のおおよその時刻（0-23、オプション）。省略時は現在の日本時間の時刻を使用。
+
+    Returns:
+        dict: 料理ごとの記録結果、今回の食事の合計、記録日の合計情報
+    """
+    user_id = tool_context.user_id
+
+    if not items:
+        return {"status": "error", "message": "記録する料理がありません。"}
+
+    error = _validate_meal_hour(meal_hour)
+    if error:
+        return {"status": "error", "message": error}
+
+    # 1 件でも不正な料理があれば何も保存しない
+    normalized_items = []
+    for i, item in enumerate(items):
+        normalized, error = _normalize_meal_item(item)
+        if error:
+            return {"status": "error", "message": f"{i + 1}品目: {error}"}
+        normalized_items.append(normalized)
+    items = normalized_items
+
+    recorded_at = _resolve_recorded_at(meal_type, meal_date, meal_hour)
+
+    try:
+        image_hash = None
+        if source_type == "image":
+            image_url, image_hash = await resolve_image_hash(tool_context, image_url)
+    except Exception as e:
+        logger.error("食事記録の保存に失敗", user_id=user_id, error=str(e))
+        return {
+            "status": "error",
+            "message": "食事記録の保存中にエラーが発生しました。",
+        }
+
+    rows = []
+    recorded = []
+    for item in items:
+        rows.append(
+            {
+                "name": _build_log_name(item["dish_name"], item.get("ingredients")),
+                "meal_type": meal_type,
+                "calories": item["total_calories"],
+                "proteins": item["protein_g"],
+                "fats": item["fat_g"],
+                "carbohydrates": item["carbs_g"],
+                "estimation_source": source_type,
+                "recorded_at": recorded_at,
+                "sodium": item.get("sodium_mg"),
+                "fiber": item.get("fiber_g"),
+                "sugar": item.get("sugar_g"),
+                "image_url": image_url,
+                "image_hash": image_hash,
+                "note": item.get("note"),
+            }
+        )
+        warnings = _validate_meal(item["total_calories"], item["confidence"], source_type)
+        recorded.append(
+            {
+                "dish_name": item["dish_name"],
+                "calories": item["total_calories"],
+                "protein_g": item["protein_g"],
+                "fat_g": item["fat_g"],
+                "carbs_g": item["carbs_g"],
+                "sodium_mg": item.get("sodium_mg"),
+                "fiber_g": item.get("fiber_g"),
+                "sugar_g": item.get("sugar_g"),
+                "confidence": item["confidence"],
+                "ingredients": _summarize_ingredients(item.get("ingredients")),
+                "warnings": warnings if warnings else None,
+            }
+        )
+
+    # 記録日（JST）の範囲で合計を計算する
+    day_start = recorded_at.replace(hour=0, minute=0, second=0, microsecond=0)
+    day_end = day_start + timedelta(days=1)
+
+    try:
+        async with get_async_session() as session:
+            repo = DietLogRepository(session)
+            log_ids = await repo.create_logs(user_id, rows)
+            totals = await repo.get_totals(user_id, day_start, day_end)
+
+        logger.info("食事記録をまとめて保存しました", user_id=user_id, log_ids=log_ids)
+        invalidate_calorie_context(user_id)
+
+        for entry, log_id in zip(recorded, log_ids):
+            entry["log_id"] = log_id
+
+        meal_total = {
+            "calories": sum(row["calories"] for row in rows),
+            "protein_g": sum(row["proteins"] for row in rows),
+            "fat_g": sum(row["fats"] for row in rows),
+            "carbs_g": sum(row["carbohydrates"] for row in rows),
+        }
+
+        # 目標カロリーと残りカロリーを計算
+        health_goal = await get_current_goal(user_id, tool_context.state)
+        daily_calorie_target = None
+        remaining_calories = None
+
+        if health_goal and health_goal.get("daily_calorie_target"):
+            daily_calorie_target = health_goal["daily_calorie_target"]
+            remaining_calories = daily_calorie_target - totals["calories"]
+
+        return {
+            "status": "success",
+            "message": f"{meal_type}を記録しました: {'、'.join(r['dish_name'] for r in recorded)}",
+            "source_type": source_type,
+            "recorded": recorded,
+            "meal_total": meal_total,
+            "date": day_start.strftime("%Y-%m-%d"),
+            "day_total_calories": totals["calories"],
+            "daily_calorie_target": daily_calorie_target,
+            "remaining_calories": remaining_calories,
+            "day_meal_count": totals["meal_count"],
+            "day_total_pfc": {
+                "protein_g": totals["proteins"],
+                "fat_g": totals["fats"],
+                "carbs_g": totals["carbohydrates"],
             },
         }
 
@@ -639,13 +1116,19 @@ meal_record_agent = Agent(
 
 ### 記録ツール
 - `get_current_datetime`: 現在の日本時間を確認（食事タイプの判断に使用）
+- `lookup_meal_image`: 送られた画像が記録済みか確認（画像を分析する前に必ず呼ぶ）
 - `record_meal`: 食事を DB に記録。meal_date（日付）と meal_hour（時刻）で記録日時を指定可能
+- `record_meals`: 1 回の食事に料理が複数ある場合（定食・お盆の写真など）、全品を 1 回でまとめて記録
 - `update_meal`: 既存の食事記録を更新（「さっきのお米もっと多かった」など）
 
 ### 履歴・統計ツール
 - `get_diet_logs_from_db`: 過去の食事履歴を取得（「最近何食べた？」「履歴見せて」など）
 - `get_today_diet_summary`: 本日のカロリー・PFC 合計を取得（「今日の合計は？」など）
 - `get_meals_by_date`: 日付を指定して食事記録を取得（「昨日の食事教えて」「1/1の朝何食べた？」など）
+- `find_usual_meals`: 過去によく食べている食事の候補を取得（「いつもの朝ごはん」「いつものやつ」など）
+- `get_pfc_achievement`: 食事習慣の目標カロリー・PFC に対する達成率・不足量・連続達成日数を取得（「目標どおり食べれてる？」「今週のPFCどう？」など）
+- `get_activity_streaks`: 食事記録（meal）・運動記録（exercise）の連続記録日数を取得（「何日連続で記録してる？」など）。自分で日数を数えないこと
+- `get_today_plan`: 今日予定されている食事・運動習慣と、記録済みかどうか（done / partial / pending）を 1 回で取得（「今日のメニューは？」「今日あと何食べればいい？」など）
 
 ### レシピ提案ツール
 - `generate_custom_recipe`: ユーザー条件に基づくカスタムレシピ生成（「何食べればいい？」「レシピ教えて」など）
@@ -655,7 +1138,10 @@ meal_record_agent = Agent(
 ### ステップ1: 時刻確認と分析（必須）
 1. **最初に必ず `get_current_datetime` を呼んで現在の日本時間を確認する**
 2. 現在時刻から meal_type を判断する（食事タイプの判断セクション参照）
-3. 画像の場合: 画像を直接見て、料理名・食材・栄養素を分析
+3. 画像の場合: まず `lookup_meal_image` を呼ぶ
+   - status が "hit" なら、cached の料理名・栄養素をそのまま使う（画像を分析し直さない）
+   - ただし cached の recorded_at が同じ食事（同じ日・同じ meal_type）なら「それもう記録してあるよ〜！」と伝え、二重に記録しない
+   - status が "miss" なら、画像を直接見て、料理名・食材・栄養素を分析
 4. テキストの場合: テキストから料理名・食材・栄養素を推定
 
 ### ステップ2: いつの食事か確認（重要！）
@@ -716,8 +1202,14 @@ LINE では画像とメッセージを同時に送れないため、画像だけ
 - meal_date: 食事の日付（"YYYY-MM-DD" 形式）。「今の食事」なら省略OK。昨日や別の日の食事なら必ず指定。
 - meal_hour: 食事のおおよその時刻（0-23）。省略時は meal_type から推定。
 
+**料理が複数ある場合（ご飯・味噌汁・主菜など）:**
+`record_meal` を料理ごとに何回も呼ばず、`record_meals` で 1 回にまとめる。
+- items: 料理ごとに dish_name, total_calories, protein_g, fat_g, carbs_g, confidence（+ 推定できたオプション項目）
+- meal_type, source_type, meal_date, meal_hour は全品共通で指定
+- レスポンスの recorded（料理ごと）、meal_total（今回の食事の合計）、day_total_calories（その日の合計）を使って報告する
+
 ### ステップ4: フィードバック
-`record_meal` のレスポンスを使って、以下の情報を含めて報告:
+`record_meal`（または `record_meals`）のレスポンスを使って、以下の情報を含めて報告:
 
 **必ず含める情報:**
 1. 料理名とカロリー
@@ -750,6 +1242,14 @@ LINE では画像とメッセージを同時に送れないため、画像だけ
 - 炭水化物多め: 「エネルギーチャージ完了って感じ！動く日にはぴったり！」
 - 食べすぎた時: 「気にしなくておっけ〜！明日からまたバチっと整えよ！」
 
+## 「いつもの食事」の記録フロー
+ユーザーが「いつもの朝ごはん」「いつものやつ食べた」など、以前と同じ食事を記録したい場合:
+1. `find_usual_meals` を呼ぶ（朝ごはんなら meal_type="breakfast"、料理名が分かれば keyword も指定）
+2. 候補が1つに絞れる場合は、候補の栄養素をそのまま使って `record_meal` を呼ぶ（栄養素を推定し直さない）
+   - source_type は "text"、confidence は 0.9 とする
+3. 候補が複数ある場合は「①〇〇 ②〇〇 のどっち？」とユーザーに選んでもらう
+4. 候補がない場合は通常の記録フローで推定する
+
 ## 信頼度（confidence）の設定基準
 - 0.9〜1.0: 明確に判別できる（鮮明な画像、具体的な料理名）
 - 0.7〜0.9: 概ね判別できる（やや不鮮明、一般的な料理名）
@@ -1019,11 +1519,17 @@ P: 45g / F: 35g / C: 150g
 """,
     tools=[
         get_current_datetime,
+        lookup_meal_image,
         record_meal,
+        record_meals,
         update_meal,
         get_diet_logs_from_db,
         get_today_diet_summary,
         get_meals_by_date,
+        find_usual_meals,
+        get_pfc_achievement,
+        get_activity_streaks,
+        get_today_plan,
         generate_custom_recipe,
     ],
     output_schema=MealRecordAgentOutput,
@@ -7,8 +7,15 @@ from typing import Optional
 
 from google.adk.tools import ToolContext
 
+from ..logger import get_logger
+from ..services.calorie_context import get_calorie_context
 from ..utils import get_jst_now
 
+logger = get_logger(__name__)
+
+
+# 残りカロリーから算出した目標カロリーの下限（目標を超過している場合も軽食程度を提案する）
+MIN_RECIPE_CALORIES = 200
 
 # PFC比率の定数定義
 PFC_RATIOS = {
@@ -97,27 +104,33 @@ def _calculate_pfc(priority: Optional[str], target_calories: int) -> dict:
     }
 
 
-def _get_user_calorie_context(tool_context: ToolContext) -> dict:
-    """ユーザーのカロリーコンテキストを取得"""
-    health_goal = tool_context.state.get("health_goal")
-    daily_calorie_target = None
-    goal_type = None
+async def _get_user_calorie_context(tool_context: ToolContext) -> dict:
+    """ユーザーのカロリーコンテキストを取得
 
-    if health_goal:
-        daily_calorie_target = health_goal.get("daily_calorie_target")
-        goal_type = health_goal.get("goal_type")
-
-    meal_records = tool_context.state.get("meal_records", [])
-    today = get_jst_now().strftime("%Y-%m-%d")
-    today_calories = sum(
-        r["estimated_calories"]
-        for r in meal_records
-        if r["recorded_at"].startswith(today)
+    今日の摂取カロリーと目標カロリーは DB から取得する（キャッシュ付き）。
+    目標カロリーは健康目標の daily_calorie_target、なければ食事習慣の目標の合計を使う。
+    """
+    health_goal = tool_context.state.get("health_goal") or {}
+    goal_type = health_goal.get("goal_type")
+
+    try:
+        context = await get_calorie_context(tool_context.user_id)
+    except Exception as e:
+        logger.error(
+            "カロリーコンテキストの取得に失敗",
+            user_id=tool_context.user_id,
+            error=str(e),
+        )
+        context = {"today_calories": 0.0, "daily_calorie_target": None}
+
+    today_calories = context["today_calories"]
+    daily_calorie_target = (
+        context["daily_calorie_target"] or health_goal.get("daily_calorie_target")
     )
 
     remaining_calories = None
     if daily_calorie_target:
-        remaining_calories = daily_calorie_target - today_calories
+        remaining_calories = max(daily_calorie_target - today_calories, 0.0)
 
     return {
         "remaining_calories": remaining_calories,
@@ -137,7 +150,7 @@ def _get_meal_type_from_hour() -> str:
     return "dinner"
 
 
-def generate_custom_recipe(
+async def generate_custom_recipe(
     tool_context: ToolContext,
     target_calories: Optional[int] = None,
     priority: Optional[str] = None,
@@ -160,12 +173,14 @@ def generate_custom_recipe(
     Returns:
         条件情報をまとめた辞書（エージェントがこれを元にレシピ生成）
     """
-    user_context = _get_user_calorie_context(tool_context)
+    user_context = await _get_user_calorie_context(tool_context)
 
     # 目標カロリーの決定
     if target_calories is None:
         if user_context["remaining_calories"] is not None:
-            target_calories = int(user_context["remaining_calories"] * 0.75)
+            target_calories = max(
+                int(user_context["remaining_calories"] * 0.75), MIN_RECIPE_CALORIES
+            )
         else:
             target_calories = 500
 
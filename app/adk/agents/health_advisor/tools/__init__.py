@@ -12,10 +12,13 @@ from .habit_tools import (
     activate_habit,
     create_exercise_habit,
     create_meal_habit,
+    create_routine,
     deactivate_habit,
     get_habits,
     get_habits_by_goal,
     get_habits_by_routine,
+    get_today_plan,
+    reorder_routine,
     update_habit,
 )
 from .util_tools import finish_task
@@ -26,9 +29,12 @@ __all__ = [
     "get_exercise_logs_by_name",
     "create_exercise_habit",
     "create_meal_habit",
+    "create_routine",
+    "reorder_routine",
     "get_habits",
     "get_habits_by_goal",
     "get_habits_by_routine",
+    "get_today_plan",
     "update_habit",
     "deactivate_habit",
     "activate_habit",
@@ -3,17 +3,206 @@
 ExerciseLogs テーブルへの書き込みと読み込みを行うツールを提供する。
 """
 
+import json
 from datetime import datetime
 from typing import Any
 
 from google.adk.tools import ToolContext
 
+from ..analytics.balance import compute_muscle_balance
+from ..analytics.progression import (
+    DEFAULT_MAX_POINTS,
+    E1RM_FORMULAS,
+    compute_progression,
+)
 from ..db.config import get_async_session
-from ..db.repositories import ExerciseLogRepository
+from ..db.repositories import (
+    ExerciseLogRepository,
+    PersonalRecordRepository,
+    WeeklyMuscleVolumeRepository,
+)
+from ..db.repositories.weekly_muscle_volume import iso_week_key, previous_iso_week_key
 from ..logger import get_logger
+from ..services.habit_adherence import get_habit_adherence
+from ..utils import JST, get_jst_now, parse_date_jst
 
 logger = get_logger(__name__)
 
+# 自己ベストの指標ごとの説明と単位
+PERSONAL_RECORD_LABELS = {
+    "max_weight": ("最大重量", "kg"),
+    "max_reps": ("重量ごとの最大レップ数", "回"),
+    "best_e1rm": ("推定1RM", "kg"),
+    "longest_distance": ("最長距離", "km"),
+    "fastest_pace": ("最速ペース", "秒/km"),
+}
+
+# get_personal_records で返す種目数と、種目ごとの max_reps（重量ごと）の件数の上限
+PERSONAL_RECORDS_MAX_EXERCISES = 20
+PERSONAL_RECORDS_MAX_REPS_PER_EXERCISE = 5
+
+# 振り返り系ツールのレスポンスサイズ上限（UTF-8 で JSON にしたときのバイト数）
+RETROSPECTIVE_MAX_BYTES = 8000
+
+# get_exercise_retrospective の detail_level
+RETROSPECTIVE_DETAIL_LEVELS = ("summary", "top", "full")
+
+# detail_level="full" / 深掘りツールで 1 回に取得する記録数の上限
+RETROSPECTIVE_PAGE_SIZE = 50
+
+
+def _serialize_log(log: Any, include_sets: bool = True) -> dict[str, Any]:
+    """ExerciseLog を辞書に変換する。"""
+    data = {
+        "id": log.id,
+        "exercise_name": log.exercise_name,
+        "category": log.category,
+        "muscle_group": log.muscle_group,
+        "total_sets": log.total_sets,
+        "total_reps": log.total_reps,
+        "total_duration": log.total_duration,
+        "total_distance": log.total_distance,
+        "total_volume": log.total_volume,
+        "note": log.note,
+        "recorded_at": log.recorded_at.isoformat(),
+    }
+    if include_sets:
+        data["sets"] = log.sets
+    return data
+
+
+def _format_record(
+    metric: str,
+    weight: float,
+    value: float,
+    **extra: Any,
+) -> dict[str, Any]:
+    """自己ベストを辞書に変換する。"""
+    label, unit = PERSONAL_RECORD_LABELS.get(metric, (metric, ""))
+    data = {"metric": metric, "label": label, "value": value, "unit": unit}
+    if metric == "max_reps":
+        data["weight"] = weight
+    data.update(extra)
+    return data
+
+
+def _serialize_weekly_volume(row: Any) -> dict[str, Any]:
+    """週ごと・筋肉群ごとの集計行を辞書に変換する。"""
+    return {
+        "muscle_group": row.muscle_group,
+        "sessions": row.sessions,
+        "sets": row.sets,
+        "reps": row.reps,
+        "volume": row.volume,
+        "duration": row.duration,
+    }
+
+
+def _json_size(value: Any) -> int:
+    """JSON にしたときのバイト数を返す。"""
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def _fit_to_budget(
+    payload: dict[str, Any],
+    keys: list[str],
+    max_bytes: int,
+    note: str = "",
+) -> dict[str, int]:
+    """payload 全体が max_bytes に収まるよう、keys のリスト・辞書を順に末尾から詰める。
+
+    keys の先頭（優先度の低いもの）から詰め、収まった時点で止める。辞書は挿入順
+    （セッション数の多い順）に先頭から残す。truncated / omitted と、省略した場合に
+    message へ付け足す note も含めたサイズで判定する。
+
+    Args:
+        payload: レスポンスの辞書（keys の値・truncated・omitted・message を書き換える）
+        keys: 切り詰めるリスト・辞書のキー（詰める順）
+        max_bytes: 上限バイト数
+        note: 省略した場合に message に付け足す文
+
+    Returns:
+        キー → 省略した要素数（省略したキーのみ）
+    """
+    keys = [key for key in keys if key in payload]
+    originals = {key: payload[key] for key in keys}
+    # 省略した場合の付加情報（件数は最大値）を含めたサイズを基準にする
+    markers = {
+        "truncated": True,
+        "omitted": {key: len(value) for key, value in originals.items()},
+        "message": payload.get("message", "") + note,
+    }
+
+    omitted: dict[str, int] = {}
+    if _json_size(payload) > max_bytes:
+        for key in keys:
+            items = originals[key]
+            entries = list(items.items()) if isinstance(items, dict) else list(items)
+            used = _json_size({**payload, **markers, key: type(items)()})
+            kept = []
+            for entry in entries:
+                size = _json_size(dict([entry]) if isinstance(items, dict) else entry) + 1
+                if used + size > max_bytes:
+                    break
+                kept.append(entry)
+                used += size
+            payload[key] = dict(kept) if isinstance(items, dict) else kept
+            if len(kept) < len(entries):
+                omitted[key] = len(entries) - len(kept)
+            if _json_size({**payload, **markers}) <= max_bytes:
+                break
+
+    payload["truncated"] = bool(omitted)
+    if omitted:
+        payload["omitted"] = omitted
+        payload["message"] = payload.get("message", "") + note
+    return omitted
+
+
+def _normalize_datetime(value: str, end_of_day: bool) -> tuple[str, datetime]:
+    """日付（または日時）文字列を正規化する。
+
+    日付のみの場合は 00:00:00（end_of_day の場合は 23:59:59）に正規化する。
+
+    Raises:
+        ValueError: 日付の形式が不正な場合
+    """
+    normalized = value.strip()
+    if "T" not in normalized:
+        normalized = f"{normalized}T23:59:59" if end_of_day else f"{normalized}T00:00:00"
+    try:
+        return normalized, datetime.fromisoformat(normalized)
+    except ValueError:
+        raise ValueError(
+            "日付の形式が正しくありません。ISO 8601 形式（例: 2026-01-01）で指定してください。"
+        )
+
+
+def _to_jst_midnight(value: datetime) -> datetime:
+    """日時を JST の日付の 0:00 に変換する（タイムゾーンなしは JST とみなす）。"""
+    value = value.astimezone(JST) if value.tzinfo else value.replace(tzinfo=JST)
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _normalize_period(start_date: str, end_date: str) -> tuple[str, str, datetime, datetime]:
+    """振り返り期間を正規化する。
+
+    日付のみの場合は 00:00:00 / 23:59:59 に正規化する。
+
+    Returns:
+        (正規化した開始日時, 正規化した終了日時, 開始 datetime, 終了 datetime)
+
+    Raises:
+        ValueError: 日付の形式が不正、または開始日時が終了日時より後の場合
+    """
+    start_normalized, start_dt = _normalize_datetime(start_date, end_of_day=False)
+    end_normalized, end_dt = _normalize_datetime(end_date, end_of_day=True)
+
+    if start_dt > end_dt:
+        raise ValueError("開始日時は終了日時より前である必要があります。")
+
+    return start_normalized, end_normalized, start_dt, end_dt
+
 
 async def create_exercise_log(
     tool_context: ToolContext,
@@ -54,6 +243,8 @@ async def create_exercise_log(
         - log_id: 作成された運動記録の ID（成功時のみ）
         - exercise_name: 運動名（成功時のみ）
         - recorded_at: 記録日時（成功時のみ）
+        - new_personal_records: 今回更新した自己ベストのリスト（成功時のみ）。
+          previous_value が None の場合はその指標の初記録
 
     Examples:
         # 筋トレの記録
@@ -97,8 +288,8 @@ async def create_exercise_log(
         async with get_async_session() as session:
             repo = ExerciseLogRepository(session)
 
-            # 運動記録を作成
-            log = await repo.create_log(
+            # 運動記録を作成（自己ベストも同じトランザクションで更新される）
+            log, new_records = await repo.create_log(
                 user_id=user_id,
                 exercise_name=exercise_name,
                 sets=sets,
@@ -128,6 +319,9 @@ async def create_exercise_log(
                 "exercise_name": log.exercise_name,
                 "total_sets": log.total_sets,
                 "recorded_at": log.recorded_at.isoformat(),
+                "new_personal_records": [
+                    _format_record(**record) for record in new_records
+                ],
             }
 
     except Exception as e:
@@ -143,6 +337,282 @@ async def create_exercise_log(
         }
 
 
+async def get_personal_records(
+    tool_context: ToolContext,
+    exercise_name: str | None = None,
+) -> dict:
+    """ユーザーの自己ベストを取得する。
+
+    自己ベストは運動記録の作成時に更新されるため、運動記録を遡って集計する必要はない。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        exercise_name: 運動名（省略時は全運動種目）
+
+    Returns:
+        取得結果を含む辞書:
+        - status: "success", "not_found", または "error"
+        - message: 結果メッセージ
+        - records: 運動名ごとの自己ベストのリスト（取得時のみ、最近更新した種目順に
+          最大 PERSONAL_RECORDS_MAX_EXERCISES 種目）。
+          各自己ベストは metric, label, value, unit, achieved_at を持つ
+          （max_reps は対象重量 weight も持ち、重い順に最大
+          PERSONAL_RECORDS_MAX_REPS_PER_EXERCISE 件。省略した件数は omitted_max_reps）
+        - omitted_exercises: 上限で省略した種目数（省略した場合のみ）
+
+    Examples:
+        # ベンチプレスの自己ベスト
+        >>> await get_personal_records(tool_context=ctx, exercise_name="ベンチプレス")
+    """
+    user_id = tool_context.user_id
+
+    try:
+        async with get_async_session() as session:
+            repo = PersonalRecordRepository(session)
+            records = await repo.get_by_user_id(user_id, exercise_name=exercise_name)
+
+        if not records:
+            message = "自己ベストの記録がありません。"
+            if exercise_name:
+                message = f"「{exercise_name}」の自己ベストの記録がありません。"
+            return {"status": "not_found", "message": message, "records": []}
+
+        by_exercise: dict[str, list[Any]] = {}
+        for record in records:
+            by_exercise.setdefault(record.exercise_name, []).append(record)
+
+        # 最近更新した種目から返す
+        names = sorted(
+            by_exercise,
+            key=lambda name: max(r.achieved_at for r in by_exercise[name]),
+            reverse=True,
+        )
+        grouped = []
+        for name in names[:PERSONAL_RECORDS_MAX_EXERCISES]:
+            items = by_exercise[name]
+            # max_reps は重量ごとに行があるため、重い順に上限件数まで返す
+            max_reps = sorted(
+                (r for r in items if r.metric == "max_reps"),
+                key=lambda r: r.weight,
+                reverse=True,
+            )
+            kept = [r for r in items if r.metric != "max_reps"]
+            kept += max_reps[:PERSONAL_RECORDS_MAX_REPS_PER_EXERCISE]
+            entry: dict[str, Any] = {
+                "exercise_name": name,
+                "records": [
+                    _format_record(
+                        r.metric, r.weight, r.value, achieved_at=r.achieved_at.isoformat()
+                    )
+                    for r in kept
+                ],
+            }
+            if len(max_reps) > PERSONAL_RECORDS_MAX_REPS_PER_EXERCISE:
+                entry["omitted_max_reps"] = len(max_reps) - PERSONAL_RECORDS_MAX_REPS_PER_EXERCISE
+            grouped.append(entry)
+
+        logger.info(
+            "自己ベストを取得しました",
+            user_id=user_id,
+            exercise_name=exercise_name,
+            count=len(records),
+        )
+
+        result = {
+            "status": "success",
+            "message": f"{len(by_exercise)} 種目の自己ベストを取得しました。",
+            "records": grouped,
+        }
+        if len(names) > PERSONAL_RECORDS_MAX_EXERCISES:
+            result["omitted_exercises"] = len(names) - PERSONAL_RECORDS_MAX_EXERCISES
+            result["message"] += (
+                f" 最近更新した {PERSONAL_RECORDS_MAX_EXERCISES} 種目を表示しています。"
+            )
+        return result
+
+    except Exception as e:
+        logger.error(
+            "自己ベストの取得に失敗しました",
+            user_id=user_id,
+            exercise_name=exercise_name,
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "message": f"自己ベストの取得中にエラーが発生しました: {str(e)}",
+        }
+
+
+async def get_muscle_group_balance(
+    tool_context: ToolContext,
+    week_of: str | None = None,
+) -> dict:
+    """週ごとの筋肉群のトレーニング量の配分と、前週からの増減を取得する。
+
+    運動記録の作成時に更新される週ごと・筋肉群ごとの集計を読むため、
+    記録の件数に関わらず 2 週分の集計行だけを取得する。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        week_of: 対象週に含まれる日付（YYYY-MM-DD 形式、省略時は今週）
+
+    Returns:
+        取得結果を含む辞書:
+        - status: "success", "not_found", または "error"
+        - message: 結果メッセージ
+        - week: 対象週（"2026-W42" 形式）
+        - previous_week: 比較した前週
+        - total: 対象週の合計（sessions, sets, reps, volume, duration）と前週からの増減
+        - by_muscle_group: 筋肉群ごとの指標、セット数の割合 set_share（%）、
+          前週からの増減 sets_delta / volume_delta
+        - untrained: 対象週にトレーニングしていない主な筋肉群
+
+    Examples:
+        # 今週の筋肉群バランス（「脚やってなさすぎ？」など）
+        >>> await get_muscle_group_balance(tool_context=ctx)
+    """
+    user_id = tool_context.user_id
+
+    try:
+        try:
+            target = parse_date_jst(week_of) if week_of else get_jst_now()
+        except ValueError:
+            return {
+                "status": "error",
+                "message": "日付の形式が正しくありません。YYYY-MM-DD 形式で指定してください。",
+            }
+        week = iso_week_key(target)
+        previous_week = previous_iso_week_key(target)
+
+        async with get_async_session() as session:
+            repo = WeeklyMuscleVolumeRepository(session)
+            rows = await repo.get_by_weeks(user_id, [week, previous_week])
+
+        current = [_serialize_weekly_volume(r) for r in rows if r.iso_week == week]
+        previous = [_serialize_weekly_volume(r) for r in rows if r.iso_week == previous_week]
+
+        if not current and not previous:
+            return {
+                "status": "not_found",
+                "message": f"{previous_week} から {week} の運動記録がありません。",
+                "week": week,
+                "previous_week": previous_week,
+            }
+
+        logger.info(
+            "筋肉群のバランスを取得しました",
+            user_id=user_id,
+            week=week,
+            muscle_groups=len(current),
+        )
+
+        return {
+            "status": "success",
+            "message": f"{week} の筋肉群のバランスを取得しました（前週 {previous_week} と比較）。",
+            "week": week,
+            "previous_week": previous_week,
+            **compute_muscle_balance(current, previous),
+        }
+
+    except Exception as e:
+        logger.error(
+            "筋肉群のバランスの取得に失敗しました",
+            user_id=user_id,
+            week_of=week_of,
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "message": f"筋肉群のバランスの取得中にエラーが発生しました: {str(e)}",
+        }
+
+
+async def find_exercise_sessions_by_set(
+    tool_context: ToolContext,
+    min_weight: float | None = None,
+    min_reps: int | None = None,
+    exercise_name: str | None = None,
+    limit: int = 10,
+) -> dict:
+    """条件を満たすセットを含む運動記録を検索する。
+
+    「100kg挙げた日いつ？」「10回以上できたセッションは？」などに使う。
+    重量とレップ数の両方を指定した場合は、同じセットで両方を満たす記録を返す。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        min_weight: 重量の下限（kg）
+        min_reps: レップ数の下限
+        exercise_name: 運動名（省略時は全運動種目）
+        limit: 取得件数の上限（デフォルト: 10）
+
+    Returns:
+        取得結果を含む辞書:
+        - status: "success", "not_found", または "error"
+        - message: 結果メッセージ
+        - logs: 運動記録のリスト（新しい順）
+
+    Examples:
+        # ベンチプレスで 100kg 以上のセットがある記録
+        >>> await find_exercise_sessions_by_set(
+        ...     tool_context=ctx,
+        ...     min_weight=100,
+        ...     exercise_name="ベンチプレス"
+        ... )
+    """
+    user_id = tool_context.user_id
+
+    if min_weight is None and min_reps is None:
+        return {
+            "status": "error",
+            "message": "min_weight または min_reps を指定してください。",
+        }
+
+    try:
+        async with get_async_session() as session:
+            repo = ExerciseLogRepository(session)
+            logs = await repo.get_by_set_threshold(
+                user_id,
+                min_weight=min_weight,
+                min_reps=min_reps,
+                exercise_name=exercise_name,
+                limit=limit,
+            )
+
+        if not logs:
+            return {
+                "status": "not_found",
+                "message": "条件を満たすセットを含む運動記録がありません。",
+                "logs": [],
+            }
+
+        logger.info(
+            "セット条件で運動記録を検索しました",
+            user_id=user_id,
+            min_weight=min_weight,
+            min_reps=min_reps,
+            exercise_name=exercise_name,
+            count=len(logs),
+        )
+
+        return {
+            "status": "success",
+            "message": f"条件を満たす運動記録を {len(logs)} 件取得しました。",
+            "logs": [_serialize_log(log) for log in logs],
+        }
+
+    except Exception as e:
+        logger.error(
+            "セット条件での運動記録の検索に失敗しました",
+            user_id=user_id,
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "message": f"運動記録の検索中にエラーが発生しました: {str(e)}",
+        }
+
+
 async def get_exercise_logs(
     tool_context: ToolContext,
     limit: int = 10,
@@ -243,7 +713,7 @@ async def get_exercise_logs_by_name(
 
     Args:
         tool_context: ADK が提供する ToolContext
-        exercise_name: 運動名（例: ベンチプレス、スクワット）
+        exercise_name: 運動名（例: ベンチプレス、スクワット）。表記ゆれ（ベンチ、bench press 等）も同じ種目として検索する
         limit: 取得件数の上限（デフォルト: 10）
 
     Returns:
@@ -511,31 +981,47 @@ async def get_exercise_retrospective(
     tool_context: ToolContext,
     start_date: str,
     end_date: str,
+    detail_level: str = "summary",
+    top_n: int = 3,
 ) -> dict:
     """指定期間の運動記録を集計し、レトロスペクティブ（振り返り）用のサマリーを返す。
 
     ユーザーが指定した期間の運動実績を集計し、総セッション数・稼働日数・種目別・
     カテゴリ別の内訳、総ボリューム・総時間・総距離などを返す。振り返りや振る舞いの分析に利用する。
+    集計は DB 側で行う。レスポンスは期間の長さに関わらず RETROSPECTIVE_MAX_BYTES 以内に収める。
 
     Args:
         tool_context: ADK が提供する ToolContext
         start_date: 期間の開始日（ISO 8601 形式、例: "2026-01-01" または "2026-01-01T00:00:00"）
         end_date: 期間の終了日（ISO 8601 形式、例: "2026-01-31" または "2026-01-31T23:59:59"）
+        detail_level: 詳細度（デフォルト: "summary"）
+            - "summary": 集計のみ
+            - "top": 集計 + 種目ごとの上位セッション（top_n 件、セット詳細なし）
+            - "full": 集計 + 期間内の記録（セット詳細あり、新しい順）
+        top_n: detail_level="top" のときの種目ごとの件数（デフォルト: 3）
 
     Returns:
         集計結果を含む辞書:
         - status: "success", "not_found", または "error"
         - message: 結果メッセージ
         - start_date, end_date: 指定期間
+        - detail_level: 詳細度
         - total_sessions: 総運動セッション数（記録数）
-        - active_days: 運動した日数（重複なし）
+        - active_days: 運動した日数（JST、重複なし）
         - total_volume: 総ボリューム（筋トレ、kg）
         - total_duration_seconds: 総運動時間（秒）
         - total_distance_km: 総距離（km）
         - total_reps: 総レップ数
-        - by_category: カテゴリ別のセッション数・合計値
-        - by_exercise: 運動種目別のセッション数・合計値
-        - logs: 元の運動記録リスト（参照用）
+        - by_category: カテゴリ別のセッション数・稼働日数・合計値
+        - by_exercise: 運動種目別のセッション数・稼働日数・合計値
+          （重量の記録がある種目は max_weight, avg_reps も含む）
+        - habit_adherence: 運動習慣ごとの実施率（completion_rate）と部分達成度
+          （credit_rate）。運動習慣がない場合は含まない
+        - sessions: 上位セッション / 記録のリスト（"top" / "full" のみ）
+        - truncated: サイズ上限や取得件数の上限で省略したかどうか
+        - omitted: 省略したキー → 省略件数（sessions, habit_adherence, by_exercise,
+          by_category の順に詰める。省略した場合のみ）
+        - omitted_count: 省略したセッション数（"top" / "full" のみ）
 
     Examples:
         # 2026年1月の振り返り
@@ -544,33 +1030,69 @@ async def get_exercise_retrospective(
         ...     start_date="2026-01-01",
         ...     end_date="2026-01-31"
         ... )
+
+        # 種目ごとのベスト 3 セッション付き
+        >>> await get_exercise_retrospective(
+        ...     tool_context=ctx,
+        ...     start_date="2026-01-01",
+        ...     end_date="2026-03-31",
+        ...     detail_level="top"
+        ... )
     """
     user_id = tool_context.user_id
 
+    if detail_level not in RETROSPECTIVE_DETAIL_LEVELS:
+        return {
+            "status": "error",
+            "message": f"detail_level は {', '.join(RETROSPECTIVE_DETAIL_LEVELS)} のいずれかを指定してください。",
+        }
+
     try:
-        # 日付のみの場合は 00:00:00 / 23:59:59 に正規化
-        start_normalized = start_date.strip()
-        end_normalized = end_date.strip()
-        if "T" not in start_normalized:
-            start_normalized = f"{start_normalized}T00:00:00"
-        if "T" not in end_normalized:
-            end_normalized = f"{end_normalized}T23:59:59"
-
-        result = await get_exercise_logs_by_date_range(
-            tool_context=tool_context,
-            start_date=start_normalized,
-            end_date=end_normalized,
-            limit=None,
-        )
+        try:
+            start_normalized, end_normalized, start_dt, end_dt = _normalize_period(
+                start_date, end_date
+            )
+        except ValueError as e:
+            logger.warning(
+                "日付の解析に失敗しました",
+                start_date=start_date,
+                end_date=end_date,
+                error=str(e),
+            )
+            return {"status": "error", "message": str(e)}
 
-        if result["status"] == "error":
-            return result
-        if result["status"] == "not_found":
+        async with get_async_session() as session:
+            repo = ExerciseLogRepository(session)
+            aggregates = await repo.get_period_aggregates(user_id, start_dt, end_dt)
+
+            # 種目別の内訳にセット単位の最大重量・平均レップ数を加える
+            if aggregates["total"] is not None:
+                for stats in await repo.get_set_stats(user_id, start_dt, end_dt):
+                    entry = aggregates["by_exercise"].get(stats["exercise_name"])
+                    if entry is not None and stats["max_weight"] is not None:
+                        entry["max_weight"] = stats["max_weight"]
+                        entry["avg_reps"] = round(stats["avg_reps"] or 0.0, 1)
+
+            sessions = None
+            if aggregates["total"] is not None and detail_level == "top":
+                logs = await repo.get_top_sessions_per_exercise(
+                    user_id, start_dt, end_dt, per_exercise=max(top_n, 1)
+                )
+                sessions = [_serialize_log(log, include_sets=False) for log in logs]
+            elif aggregates["total"] is not None and detail_level == "full":
+                logs = await repo.get_by_user_and_date_range(
+                    user_id, start_dt, end_dt, limit=RETROSPECTIVE_PAGE_SIZE
+                )
+                sessions = [_serialize_log(log) for log in logs]
+
+        total = aggregates["total"]
+        if total is None:
             return {
                 "status": "not_found",
-                "message": result["message"],
+                "message": f"{start_normalized} から {end_normalized} の期間に運動記録がありません。",
                 "start_date": start_normalized,
                 "end_date": end_normalized,
+                "detail_level": detail_level,
                 "total_sessions": 0,
                 "active_days": 0,
                 "total_volume": 0.0,
@@ -579,89 +1101,71 @@ async def get_exercise_retrospective(
                 "total_reps": 0,
                 "by_category": {},
                 "by_exercise": {},
-                "logs": [],
             }
 
-        logs = result["logs"]
-
-        # 集計
-        active_dates: set[str] = set()
-        total_volume = 0.0
-        total_duration = 0
-        total_distance = 0.0
-        total_reps = 0
-        by_category: dict[str, dict[str, Any]] = {}
-        by_exercise: dict[str, dict[str, Any]] = {}
-
-        for log in logs:
-            recorded = log.get("recorded_at") or ""
-            date_part = recorded.split("T")[0] if recorded else ""
-            if date_part:
-                active_dates.add(date_part)
-
-            vol = log.get("total_volume") or 0
-            dur = log.get("total_duration") or 0
-            dist = log.get("total_distance") or 0
-            reps = log.get("total_reps") or 0
-            total_volume += vol if isinstance(vol, (int, float)) else 0
-            total_duration += dur if isinstance(dur, (int, float)) else 0
-            total_distance += dist if isinstance(dist, (int, float)) else 0
-            total_reps += reps if isinstance(reps, (int, float)) else 0
-
-            cat = log.get("category") or "unknown"
-            if cat not in by_category:
-                by_category[cat] = {
-                    "sessions": 0,
-                    "total_volume": 0.0,
-                    "total_duration": 0,
-                    "total_distance": 0.0,
-                    "total_reps": 0,
-                }
-            by_category[cat]["sessions"] += 1
-            by_category[cat]["total_volume"] += vol if isinstance(vol, (int, float)) else 0
-            by_category[cat]["total_duration"] += dur if isinstance(dur, (int, float)) else 0
-            by_category[cat]["total_distance"] += dist if isinstance(dist, (int, float)) else 0
-            by_category[cat]["total_reps"] += reps if isinstance(reps, (int, float)) else 0
-
-            name = log.get("exercise_name") or "不明"
-            if name not in by_exercise:
-                by_exercise[name] = {
-                    "sessions": 0,
-                    "total_volume": 0.0,
-                    "total_duration": 0,
-                    "total_distance": 0.0,
-                    "total_reps": 0,
-                }
-            by_exercise[name]["sessions"] += 1
-            by_exercise[name]["total_volume"] += vol if isinstance(vol, (int, float)) else 0
-            by_exercise[name]["total_duration"] += dur if isinstance(dur, (int, float)) else 0
-            by_exercise[name]["total_distance"] += dist if isinstance(dist, (int, float)) else 0
-            by_exercise[name]["total_reps"] += reps if isinstance(reps, (int, float)) else 0
-
         logger.info(
             "運動レトロスペクティブを取得しました",
             user_id=user_id,
             start_date=start_normalized,
             end_date=end_normalized,
-            total_sessions=len(logs),
-            active_days=len(active_dates),
+            detail_level=detail_level,
+            total_sessions=total["sessions"],
+            active_days=total["active_days"],
         )
 
-        return {
+        result = {
             "status": "success",
-            "message": f"{start_normalized} ～ {end_normalized} の期間で {len(logs)} セッション、{len(active_dates)} 日間運動しました。",
+            "message": f"{start_normalized} ～ {end_normalized} の期間で {total['sessions']} セッション、{total['active_days']} 日間運動しました。",
             "start_date": start_normalized,
             "end_date": end_normalized,
-            "total_sessions": len(logs),
-            "active_days": len(active_dates),
-            "total_volume": round(total_volume, 2),
-            "total_duration_seconds": total_duration,
-            "total_distance_km": round(total_distance, 2),
-            "total_reps": total_reps,
-            "by_category": by_category,
-            "by_exercise": by_exercise,
-            "logs": logs,
+            "detail_level": detail_level,
+            "total_sessions": total["sessions"],
+            "active_days": total["active_days"],
+            "total_volume": round(total["total_volume"], 2),
+            "total_duration_seconds": total["total_duration"],
+            "total_distance_km": round(total["total_distance"], 2),
+            "total_reps": total["total_reps"],
+            "by_category": aggregates["by_category"],
+            "by_exercise": aggregates["by_exercise"],
         }
+        adherence = await get_habit_adherence(
+            user_id,
+            _to_jst_midnight(start_dt),
+            _to_jst_midnight(end_dt),
+        )
+        if adherence:
+            result["habit_adherence"] = [
+                {
+                    "title": habit["title"],
+                    "scheduled": habit["scheduled"],
+                    "completed": habit["completed"],
+                    "completion_rate": habit["completion_rate"],
+                    "credit_rate": habit["credit_rate"],
+                }
+                for habit in adherence
+            ]
+        note = " 一部の記録は省略しました。続きは get_exercise_retrospective_sessions で取得できます。"
+        # "full" は取得件数の上限（RETROSPECTIVE_PAGE_SIZE）を超えた分も省略件数に含める
+        page_limited = detail_level == "full" and total["sessions"] > len(sessions)
+        if page_limited:
+            result["message"] += note
+        if sessions is not None:
+            expected = total["sessions"] if detail_level == "full" else len(sessions)
+            result["sessions"] = sessions
+            # サイズの判定に含めるため、最大の件数で仮に設定する
+            result["omitted_count"] = expected
+
+        # 集計を含むレスポンス全体を上限に収める（優先度の低いものから詰める）
+        _fit_to_budget(
+            result,
+            ["sessions", "habit_adherence", "by_exercise", "by_category"],
+            RETROSPECTIVE_MAX_BYTES,
+            note="" if page_limited else note,
+        )
+        if sessions is not None:
+            result["omitted_count"] = expected - len(result["sessions"])
+            result["truncated"] = result["truncated"] or page_limited
+        return result
     except Exception as e:
         logger.error(
             "運動レトロスペクティブの取得に失敗しました",
@@ -674,3 +1178,202 @@ async def get_exercise_retrospective(
             "status": "error",
             "message": f"振り返りの取得中にエラーが発生しました: {str(e)}",
         }
+
+
+async def get_exercise_retrospective_sessions(
+    tool_context: ToolContext,
+    start_date: str,
+    end_date: str,
+    exercise_name: str | None = None,
+    offset: int = 0,
+) -> dict:
+    """振り返り期間の運動記録をセット詳細付きでページ単位に取得する（深掘り用）。
+
+    get_exercise_retrospective で全体像を把握した後、特定の種目や続きの記録を
+    見たいときに使う。1 回のレスポンスは RETROSPECTIVE_MAX_BYTES 以内に収める。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        start_date: 期間の開始日（ISO 8601 形式、例: "2026-01-01"）
+        end_date: 期間の終了日（ISO 8601 形式、例: "2026-01-31"）
+        exercise_name: 運動名（省略時は全運動種目）
+        offset: 取得開始位置（前回の next_offset を指定する）
+
+    Returns:
+        取得結果を含む辞書:
+        - status: "success", "not_found", または "error"
+        - message: 結果メッセージ
+        - sessions: 運動記録のリスト（新しい順、セット詳細あり）
+        - next_offset: 続きがある場合の次の offset（ない場合は None）
+
+    Examples:
+        # 1〜3月のベンチプレスの記録を深掘り
+        >>> await get_exercise_retrospective_sessions(
+        ...     tool_context=ctx,
+        ...     start_date="2026-01-01",
+        ...     end_date="2026-03-31",
+        ...     exercise_name="ベンチプレス"
+        ... )
+    """
+    user_id = tool_context.user_id
+
+    try:
+        try:
+            start_normalized, end_normalized, start_dt, end_dt = _normalize_period(
+                start_date, end_date
+            )
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+
+        offset = max(offset, 0)
+        async with get_async_session() as session:
+            repo = ExerciseLogRepository(session)
+            # 続きの有無を判定するため 1 件多く取得する
+            logs = await repo.get_by_user_and_date_range(
+                user_id,
+                start_dt,
+                end_dt,
+                exercise_name=exercise_name,
+                limit=RETROSPECTIVE_PAGE_SIZE + 1,
+                offset=offset,
+            )
+
+        if not logs:
+            return {
+                "status": "not_found",
+                "message": f"{start_normalized} から {end_normalized} の期間にこれ以上の運動記録はありません。",
+                "sessions": [],
+                "next_offset": None,
+            }
+
+        has_more = len(logs) > RETROSPECTIVE_PAGE_SIZE
+        result = {
+            "status": "success",
+            "message": "",
+            "start_date": start_normalized,
+            "end_date": end_normalized,
+            "exercise_name": exercise_name,
+            "sessions": [_serialize_log(log) for log in logs[:RETROSPECTIVE_PAGE_SIZE]],
+        }
+        page_size = len(result["sessions"])
+        _fit_to_budget(result, ["sessions"], RETROSPECTIVE_MAX_BYTES)
+        if not result["sessions"]:
+            # 1 件だけで上限を超える場合はセット詳細を外して返し、ページングを進める
+            result["sessions"] = [_serialize_log(logs[0], include_sets=False)]
+        returned = len(result["sessions"])
+        omitted = page_size - returned
+        result["truncated"] = omitted > 0
+        result["omitted_count"] = omitted
+        result.pop("omitted", None)
+        result["next_offset"] = offset + returned if has_more or omitted else None
+        result["message"] = f"{returned} 件の運動記録を取得しました。"
+
+        logger.info(
+            "振り返りの運動記録を取得しました",
+            user_id=user_id,
+            exercise_name=exercise_name,
+            offset=offset,
+            count=returned,
+        )
+        return result
+    except Exception as e:
+        logger.error(
+            "振り返りの運動記録の取得に失敗しました",
+            user_id=user_id,
+            exercise_name=exercise_name,
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "message": f"運動記録の取得中にエラーが発生しました: {str(e)}",
+        }
+
+
+async def get_exercise_progression(
+    tool_context: ToolContext,
+    exercise_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    formula: str = "epley",
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> dict:
+    """筋トレ種目の推移（トップセット・推定1RM・ボリューム）を取得する。
+
+    セットの展開とセッションごとの集計は DB 側で行い、推定1RM の移動平均・
+    傾き（kg/週）を計算して、間引いた時系列を返す。伸びや停滞の質問に使う。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        exercise_name: 運動名（例: ベンチプレス）
+        start_date: 期間の開始日（ISO 8601 形式、省略時は全期間）
+        end_date: 期間の終了日（ISO 8601 形式、省略時は現在まで）
+        formula: 推定1RM の計算式（"epley" または "brzycki"、デフォルト: "epley"）
+        max_points: 返す時系列の最大点数（デフォルト: 20）
+
+    Returns:
+        取得結果を含む辞書:
+        - status: "success", "not_found", または "error"
+        - message: 結果メッセージ
+        - summary: 最新・ベストの推定1RM、変化量、傾き（kg/週）など
+        - series: 日付・トップセット・推定1RM・移動平均・ボリュームの時系列
+
+    Examples:
+        # ベンチプレスの推移
+        >>> await get_exercise_progression(tool_context=ctx, exercise_name="ベンチプレス")
+    """
+    user_id = tool_context.user_id
+
+    if formula not in E1RM_FORMULAS:
+        return {
+            "status": "error",
+            "message": f"formula は {', '.join(E1RM_FORMULAS)} のいずれかを指定してください。",
+        }
+
+    try:
+        try:
+            start_dt = _normalize_datetime(start_date, end_of_day=False)[1] if start_date else None
+            end_dt = _normalize_datetime(end_date, end_of_day=True)[1] if end_date else None
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+
+        async with get_async_session() as session:
+            repo = ExerciseLogRepository(session)
+            sessions = await repo.get_session_series(
+                user_id, exercise_name, start_date=start_dt, end_date=end_dt
+            )
+
+        if not sessions:
+            return {
+                "status": "not_found",
+                "message": f"「{exercise_name}」の重量つきの記録がありません。",
+                "exercise_name": exercise_name,
+            }
+
+        progression = compute_progression(sessions, formula=formula, max_points=max_points)
+
+        logger.info(
+            "運動の推移を取得しました",
+            user_id=user_id,
+            exercise_name=exercise_name,
+            sessions=len(sessions),
+        )
+
+        return {
+            "status": "success",
+            "message": f"「{exercise_name}」の {len(sessions)} セッション分の推移を取得しました。",
+            "exercise_name": exercise_name,
+            "formula": formula,
+            **progression,
+        }
+
+    except Exception as e:
+        logger.error(
+            "運動の推移の取得に失敗しました",
+            user_id=user_id,
+            exercise_name=exercise_name,
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "message": f"推移の取得中にエラーが発生しました: {str(e)}",
+        }
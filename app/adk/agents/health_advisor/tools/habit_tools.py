@@ -3,14 +3,21 @@
 Habits テーブルへの書き込みと読み込みを行うツールを提供する。
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
 from google.adk.tools import ToolContext
+from pydantic import ValidationError
 
 from ..db.config import get_async_session
 from ..db.repositories import HabitRepository
+from ..db.schemas import HabitUpdate
 from ..logger import get_logger
+from ..services.calorie_context import invalidate_calorie_context
+from ..services.habit_adherence import get_habit_adherence as load_habit_adherence
+from ..services.habit_snapshot import get_active_habits, invalidate_habit_snapshot
+from ..services.today_plan import get_today_plan as load_today_plan
+from ..utils import get_today_range_jst, parse_date_jst, parse_datetime_jst, to_utc
 
 logger = get_logger(__name__)
 
@@ -112,7 +119,7 @@ async def create_exercise_habit(
 
         if start_date:
             try:
-                start_date_dt = datetime.fromisoformat(start_date)
+                start_date_dt = parse_datetime_jst(start_date)
             except ValueError as e:
                 logger.warning(
                     "start_date の解析に失敗、現在時刻を使用します",
@@ -122,7 +129,7 @@ async def create_exercise_habit(
 
         if end_date:
             try:
-                end_date_dt = datetime.fromisoformat(end_date)
+                end_date_dt = parse_datetime_jst(end_date)
             except ValueError as e:
                 logger.warning(
                     "end_date の解析に失敗しました",
@@ -162,6 +169,8 @@ async def create_exercise_habit(
                 priority=priority,
             )
 
+            invalidate_habit_snapshot(user_id, tool_context.state)
+
             logger.info(
                 "運動習慣計画を作成しました",
                 user_id=user_id,
@@ -283,7 +292,7 @@ async def create_meal_habit(
 
         if start_date:
             try:
-                start_date_dt = datetime.fromisoformat(start_date)
+                start_date_dt = parse_datetime_jst(start_date)
             except ValueError as e:
                 logger.warning(
                     "start_date の解析に失敗、現在時刻を使用します",
@@ -293,7 +302,7 @@ async def create_meal_habit(
 
         if end_date:
             try:
-                end_date_dt = datetime.fromisoformat(end_date)
+                end_date_dt = parse_datetime_jst(end_date)
             except ValueError as e:
                 logger.warning(
                     "end_date の解析に失敗しました",
@@ -331,33 +340,248 @@ async def create_meal_habit(
                 priority=priority,
             )
 
+        logger.info(
+            "食事習慣計画を作成しました",
+            user_id=user_id,
+            habit_id=habit.id,
+            title=title,
+        )
+        # 目標カロリーが変わるため破棄する
+        invalidate_calorie_context(user_id)
+        invalidate_habit_snapshot(user_id, tool_context.state)
+
+        return {
+            "status": "success",
+            "message": f"食事習慣計画を作成しました: {title}",
+            "habit_id": habit.id,
+            "habit_type": habit.habit_type,
+            "title": habit.title,
+            "frequency": habit.frequency,
+            "is_active": habit.is_active,
+        }
+
+    except Exception as e:
+        logger.error(
+            "食事習慣計画の作成に失敗しました",
+            user_id=user_id,
+            title=title,
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "message": f"食事習慣計画の作成中にエラーが発生しました: {str(e)}",
+        }
+
+
+async def create_routine(
+    tool_context: ToolContext,
+    routine_name: str,
+    items: list[dict[str, Any]],
+    frequency: str,
+    goal_id: str | None = None,
+    days_of_week: list[str] | None = None,
+    time_of_day: str | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> dict:
+    """複数の運動習慣をルーティンとしてまとめて作成する。
+
+    ルーティン ID を発行し、items の順にルーティン内の順序を振って、
+    全ての運動習慣を 1 回の INSERT で作成する（途中で失敗した場合は 1 件も作成されない）。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        routine_name: ルーティン名（例: 胸の日、朝のストレッチ）
+        items: 運動習慣のリスト（実施順）。各項目は title（必須）と
+            exercise_name, category, muscle_group, target_sets, target_reps,
+            target_duration, target_distance, target_weight, description, notes, priority を持てる。
+            days_of_week / time_of_day を指定した項目はルーティン全体の設定を上書きする
+        frequency: 頻度（"daily", "weekly", "custom"）
+        goal_id: 関連する目標 ID（オプション）
+        days_of_week: 曜日リスト（例: ["monday", "thursday"]）
+        time_of_day: 時刻（HH:MM 形式、例: "18:00"）
+        start_date: 開始日時（ISO 8601 形式、省略時は現在時刻）
+        end_date: 終了日時（ISO 8601 形式）
+
+    Returns:
+        作成結果を含む辞書:
+        - status: "success" または "error"
+        - message: 結果メッセージ
+        - routine_id: 発行したルーティン ID（成功時のみ）
+        - routine_name: ルーティン名（成功時のみ）
+        - habits: 作成した習慣計画のリスト（ルーティン内の順序順、成功時のみ）
+
+    Examples:
+        >>> await create_routine(
+        ...     tool_context=ctx,
+        ...     routine_name="胸の日",
+        ...     frequency="weekly",
+        ...     days_of_week=["monday", "thursday"],
+        ...     items=[
+        ...         {"title": "ベンチプレス", "exercise_name": "ベンチプレス",
+        ...          "category": "strength", "muscle_group": "chest",
+        ...          "target_sets": 3, "target_reps": 10, "target_weight": 60.0},
+        ...         {"title": "ダンベルフライ", "exercise_name": "ダンベルフライ",
+        ...          "category": "strength", "muscle_group": "chest",
+        ...          "target_sets": 3, "target_reps": 12},
+        ...     ],
+        ... )
+    """
+    user_id = tool_context.user_id
+
+    try:
+        start_date_dt = None
+        end_date_dt = None
+
+        if start_date:
+            try:
+                start_date_dt = parse_datetime_jst(start_date)
+            except ValueError as e:
+                logger.warning(
+                    "start_date の解析に失敗、現在時刻を使用します",
+                    start_date=start_date,
+                    error=str(e),
+                )
+
+        if end_date:
+            try:
+                end_date_dt = parse_datetime_jst(end_date)
+            except ValueError as e:
+                logger.warning(
+                    "end_date の解析に失敗しました",
+                    end_date=end_date,
+                    error=str(e),
+                )
+
+        async with get_async_session() as session:
+            repo = HabitRepository(session)
+
+            habits = await repo.create_routine(
+                user_id=user_id,
+                routine_name=routine_name,
+                items=items,
+                frequency=frequency,
+                goal_id=goal_id,
+                days_of_week=days_of_week,
+                time_of_day=time_of_day,
+                start_date=start_date_dt,
+                end_date=end_date_dt,
+            )
+            routine_id = habits[0].routine_id
+
+            invalidate_habit_snapshot(user_id, tool_context.state)
+
             logger.info(
-                "食事習慣計画を作成しました",
+                "ルーティンを作成しました",
                 user_id=user_id,
-                habit_id=habit.id,
-                title=title,
+                routine_id=routine_id,
+                count=len(habits),
             )
 
             return {
                 "status": "success",
-                "message": f"食事習慣計画を作成しました: {title}",
-                "habit_id": habit.id,
-                "habit_type": habit.habit_type,
-                "title": habit.title,
-                "frequency": habit.frequency,
-                "is_active": habit.is_active,
+                "message": f"ルーティン「{routine_name}」を作成しました（{len(habits)} 件の運動習慣）",
+                "routine_id": routine_id,
+                "routine_name": routine_name,
+                "habits": [
+                    {
+                        "id": habit.id,
+                        "title": habit.title,
+                        "order_in_routine": habit.order_in_routine,
+                        "exercise_name": habit.exercise_name,
+                    }
+                    for habit in habits
+                ],
             }
 
+    except ValueError as e:
+        return {
+            "status": "error",
+            "message": str(e),
+        }
     except Exception as e:
         logger.error(
-            "食事習慣計画の作成に失敗しました",
+            "ルーティンの作成に失敗しました",
             user_id=user_id,
-            title=title,
+            routine_name=routine_name,
             error=str(e),
         )
         return {
             "status": "error",
-            "message": f"食事習慣計画の作成中にエラーが発生しました: {str(e)}",
+            "message": f"ルーティンの作成中にエラーが発生しました: {str(e)}",
+        }
+
+
+async def reorder_routine(
+    tool_context: ToolContext,
+    routine_id: str,
+    habit_ids: list[str],
+) -> dict:
+    """ルーティン内の習慣計画の順序を並べ替える。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        routine_id: ルーティン ID
+        habit_ids: ルーティンの全ての習慣計画 ID（新しい実施順）
+
+    Returns:
+        更新結果を含む辞書:
+        - status: "success" または "error"
+        - message: 結果メッセージ
+        - routine_id: ルーティン ID
+        - updated_count: 更新した件数（成功時のみ）
+
+    Examples:
+        >>> await reorder_routine(
+        ...     tool_context=ctx,
+        ...     routine_id="0b6f...",
+        ...     habit_ids=["habit-3", "habit-1", "habit-2"],
+        ... )
+    """
+    user_id = tool_context.user_id
+
+    try:
+        async with get_async_session() as session:
+            repo = HabitRepository(session)
+
+            updated = await repo.reorder_routine(
+                user_id=user_id,
+                routine_id=routine_id,
+                habit_ids=habit_ids,
+            )
+
+            invalidate_habit_snapshot(user_id, tool_context.state)
+
+            logger.info(
+                "ルーティンの順序を更新しました",
+                user_id=user_id,
+                routine_id=routine_id,
+                count=updated,
+            )
+
+            return {
+                "status": "success",
+                "message": f"ルーティンの順序を更新しました（{updated} 件）",
+                "routine_id": routine_id,
+                "updated_count": updated,
+            }
+
+    except ValueError as e:
+        return {
+            "status": "error",
+            "message": str(e),
+            "routine_id": routine_id,
+        }
+    except Exception as e:
+        logger.error(
+            "ルーティンの順序の更新に失敗しました",
+            user_id=user_id,
+            routine_id=routine_id,
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "message": f"ルーティンの順序の更新中にエラーが発生しました: {str(e)}",
         }
 
 
@@ -373,7 +597,8 @@ async def get_habits(
     Args:
         tool_context: ADK が提供する ToolContext
         habit_type: 習慣タイプでフィルタ（"exercise" または "meal"）
-        is_active: アクティブ状態でフィルタ（True: アクティブのみ、False: 非アクティブのみ）
+        is_active: アクティブ状態でフィルタ（True: アクティブのみ、False: 非アクティブのみ）。
+            True の場合は習慣のスナップショットから返す（同じ会話内の 2 回目以降は DB にアクセスしない）
         limit: 取得件数の上限（デフォルト: 100）
         offset: 取得開始位置（デフォルト: 0）
 
@@ -398,77 +623,85 @@ async def get_habits(
     user_id = tool_context.user_id
 
     try:
-        async with get_async_session() as session:
-            repo = HabitRepository(session)
-
-            # 習慣計画を取得（開始日の降順）
-            habits = await repo.get_by_user_id(
-                user_id=user_id,
-                habit_type=habit_type,
-                is_active=is_active,
-                limit=limit,
-                offset=offset,
-            )
-
-            if not habits:
-                logger.info("習慣計画が見つかりません", user_id=user_id)
-                return {
-                    "status": "not_found",
-                    "message": "習慣計画がありません。",
-                    "habits": [],
-                    "total_count": 0,
-                }
-
-            logger.info(
-                "習慣計画を取得しました",
-                user_id=user_id,
-                count=len(habits),
-                habit_type=habit_type,
-                is_active=is_active,
-            )
+        if is_active:
+            # アクティブな習慣はスナップショットから取得する（開始日の降順）
+            habits = [
+                habit
+                for habit in await get_active_habits(user_id, tool_context.state)
+                if habit_type is None or habit.habit_type == habit_type
+            ][offset : offset + limit]
+        else:
+            async with get_async_session() as session:
+                repo = HabitRepository(session)
+
+                # 習慣計画を取得（開始日の降順）
+                habits = await repo.get_by_user_id(
+                    user_id=user_id,
+                    habit_type=habit_type,
+                    is_active=is_active,
+                    limit=limit,
+                    offset=offset,
+                )
 
+        if not habits:
+            logger.info("習慣計画が見つかりません", user_id=user_id)
             return {
-                "status": "success",
-                "message": f"{len(habits)} 件の習慣計画を取得しました。",
-                "habits": [
-                    {
-                        "id": habit.id,
-                        "habit_type": habit.habit_type,
-                        "title": habit.title,
-                        "description": habit.description,
-                        "routine_id": habit.routine_id,
-                        "routine_name": habit.routine_name,
-                        "order_in_routine": habit.order_in_routine,
-                        "exercise_name": habit.exercise_name,
-                        "category": habit.category,
-                        "muscle_group": habit.muscle_group,
-                        "target_sets": habit.target_sets,
-                        "target_reps": habit.target_reps,
-                        "target_duration": habit.target_duration,
-                        "target_distance": habit.target_distance,
-                        "target_weight": habit.target_weight,
-                        "meal_type": habit.meal_type,
-                        "target_calories": habit.target_calories,
-                        "target_proteins": habit.target_proteins,
-                        "target_fats": habit.target_fats,
-                        "target_carbohydrates": habit.target_carbohydrates,
-                        "meal_guidelines": habit.meal_guidelines,
-                        "frequency": habit.frequency,
-                        "days_of_week": habit.days_of_week,
-                        "time_of_day": habit.time_of_day,
-                        "is_active": habit.is_active,
-                        "start_date": habit.start_date.isoformat(),
-                        "end_date": habit.end_date.isoformat() if habit.end_date else None,
-                        "notes": habit.notes,
-                        "priority": habit.priority,
-                        "created_at": habit.created_at.isoformat(),
-                        "updated_at": habit.updated_at.isoformat(),
-                    }
-                    for habit in habits
-                ],
-                "total_count": len(habits),
+                "status": "not_found",
+                "message": "習慣計画がありません。",
+                "habits": [],
+                "total_count": 0,
             }
 
+        logger.info(
+            "習慣計画を取得しました",
+            user_id=user_id,
+            count=len(habits),
+            habit_type=habit_type,
+            is_active=is_active,
+        )
+
+        return {
+            "status": "success",
+            "message": f"{len(habits)} 件の習慣計画を取得しました。",
+            "habits": [
+                {
+                    "id": habit.id,
+                    "habit_type": habit.habit_type,
+                    "title": habit.title,
+                    "description": habit.description,
+                    "routine_id": habit.routine_id,
+                    "routine_name": habit.routine_name,
+                    "order_in_routine": habit.order_in_routine,
+                    "exercise_name": habit.exercise_name,
+                    "category": habit.category,
+                    "muscle_group": habit.muscle_group,
+                    "target_sets": habit.target_sets,
+                    "target_reps": habit.target_reps,
+                    "target_duration": habit.target_duration,
+                    "target_distance": habit.target_distance,
+                    "target_weight": habit.target_weight,
+                    "meal_type": habit.meal_type,
+                    "target_calories": habit.target_calories,
+                    "target_proteins": habit.target_proteins,
+                    "target_fats": habit.target_fats,
+                    "target_carbohydrates": habit.target_carbohydrates,
+                    "meal_guidelines": habit.meal_guidelines,
+                    "frequency": habit.frequency,
+                    "days_of_week": habit.days_of_week,
+                    "time_of_day": habit.time_of_day,
+                    "is_active": habit.is_active,
+                    "start_date": habit.start_date.isoformat(),
+                    "end_date": habit.end_date.isoformat() if habit.end_date else None,
+                    "notes": habit.notes,
+                    "priority": habit.priority,
+                    "created_at": habit.created_at.isoformat(),
+                    "updated_at": habit.updated_at.isoformat(),
+                }
+                for habit in habits
+            ],
+            "total_count": len(habits),
+        }
+
     except Exception as e:
         logger.error(
             "習慣計画の取得に失敗しました",
@@ -513,62 +746,78 @@ async def get_habits_by_goal(
     user_id = tool_context.user_id
 
     try:
-        async with get_async_session() as session:
-            repo = HabitRepository(session)
-
-            # 目標 ID で習慣計画を取得
-            habits = await repo.get_by_goal_id(
-                goal_id=goal_id,
-                is_active=is_active,
-                limit=limit,
-            )
-
-            if not habits:
-                logger.info(
-                    "指定された目標の習慣計画が見つかりません",
-                    user_id=user_id,
+        if is_active:
+            # アクティブな習慣はスナップショットから取得する（優先度の降順、開始日の降順）
+            habits = sorted(
+                (
+                    habit
+                    for habit in await get_active_habits(user_id, tool_context.state)
+                    if habit.goal_id == goal_id
+                ),
+                key=lambda habit: (
+                    habit.priority is None,
+                    habit.priority or 0,
+                    habit.start_date,
+                ),
+                reverse=True,
+            )[:limit]
+        else:
+            async with get_async_session() as session:
+                repo = HabitRepository(session)
+
+                # 目標 ID で習慣計画を取得
+                habits = await repo.get_by_goal_id(
                     goal_id=goal_id,
+                    is_active=is_active,
+                    limit=limit,
                 )
-                return {
-                    "status": "not_found",
-                    "message": f"目標 ID「{goal_id}」に関連する習慣計画がありません。",
-                    "goal_id": goal_id,
-                    "habits": [],
-                    "total_count": 0,
-                }
 
+        if not habits:
             logger.info(
-                "習慣計画を取得しました",
+                "指定された目標の習慣計画が見つかりません",
                 user_id=user_id,
                 goal_id=goal_id,
-                count=len(habits),
             )
-
             return {
-                "status": "success",
-                "message": f"目標に関連する習慣計画を {len(habits)} 件取得しました。",
+                "status": "not_found",
+                "message": f"目標 ID「{goal_id}」に関連する習慣計画がありません。",
                 "goal_id": goal_id,
-                "habits": [
-                    {
-                        "id": habit.id,
-                        "habit_type": habit.habit_type,
-                        "title": habit.title,
-                        "description": habit.description,
-                        "exercise_name": habit.exercise_name,
-                        "category": habit.category,
-                        "target_sets": habit.target_sets,
-                        "target_reps": habit.target_reps,
-                        "frequency": habit.frequency,
-                        "is_active": habit.is_active,
-                        "priority": habit.priority,
-                        "start_date": habit.start_date.isoformat(),
-                        "created_at": habit.created_at.isoformat(),
-                    }
-                    for habit in habits
-                ],
-                "total_count": len(habits),
+                "habits": [],
+                "total_count": 0,
             }
 
+        logger.info(
+            "習慣計画を取得しました",
+            user_id=user_id,
+            goal_id=goal_id,
+            count=len(habits),
+        )
+
+        return {
+            "status": "success",
+            "message": f"目標に関連する習慣計画を {len(habits)} 件取得しました。",
+            "goal_id": goal_id,
+            "habits": [
+                {
+                    "id": habit.id,
+                    "habit_type": habit.habit_type,
+                    "title": habit.title,
+                    "description": habit.description,
+                    "exercise_name": habit.exercise_name,
+                    "category": habit.category,
+                    "target_sets": habit.target_sets,
+                    "target_reps": habit.target_reps,
+                    "frequency": habit.frequency,
+                    "is_active": habit.is_active,
+                    "priority": habit.priority,
+                    "start_date": habit.start_date.isoformat(),
+                    "created_at": habit.created_at.isoformat(),
+                }
+                for habit in habits
+            ],
+            "total_count": len(habits),
+        }
+
     except Exception as e:
         logger.error(
             "習慣計画の取得に失敗しました",
@@ -612,59 +861,70 @@ async def get_habits_by_routine(
     user_id = tool_context.user_id
 
     try:
-        async with get_async_session() as session:
-            repo = HabitRepository(session)
-
-            # ルーティン ID で習慣計画を取得
-            habits = await repo.get_by_routine_id(
-                user_id=user_id,
-                routine_id=routine_id,
-                is_active=is_active,
+        if is_active:
+            # アクティブな習慣はスナップショットから取得する（ルーティン内の順序順）
+            habits = sorted(
+                (
+                    habit
+                    for habit in await get_active_habits(user_id, tool_context.state)
+                    if habit.routine_id == routine_id
+                ),
+                key=lambda habit: habit.order_in_routine or 0,
             )
+        else:
+            async with get_async_session() as session:
+                repo = HabitRepository(session)
 
-            if not habits:
-                logger.info(
-                    "指定されたルーティンの習慣計画が見つかりません",
+                # ルーティン ID で習慣計画を取得
+                habits = await repo.get_by_routine_id(
                     user_id=user_id,
                     routine_id=routine_id,
+                    is_active=is_active,
                 )
-                return {
-                    "status": "not_found",
-                    "message": f"ルーティン ID「{routine_id}」に関連する習慣計画がありません。",
-                    "routine_id": routine_id,
-                    "habits": [],
-                    "total_count": 0,
-                }
 
+        if not habits:
             logger.info(
-                "習慣計画を取得しました",
+                "指定されたルーティンの習慣計画が見つかりません",
                 user_id=user_id,
                 routine_id=routine_id,
-                count=len(habits),
             )
-
             return {
-                "status": "success",
-                "message": f"ルーティンに関連する習慣計画を {len(habits)} 件取得しました。",
+                "status": "not_found",
+                "message": f"ルーティン ID「{routine_id}」に関連する習慣計画がありません。",
                 "routine_id": routine_id,
-                "habits": [
-                    {
-                        "id": habit.id,
-                        "habit_type": habit.habit_type,
-                        "title": habit.title,
-                        "order_in_routine": habit.order_in_routine,
-                        "exercise_name": habit.exercise_name,
-                        "category": habit.category,
-                        "target_sets": habit.target_sets,
-                        "target_reps": habit.target_reps,
-                        "is_active": habit.is_active,
-                        "created_at": habit.created_at.isoformat(),
-                    }
-                    for habit in habits
-                ],
-                "total_count": len(habits),
+                "habits": [],
+                "total_count": 0,
             }
 
+        logger.info(
+            "習慣計画を取得しました",
+            user_id=user_id,
+            routine_id=routine_id,
+            count=len(habits),
+        )
+
+        return {
+            "status": "success",
+            "message": f"ルーティンに関連する習慣計画を {len(habits)} 件取得しました。",
+            "routine_id": routine_id,
+            "habits": [
+                {
+                    "id": habit.id,
+                    "habit_type": habit.habit_type,
+                    "title": habit.title,
+                    "order_in_routine": habit.order_in_routine,
+                    "exercise_name": habit.exercise_name,
+                    "category": habit.category,
+                    "target_sets": habit.target_sets,
+                    "target_reps": habit.target_reps,
+                    "is_active": habit.is_active,
+                    "created_at": habit.created_at.isoformat(),
+                }
+                for habit in habits
+            ],
+            "total_count": len(habits),
+        }
+
     except Exception as e:
         logger.error(
             "習慣計画の取得に失敗しました",
@@ -678,23 +938,218 @@ async def get_habits_by_routine(
         }
 
 
+async def get_habit_adherence(
+    tool_context: ToolContext,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> dict:
+    """運動習慣の実施状況（実施率・部分達成度）を取得する。
+
+    アクティブな運動習慣ごとに、期間内の予定（曜日指定・毎日は予定日、曜日指定のない
+    週単位の習慣は週）に対して、運動記録が目標セット数・レップ数・時間・距離を
+    満たした割合を返す。「習慣どおりできてる？」「今週サボった？」などに使う。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+        start_date: 期間の開始日（YYYY-MM-DD 形式、省略時は終了日の6日前）
+        end_date: 期間の終了日（YYYY-MM-DD 形式、省略時は今日）
+
+    Returns:
+        取得結果を含む辞書:
+        - status: "success", "not_found", "invalid_date", または "error"
+        - start_date, end_date: 対象期間
+        - habits: 習慣ごとの実施状況。scheduled（予定数）, done（記録あり）,
+          completed（目標達成）, completion_rate（達成率）, credit_rate（部分達成度の平均）,
+          recent（直近の予定ごとの達成度）を持つ
+
+    Examples:
+        # 直近 1 週間の実施状況
+        >>> await get_habit_adherence(tool_context=ctx)
+    """
+    user_id = tool_context.user_id
+
+    try:
+        try:
+            end = parse_date_jst(end_date) if end_date else get_today_range_jst()[0]
+            start = parse_date_jst(start_date) if start_date else end - timedelta(days=6)
+        except ValueError:
+            return {
+                "status": "invalid_date",
+                "message": "日付の形式が不正です。YYYY-MM-DD 形式で指定してください。",
+            }
+
+        if start > end:
+            return {
+                "status": "invalid_date",
+                "message": "開始日は終了日より前である必要があります。",
+            }
+
+        results = await load_habit_adherence(user_id, start, end)
+        if not results:
+            return {
+                "status": "not_found",
+                "message": "運動名が設定されたアクティブな運動習慣がありません。",
+                "habits": [],
+            }
+
+        return {
+            "status": "success",
+            "start_date": start.date().isoformat(),
+            "end_date": end.date().isoformat(),
+            "habits": results,
+        }
+
+    except Exception as e:
+        logger.error(
+            "運動習慣の実施状況の計算に失敗しました",
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "message": f"運動習慣の実施状況の計算中にエラーが発生しました: {str(e)}",
+        }
+
+
+async def get_today_plan(tool_context: ToolContext) -> dict:
+    """今日（JST）の予定と実施状況を取得する。
+
+    今日予定されているアクティブな運動・食事習慣と、今日の運動記録・食事記録を
+    まとめて照合し、予定ごとの実施状況を返す。「今日のメニューは？」「今日やることは？」
+    「今日の残りは？」などに使う。get_habits や get_exercise_logs を個別に呼ぶ必要はない。
+
+    Args:
+        tool_context: ADK が提供する ToolContext
+
+    Returns:
+        取得結果を含む辞書:
+        - status: "success", "not_found", または "error"
+        - date, weekday: 対象日と曜日
+        - items: 予定ごとの実施状況（時刻順）。status は "done"（目標達成・記録あり）,
+          "partial"（運動の目標に一部届いていない）, "pending"（未実施）。
+          運動は targets / actual / credit、食事は target_calories / actual_calories を持つ。
+          weekly が True の運動は今週のどこかで 1 回やればよい予定
+        - done_count, pending_count: 完了・未完了の件数
+
+    Examples:
+        >>> await get_today_plan(tool_context=ctx)
+    """
+    user_id = tool_context.user_id
+
+    try:
+        plan = await load_today_plan(user_id, tool_context.state)
+        if not plan["items"]:
+            return {
+                "status": "not_found",
+                "message": "今日予定されている習慣はありません。",
+                **plan,
+            }
+
+        return {
+            "status": "success",
+            "message": (
+                f"今日の予定は {len(plan['items'])} 件"
+                f"（完了 {plan['done_count']} 件、未完了 {plan['pending_count']} 件）です。"
+            ),
+            **plan,
+        }
+
+    except Exception as e:
+        logger.error(
+            "今日の予定の取得に失敗しました",
+            user_id=user_id,
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "message": f"今日の予定の取得中にエラーが発生しました: {str(e)}",
+        }
+
+
+def _format_diff(diff: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """差分の日時を UTC に揃えて ISO 形式に変換する。"""
+    return {
+        key: {
+            side: to_utc(value).isoformat() if isinstance(value, datetime) else value
+            for side, value in change.items()
+        }
+        for key, change in diff.items()
+    }
+
+
+# 食事習慣で変わると目標カロリーが変わるフィールド
+_CALORIE_TARGET_FIELDS = {"target_calories", "days_of_week", "is_active", "start_date", "end_date"}
+
+
 async def update_habit(
     tool_context: ToolContext,
     habit_id: str,
-    **kwargs: Any,
+    title: str | None = None,
+    description: str | None = None,
+    exercise_name: str | None = None,
+    category: str | None = None,
+    muscle_group: str | None = None,
+    target_sets: int | None = None,
+    target_reps: int | None = None,
+    target_duration: int | None = None,
+    target_distance: float | None = None,
+    target_weight: float | None = None,
+    meal_type: str | None = None,
+    target_calories: int | None = None,
+    target_proteins: int | None = None,
+    target_fats: int | None = None,
+    target_carbohydrates: int | None = None,
+    meal_guidelines: str | None = None,
+    frequency: str | None = None,
+    days_of_week: list[str] | None = None,
+    time_of_day: str | None = None,
+    is_active: bool | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    notes: str | None = None,
+    priority: int | None = None,
 ) -> dict:
     """習慣計画を更新する。
 
+    指定したフィールドのうち、現在の値と異なるものだけを更新する。
+    何も変わらない場合は更新しない（status は "success"、changes は空）。
+
     Args:
         tool_context: ADK が提供する ToolContext
         habit_id: 習慣計画 ID
-        **kwargs: 更新するフィールド値（例: title, target_sets, is_active等）
+        title: タイトル
+        description: 説明
+        exercise_name: 運動名
+        category: カテゴリ（strength, cardio, flexibility 等）
+        muscle_group: 対象筋肉群
+        target_sets: 目標セット数
+        target_reps: 目標レップ数
+        target_duration: 目標時間（秒）
+        target_distance: 目標距離（km）
+        target_weight: 目標重量（kg）
+        meal_type: 食事タイプ
+        target_calories: 目標カロリー
+        target_proteins: 目標タンパク質（g）
+        target_fats: 目標脂質（g）
+        target_carbohydrates: 目標炭水化物（g）
+        meal_guidelines: 食事ガイドライン
+        frequency: 頻度（"daily", "weekly", "custom"）
+        days_of_week: 曜日リスト（例: ["monday", "thursday"]）
+        time_of_day: 時刻（HH:MM 形式）
+        is_active: アクティブ状態
+        start_date: 開始日時（ISO 8601 形式）
+        end_date: 終了日時（ISO 8601 形式）
+        notes: メモ
+        priority: 優先度（1-5）
 
     Returns:
         更新結果を含む辞書:
-        - status: "success", "not_found", または "error"
+        - status: "success", "not_found", "invalid", または "error"
         - message: 結果メッセージ
         - habit_id: 更新された習慣計画の ID（成功時のみ）
+        - changes: 変更されたフィールドごとの {"from": 旧値, "to": 新値}（成功時のみ）
 
     Examples:
         # タイトルを更新
@@ -713,13 +1168,55 @@ async def update_habit(
         ... )
     """
     user_id = tool_context.user_id
+    fields = {
+        key: value
+        for key, value in {
+            "title": title,
+            "description": description,
+            "exercise_name": exercise_name,
+            "category": category,
+            "muscle_group": muscle_group,
+            "target_sets": target_sets,
+            "target_reps": target_reps,
+            "target_duration": target_duration,
+            "target_distance": target_distance,
+            "target_weight": target_weight,
+            "meal_type": meal_type,
+            "target_calories": target_calories,
+            "target_proteins": target_proteins,
+            "target_fats": target_fats,
+            "target_carbohydrates": target_carbohydrates,
+            "meal_guidelines": meal_guidelines,
+            "frequency": frequency,
+            "days_of_week": days_of_week,
+            "time_of_day": time_of_day,
+            "is_active": is_active,
+            "start_date": start_date,
+            "end_date": end_date,
+            "notes": notes,
+            "priority": priority,
+        }.items()
+        if value is not None
+    }
+
+    try:
+        changes = HabitUpdate(**fields)
+    except ValidationError as e:
+        return {
+            "status": "invalid",
+            "message": "更新内容が不正です: "
+            + "、".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                for err in e.errors()
+            ),
+        }
 
     try:
         async with get_async_session() as session:
             repo = HabitRepository(session)
 
-            # 習慣計画を更新
-            habit = await repo.update_habit(habit_id=habit_id, **kwargs)
+            # 値が変わるフィールドのみ更新する
+            habit, diff = await repo.update_habit(habit_id, changes, user_id=user_id)
 
             if not habit:
                 logger.warning(
@@ -732,19 +1229,29 @@ async def update_habit(
                     "message": f"習慣計画 ID「{habit_id}」が見つかりません。",
                 }
 
-            logger.info(
-                "習慣計画を更新しました",
-                user_id=user_id,
-                habit_id=habit_id,
-                updated_fields=list(kwargs.keys()),
-            )
+        if diff:
+            invalidate_habit_snapshot(user_id, tool_context.state)
+            if habit.habit_type == "meal" and diff.keys() & _CALORIE_TARGET_FIELDS:
+                invalidate_calorie_context(user_id)
 
-            return {
-                "status": "success",
-                "message": f"習慣計画を更新しました: {habit.title}",
-                "habit_id": habit.id,
-                "title": habit.title,
-            }
+        logger.info(
+            "習慣計画を更新しました",
+            user_id=user_id,
+            habit_id=habit_id,
+            updated_fields=list(diff),
+        )
+
+        return {
+            "status": "success",
+            "message": (
+                f"習慣計画を更新しました: {habit.title}"
+                if diff
+                else f"変更はありませんでした: {habit.title}"
+            ),
+            "habit_id": habit.id,
+            "title": habit.title,
+            "changes": _format_diff(diff),
+        }
 
     except Exception as e:
         logger.error(
@@ -788,7 +1295,7 @@ async def deactivate_habit(
             repo = HabitRepository(session)
 
             # 習慣計画を非アクティブ化
-            habit = await repo.deactivate_habit(habit_id=habit_id)
+            habit = await repo.deactivate_habit(habit_id=habit_id, user_id=user_id)
 
             if not habit:
                 logger.warning(
@@ -801,18 +1308,23 @@ async def deactivate_habit(
                     "message": f"習慣計画 ID「{habit_id}」が見つかりません。",
                 }
 
-            logger.info(
-                "習慣計画を非アクティブ化しました",
-                user_id=user_id,
-                habit_id=habit_id,
-                title=habit.title,
-            )
+        invalidate_habit_snapshot(user_id, tool_context.state)
+        if habit.habit_type == "meal":
+            # 食事習慣の目標カロリーが変わるため破棄する
+            invalidate_calorie_context(user_id)
 
-            return {
-                "status": "success",
-                "message": f"習慣計画を非アクティブ化しました: {habit.title}",
-                "habit_id": habit.id,
-            }
+        logger.info(
+            "習慣計画を非アクティブ化しました",
+            user_id=user_id,
+            habit_id=habit_id,
+            title=habit.title,
+        )
+
+        return {
+            "status": "success",
+            "message": f"習慣計画を非アクティブ化しました: {habit.title}",
+            "habit_id": habit.id,
+        }
 
     except Exception as e:
         logger.error(
@@ -856,7 +1368,7 @@ async def activate_habit(
             repo = HabitRepository(session)
 
             # 習慣計画をアクティブ化
-            habit = await repo.activate_habit(habit_id=habit_id)
+            habit = await repo.activate_habit(habit_id=habit_id, user_id=user_id)
 
             if not habit:
                 logger.warning(
@@ -869,18 +1381,23 @@ async def activate_habit(
                     "message": f"習慣計画 ID「{habit_id}」が見つかりません。",
                 }
 
-            logger.info(
-                "習慣計画をアクティブ化しました",
-                user_id=user_id,
-                habit_id=habit_id,
-                title=habit.title,
-            )
+        invalidate_habit_snapshot(user_id, tool_context.state)
+        if habit.habit_type == "meal":
+            # 食事習慣の目標カロリーが変わるため破棄する
+            invalidate_calorie_context(user_id)
 
-            return {
-                "status": "success",
-                "message": f"習慣計画をアクティブ化しました: {habit.title}",
-                "habit_id": habit.id,
-            }
+        logger.info(
+            "習慣計画をアクティブ化しました",
+            user_id=user_id,
+            habit_id=habit_id,
+            title=habit.title,
+        )
+
+        return {
+            "status": "success",
+            "message": f"習慣計画をアクティブ化しました: {habit.title}",
+            "habit_id": habit.id,
+        }
 
     except Exception as e:
         logger.error(
@@ -4,11 +4,15 @@
 全てのサブエージェントから利用可能。
 """
 
+from typing import Any
+
 from google.adk.tools import ToolContext
 
 from ..db.config import get_async_session
-from ..db.repositories import GoalRepository
+from ..db.repositories import DietLogRepository, ExerciseLogRepository
 from ..logger import get_logger
+from ..services.goal_service import get_current_goal as load_current_goal
+from ..utils import get_jst_now
 
 logger = get_logger(__name__)
 
@@ -18,6 +22,7 @@ async def get_current_goal(tool_context: ToolContext) -> dict:
 
     運動習慣の作成やレトロスペクティブで目標と照らし合わせる際に使用する。
     設定されていない場合は未設定であることを返す。
+    同じ会話内では 2 回目以降 DB にアクセスしない。
 
     Returns:
         - status: "success" | "not_set" | "error"
@@ -26,25 +31,13 @@ async def get_current_goal(tool_context: ToolContext) -> dict:
     """
     user_id = tool_context.user_id
     try:
-        async with get_async_session() as session:
-            repo = GoalRepository(session)
-            goal = await repo.get_by_user_id(user_id)
-            if goal is None:
-                logger.info("健康目標が見つかりません", user_id=user_id)
-                return {
-                    "status": "not_set",
-                    "message": "健康目標がまだ設定されていません。目標を設定しましょう！",
-                }
-            logger.info("健康目標を取得しました", user_id=user_id, goal_id=goal.id)
+        goal = await load_current_goal(user_id, tool_context.state)
+        if goal is None:
             return {
-                "status": "success",
-                "health_goal": {
-                    "id": goal.id,
-                    "details": goal.details,
-                    "habits": goal.habits,
-                    "created_at": goal.created_at.isoformat(),
-                },
+                "status": "not_set",
+                "message": "健康目標がまだ設定されていません。目標を設定しましょう！",
             }
+        return {"status": "success", "health_goal": goal}
     except Exception as e:
         logger.error("健康目標の取得に失敗", user_id=user_id, error=str(e))
         return {
@@ -53,6 +46,57 @@ async def get_current_goal(tool_context: ToolContext) -> dict:
         }
 
 
+def _format_streak(streak: dict[str, Any]) -> dict[str, Any]:
+    """ストリークの集計結果の日付を ISO 形式に変換する。"""
+    return {
+        key: value.isoformat() if hasattr(value, "isoformat") else value
+        for key, value in streak.items()
+    }
+
+
+async def get_activity_streaks(tool_context: ToolContext) -> dict:
+    """運動記録・食事記録の連続記録日数（ストリーク）を取得する。
+
+    「何日連続？」などの質問に使う。記録のある日（JST）の連続日数を DB 側で集計するため、
+    記録を取得して自分で数える必要はない。今日まだ記録がなくても、昨日まで続いていれば
+    現在のストリークとして数える。
+
+    Returns:
+        - status: "success" | "error"
+        - today: 今日の日付（JST）
+        - exercise: 運動記録のストリーク
+        - meal: 食事記録のストリーク
+          各ストリークは current（現在の連続日数、途切れていれば 0）, current_start,
+          longest（最長の連続日数）, longest_start, longest_end, last_active_date,
+          active_days（記録のある日数）を持つ
+        - message: error 時のメッセージ
+    """
+    user_id = tool_context.user_id
+    today = get_jst_now().date()
+    try:
+        async with get_async_session() as session:
+            exercise = await ExerciseLogRepository(session).get_activity_streaks(user_id, today)
+            meal = await DietLogRepository(session).get_activity_streaks(user_id, today)
+        logger.info(
+            "ストリークを取得しました",
+            user_id=user_id,
+            exercise_current=exercise["current"],
+            meal_current=meal["current"],
+        )
+        return {
+            "status": "success",
+            "today": today.isoformat(),
+            "exercise": _format_streak(exercise),
+            "meal": _format_streak(meal),
+        }
+    except Exception as e:
+        logger.error("ストリークの取得に失敗", user_id=user_id, error=str(e))
+        return {
+            "status": "error",
+            "message": "連続記録の取得中にエラーが発生しました。",
+        }
+
+
 def finish_task(summary: str, tool_context: ToolContext) -> dict:
     """タスク完了時に呼び出します。制御をルートエージェントに戻します。
 
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 # 日本標準時（JST = UTC+9）
@@ -15,6 +15,44 @@ def get_jst_now() -> datetime:
     return datetime.now(JST)
 
 
+def to_utc(value: datetime) -> datetime:
+    """日時を timezone-aware な UTC に変換する。
+
+    タイムゾーンなしの日時は UTC とみなす（Prisma の TIMESTAMP(3) と同じ）。
+
+    Args:
+        value: 日時
+
+    Returns:
+        timezone-aware な UTC の日時
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def as_jst(value: datetime) -> datetime:
+    """タイムゾーンのない日時を JST とみなして timezone-aware にする。
+
+    ユーザーが指定する日時（習慣の開始日・終了日等）の解釈に使う。
+    タイムゾーン付きの日時はそのまま返す。
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=JST)
+    return value
+
+
+def parse_datetime_jst(value: str) -> datetime:
+    """ISO 8601 の日付・日時文字列を timezone-aware な datetime に変換する。
+
+    タイムゾーンの指定がない場合は JST とみなす（"2026-10-20" は JST の 0:00）。
+
+    Raises:
+        ValueError: 形式が不正な場合
+    """
+    return as_jst(datetime.fromisoformat(value))
+
+
 def get_today_range_jst() -> tuple[datetime, datetime]:
     """JST の「今日」の範囲を取得する。
 
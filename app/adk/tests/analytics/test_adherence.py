@@ -0,0 +1,98 @@
+"""analytics.adherence のテスト（実施率と部分達成度）"""
+
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+from agents.health_advisor.analytics.adherence import (
+    ExerciseTarget,
+    compute_habit_adherence,
+    day_credit,
+)
+
+
+def _habit(habit_id, frequency="daily", days_of_week=None, start=None, end=None, **targets):
+    return SimpleNamespace(
+        id=habit_id,
+        user_id="u",
+        habit_type="exercise",
+        title=habit_id,
+        exercise_name="スクワット",
+        frequency=frequency,
+        days_of_week=days_of_week,
+        time_of_day=None,
+        start_date=start,
+        end_date=end,
+        target_sets=targets.get("sets"),
+        target_reps=targets.get("reps"),
+        target_duration=targets.get("duration"),
+        target_distance=targets.get("distance"),
+    )
+
+
+def _totals(habit_id, day, **values):
+    return {"habit_id": habit_id, "date": day, "sessions": 1, **values}
+
+
+def test_day_credit_averages_capped_ratios():
+    targets = {"sets": 3.0, "reps": 30.0}
+    assert day_credit(targets, None) == 0.0
+    assert day_credit(targets, {"sessions": 1, "sets": 3, "reps": 15}) == 0.75
+    assert day_credit(targets, {"sessions": 1, "sets": 6, "reps": 60}) == 1.0
+    assert day_credit({}, {"sessions": 1}) == 1.0
+
+
+def test_weekday_habit_counts_only_scheduled_days():
+    # 月・木の習慣。2026-10-05 は月曜日
+    target = ExerciseTarget.from_habit(
+        _habit("h", days_of_week=["monday", "thursday"], sets=3, reps=10)
+    )
+    daily_totals = [
+        _totals("h", date(2026, 10, 5), sets=3, reps=30),
+        _totals("h", date(2026, 10, 6), sets=3, reps=30),  # 予定外の日
+        _totals("h", date(2026, 10, 8), sets=3, reps=15),
+    ]
+
+    [result] = compute_habit_adherence(
+        [target], daily_totals, date(2026, 10, 5), date(2026, 10, 18)
+    )
+
+    assert result["unit"] == "day"
+    assert result["scheduled"] == 4
+    assert result["done"] == 2
+    assert result["completed"] == 1
+    assert result["credit_rate"] == round((1.0 + 0.75) / 4, 3)
+    assert [slot["start"] for slot in result["recent"]] == [
+        "2026-10-05",
+        "2026-10-08",
+        "2026-10-12",
+        "2026-10-15",
+    ]
+
+
+def test_weekly_habit_uses_best_day_of_each_iso_week_within_window():
+    # 水曜日（JST 2026-10-07）開始、翌週の日曜日（JST 2026-10-18）終了
+    target = ExerciseTarget.from_habit(
+        _habit(
+            "w",
+            frequency="weekly",
+            start=datetime(2026, 10, 6, 15, tzinfo=timezone.utc),
+            end=datetime(2026, 10, 17, 15, tzinfo=timezone.utc),
+            duration=30,
+        )
+    )
+    daily_totals = [
+        _totals("w", date(2026, 10, 6), duration=30),  # 開始前
+        _totals("w", date(2026, 10, 9), duration=15),
+        _totals("w", date(2026, 10, 11), duration=30),
+        _totals("w", date(2026, 10, 19), duration=30),  # 終了後
+    ]
+
+    [result] = compute_habit_adherence(
+        [target], daily_totals, date(2026, 10, 1), date(2026, 10, 25)
+    )
+
+    assert result["unit"] == "week"
+    assert result["scheduled"] == 2
+    assert result["completed"] == 1
+    assert result["credit_rate"] == 0.5
+    assert [slot["start"] for slot in result["recent"]] == ["2026-10-07", "2026-10-12"]
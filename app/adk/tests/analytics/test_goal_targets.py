@@ -0,0 +1,42 @@
+"""analytics.goal_targets のテスト（健康目標の数値目標の抽出）"""
+
+from datetime import datetime
+
+from agents.health_advisor.analytics.goal_targets import GoalTargets, extract_goal_targets
+from agents.health_advisor.utils import JST
+
+NOW = datetime(2026, 10, 19, 10, 0, tzinfo=JST)
+
+
+def test_extracts_daily_targets_and_skips_per_meal_calories():
+    targets = extract_goal_targets(
+        "3ヶ月で65kgまで減量する",
+        "- 運動：週3回ジム、毎日ウォーキング\n"
+        "- 食事：間食は200kcal以内、1食600kcal、1日1,800kcal、タンパク質120g、脂質50g",
+        NOW,
+    )
+
+    assert targets.daily_calorie_target == 1800
+    assert targets.target_proteins == 120
+    assert targets.target_fats == 50
+    assert targets.target_carbohydrates is None
+    assert targets.target_weight == 65
+    assert targets.deadline == datetime(2027, 1, 19, tzinfo=JST)
+    assert targets.weekly_exercise_sessions == 3
+
+
+def test_full_width_text_and_month_deadline_in_the_past_is_next_year():
+    targets = extract_goal_targets("３月末までに６０ｋｇにする", "毎日ジョギング", NOW)
+
+    assert targets.target_weight == 60
+    assert targets.deadline == datetime(2027, 3, 31, tzinfo=JST)
+    assert targets.weekly_exercise_sessions == 7
+
+
+def test_nothing_found_is_none_and_merged_keeps_explicit_values():
+    targets = extract_goal_targets("健康になりたい", "よく寝る", NOW)
+
+    assert targets == GoalTargets()
+    assert targets.merged(daily_calorie_target=2000, target_weight=None) == GoalTargets(
+        daily_calorie_target=2000
+    )
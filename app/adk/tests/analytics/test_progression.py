@@ -0,0 +1,41 @@
+"""analytics.progression のテスト（筋力の推移）"""
+
+from datetime import datetime, timedelta
+
+from agents.health_advisor.analytics.progression import compute_progression
+
+
+def _session(day, e1rm, top_weight=60.0, volume=1000.0):
+    # タイムゾーンなしの日時は UTC（2026-10-01 15:00 UTC = JST 2026-10-02 0:00）
+    return {
+        "recorded_at": datetime(2026, 10, 1, 15, 0) + timedelta(days=day),
+        "e1rm_epley": e1rm,
+        "e1rm_brzycki": None,
+        "top_weight": top_weight,
+        "top_reps": 5.0,
+        "volume": volume,
+    }
+
+
+def test_empty_series():
+    assert compute_progression([]) == {"summary": None, "series": []}
+
+
+def test_summary_is_in_jst_and_brzycki_falls_back_to_epley():
+    sessions = [_session(7 * i, 70.0 + i, volume=1000.0 + 100 * i) for i in range(6)]
+
+    result = compute_progression(sessions, formula="brzycki", window=2, max_points=4)
+    summary = result["summary"]
+
+    assert summary["sessions"] == 6
+    assert summary["first_date"] == "2026-10-02"
+    assert summary["best_e1rm"] == 75.0
+    assert summary["best_e1rm_date"] == "2026-11-06"
+    assert summary["e1rm_change"] == 4.5  # 移動平均 70.0 → 74.5
+    assert summary["e1rm_slope_kg_per_week"] == 1.0
+    assert summary["volume_slope_kg_per_week"] == 100.0
+
+    series = result["series"]
+    assert len(series) == 4
+    assert series[-1]["date"] == "2026-11-06"
+    assert series[-1]["top_set"] == "60kg x 5"
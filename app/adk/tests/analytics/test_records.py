@@ -0,0 +1,55 @@
+"""analytics.records のテスト（自己ベストの候補計算）"""
+
+from agents.health_advisor.analytics.records import (
+    NO_WEIGHT,
+    estimate_one_rep_max,
+    extract_record_candidates,
+)
+
+
+def _by_key(candidates):
+    return {(c.metric, c.weight): c.value for c in candidates}
+
+
+def test_estimate_one_rep_max_epley():
+    assert estimate_one_rep_max(100, 1) == 100
+    assert estimate_one_rep_max(60, 10) == 80
+
+
+def test_strength_candidates_skip_warmup_sets_for_max_reps():
+    sets = [
+        {"weight": 20, "reps": 15},  # ウォームアップ
+        {"weight": 60, "reps": 8},
+        {"weight": 80, "reps": 5},
+        {"weight": 80, "reps": 6},
+        {"weight": "自重", "reps": 10},
+    ]
+
+    best = _by_key(extract_record_candidates(sets))
+
+    assert best[("max_weight", NO_WEIGHT)] == 80
+    assert best[("best_e1rm", NO_WEIGHT)] == 96
+    assert best[("max_reps", 80.0)] == 6
+    assert best[("max_reps", 60.0)] == 8  # 80kg × 0.7 = 56kg 以上
+    assert ("max_reps", 20.0) not in best
+
+
+def test_previous_max_weight_raises_the_working_weight():
+    best = _by_key(
+        extract_record_candidates([{"weight": 60, "reps": 8}], previous_max_weight=100)
+    )
+    assert ("max_reps", 60.0) not in best
+    assert best[("max_weight", NO_WEIGHT)] == 60
+
+
+def test_cardio_candidates_use_total_distance_and_fastest_pace():
+    sets = [
+        {"duration": 1500, "distance": 5},
+        {"duration": 280, "distance": 1},
+    ]
+
+    best = _by_key(extract_record_candidates(sets, total_distance=6.5))
+
+    assert best[("fastest_pace", NO_WEIGHT)] == 280
+    assert best[("longest_distance", NO_WEIGHT)] == 6.5
+    assert _by_key(extract_record_candidates(sets))[("longest_distance", NO_WEIGHT)] == 6
@@ -0,0 +1,96 @@
+"""analytics.schedule のテスト（予定の展開）"""
+
+import random
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from agents.health_advisor.analytics.schedule import (
+    EVERY_DAY_MASK,
+    HabitSchedule,
+    expand_occurrences,
+    weekday_mask,
+)
+
+
+def _habit(habit_id, frequency="daily", days_of_week=None, start=None, end=None, time_of_day=None):
+    return SimpleNamespace(
+        id=habit_id,
+        user_id="u",
+        habit_type="exercise",
+        title=habit_id,
+        frequency=frequency,
+        days_of_week=days_of_week,
+        time_of_day=time_of_day,
+        start_date=start,
+        end_date=end,
+    )
+
+
+def _brute_force(schedule: HabitSchedule, start: date, end: date) -> list[date]:
+    """日ごとに判定した予定日（週単位は ISO 週ごとの最初の有効日）"""
+    days = []
+    seen_weeks = set()
+    day = start
+    while day <= end:
+        active = (schedule.start_date is None or day >= schedule.start_date) and (
+            schedule.end_date is None or day <= schedule.end_date
+        )
+        if active:
+            if schedule.weekly:
+                week = day.isocalendar()[:2]
+                if week not in seen_weeks:
+                    seen_weeks.add(week)
+                    days.append(day)
+            elif (schedule.weekdays or EVERY_DAY_MASK) >> day.weekday() & 1:
+                days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def test_weekday_mask_accepts_abbreviations_and_falls_back_to_every_day():
+    assert weekday_mask(["Mon", "friday"]) == 0b0010001
+    assert weekday_mask(None) == EVERY_DAY_MASK
+    assert weekday_mask(["someday"]) == EVERY_DAY_MASK
+
+
+def test_naive_start_date_is_utc():
+    # JST 2026-10-20 0:00 は UTC 2026-10-19 15:00
+    schedule = HabitSchedule.from_habit(_habit("h", start=datetime(2026, 10, 19, 15, 0)))
+    assert schedule.start_date == date(2026, 10, 20)
+
+
+def test_expand_occurrences_matches_day_by_day_check():
+    rng = random.Random(0)
+    start = date(2026, 10, 1)
+    end = date(2026, 12, 31)
+    names = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+    schedules = []
+    for i in range(50):
+        days_of_week = rng.sample(names, rng.randint(0, 3)) or None
+        first = datetime(2026, 9, 20, 15, tzinfo=timezone.utc) + timedelta(days=rng.randint(0, 60))
+        last = first + timedelta(days=rng.randint(0, 90)) if rng.random() < 0.5 else None
+        schedules.append(
+            HabitSchedule.from_habit(
+                _habit(
+                    f"h{i:02d}",
+                    frequency=rng.choice(["daily", "weekly"]),
+                    days_of_week=days_of_week,
+                    start=first,
+                    end=last,
+                    time_of_day=rng.choice([None, "07:00", "19:30"]),
+                )
+            )
+        )
+
+    occurrences = list(expand_occurrences(schedules, start, end))
+
+    assert occurrences == sorted(occurrences)
+    for schedule in schedules:
+        expected = _brute_force(schedule, start, end)
+        actual = [o.date for o in occurrences if o.habit_id == schedule.habit_id]
+        assert actual == expected, schedule
+
+
+def test_expand_occurrences_empty_range():
+    schedule = HabitSchedule.from_habit(_habit("h"))
+    assert list(expand_occurrences([schedule], date(2026, 10, 2), date(2026, 10, 1))) == []
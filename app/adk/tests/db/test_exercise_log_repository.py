@@ -0,0 +1,93 @@
+"""ExerciseLogRepository のテスト（セット情報の保存形式とセット単位の検索）"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from agents.health_advisor.db.models import ExerciseLog
+from agents.health_advisor.db.repositories import ExerciseLogRepository
+
+BASE_TIME = datetime(2026, 10, 1, 10, 0, tzinfo=timezone.utc)
+
+
+async def _create_bench_logs(repo: ExerciseLogRepository, user_id: str) -> list[ExerciseLog]:
+    logs = []
+    for i, sets in enumerate(
+        [
+            [{"weight": 60, "reps": 10}, {"weight": 70, "reps": 8}],
+            [{"weight": 42.3, "reps": 12}, {"weight": 72.5, "reps": 6}],
+        ]
+    ):
+        log, _ = await repo.create_log(
+            user_id=user_id,
+            exercise_name="ベンチプレス",
+            sets=sets,
+            total_sets=len(sets),
+            recorded_at=BASE_TIME + timedelta(days=i),
+        )
+        logs.append(log)
+    return logs
+
+
+async def test_numeric_sets_round_trip_through_compact_columns(session, user_id):
+    repo = ExerciseLogRepository(session)
+    first, second = await _create_bench_logs(repo, user_id)
+    session.expunge_all()
+
+    stored = (
+        await session.execute(
+            select(ExerciseLog).where(ExerciseLog.id == second.id)
+        )
+    ).scalar_one()
+    # 配列カラムに保存し、sets は SQL の NULL
+    assert stored.sets_json is None
+    assert stored.set_weights == [42.3, 72.5]
+    assert stored.sets == [{"weight": 42.3, "reps": 12}, {"weight": 72.5, "reps": 6}]
+    assert stored.max_set_weight == 72.5
+
+    null_sets = await session.scalar(
+        select(ExerciseLog.id).where(ExerciseLog.id == first.id, ExerciseLog.sets_json.is_(None))
+    )
+    assert null_sets == first.id
+
+
+async def test_non_numeric_and_empty_sets_are_stored_as_jsonb(session, user_id):
+    repo = ExerciseLogRepository(session)
+    text_log, _ = await repo.create_log(
+        user_id=user_id,
+        exercise_name="懸垂",
+        sets=[{"reps": 10, "weight": "自重"}],
+        total_sets=1,
+        recorded_at=BASE_TIME,
+    )
+    empty_log, _ = await repo.create_log(
+        user_id=user_id,
+        exercise_name="ストレッチ",
+        sets=[],
+        total_sets=0,
+        recorded_at=BASE_TIME,
+    )
+    session.expunge_all()
+
+    assert (await repo.get_by_id(text_log.id)).sets == [{"reps": 10, "weight": "自重"}]
+    assert (await repo.get_by_id(empty_log.id)).sets_json == []
+
+
+async def test_session_series_and_set_queries_include_compact_rows(session, user_id):
+    repo = ExerciseLogRepository(session)
+    await _create_bench_logs(repo, user_id)
+
+    series = await repo.get_session_series(user_id, "ベンチプレス")
+    assert [row["top_weight"] for row in series] == [70, 72.5]
+
+    matches = await repo.get_by_set_threshold(user_id, min_weight=65)
+    assert len(matches) == 2
+    exact = await repo.get_by_set_threshold(user_id, min_weight=72.5, min_reps=6)
+    assert len(exact) == 1
+    assert await repo.get_by_set_threshold(user_id, min_weight=70, min_reps=9) == []
+
+    stats = await repo.get_set_stats(
+        user_id, BASE_TIME - timedelta(days=1), BASE_TIME + timedelta(days=2)
+    )
+    assert stats[0]["exercise_name"] == "ベンチプレス"
+    assert stats[0]["max_weight"] == 72.5
@@ -0,0 +1,29 @@
+"""ExerciseRepository のテスト（別名索引での運動種目の解決）"""
+
+from agents.health_advisor.db.models import Exercise, ExerciseAlias
+from agents.health_advisor.db.repositories import ExerciseRepository
+
+
+async def test_resolve_strips_equipment_suffix(session):
+    session.add(Exercise(id="bench", canonical_name="ベンチプレス"))
+    await session.flush()
+    session.add(ExerciseAlias(alias="benchpress", exercise_id="bench"))
+    await session.flush()
+    repo = ExerciseRepository(session)
+
+    exercise = await repo.resolve_or_create("Bench Press (Barbell)")
+
+    assert exercise.id == "bench"
+    # 括弧書き付きの名前も別名として登録され、次からは直接引ける
+    assert (await repo.get_by_name("bench press（barbell）")).id == "bench"
+
+
+async def test_resolve_creates_exercise_without_suffix(session):
+    repo = ExerciseRepository(session)
+
+    exercise = await repo.resolve_or_create("Cable Fly (Cable)", muscle_group="chest")
+
+    assert exercise.canonical_name == "Cable Fly"
+    assert exercise.muscle_group == "chest"
+    assert (await repo.get_by_name("cable fly")).id == exercise.id
+    assert (await repo.resolve_or_create("Cable Fly (Machine)")).id == exercise.id
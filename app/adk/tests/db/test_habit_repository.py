@@ -0,0 +1,50 @@
+"""HabitRepository のテスト（変更のあるカラムのみの更新）"""
+
+from agents.health_advisor.db.repositories import HabitRepository
+from agents.health_advisor.db.schemas import HabitUpdate
+from agents.health_advisor.utils import parse_datetime_jst
+
+
+async def test_update_habit_skips_unchanged_dates(session, user_id):
+    repo = HabitRepository(session)
+    habit = await repo.create_habit(
+        user_id=user_id,
+        habit_type="exercise",
+        title="朝のジョギング",
+        frequency="daily",
+        start_date=parse_datetime_jst("2026-10-20"),
+        end_date=parse_datetime_jst("2026-12-31"),
+    )
+    await session.commit()
+    session.expunge_all()
+    updated_at = habit.updated_at
+
+    # 作成時と同じ日付を再送しても書き込まない
+    same, diff = await repo.update_habit(
+        habit.id,
+        HabitUpdate(start_date="2026-10-20", end_date="2026-12-31"),
+        user_id=user_id,
+    )
+    assert diff == {}
+    assert same.updated_at == updated_at
+
+    changed, diff = await repo.update_habit(
+        habit.id,
+        HabitUpdate(start_date="2026-10-21", title="朝のジョギング"),
+        user_id=user_id,
+    )
+    assert set(diff) == {"start_date"}
+    assert changed.start_date.date().isoformat() == "2026-10-20"  # JST 0:00 = UTC 前日 15:00
+
+
+async def test_update_habit_is_scoped_to_the_user(session, user_id):
+    repo = HabitRepository(session)
+    habit = await repo.create_habit(
+        user_id=user_id, habit_type="meal", title="夕食は腹八分目", frequency="daily"
+    )
+
+    missing, diff = await repo.update_habit(
+        habit.id, HabitUpdate(title="別のユーザー"), user_id="someone-else"
+    )
+    assert missing is None
+    assert diff == {}
@@ -0,0 +1,125 @@
+"""PersonalRecordRepository のテスト（自己ベストの upsert）"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from agents.health_advisor.db.models import ExerciseLog, PersonalRecord
+from agents.health_advisor.db.repositories import (
+    ExerciseLogRepository,
+    PersonalRecordRepository,
+)
+
+BASE_TIME = datetime(2026, 10, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def _records(new_records: list[dict]) -> dict[tuple[str, float], dict]:
+    return {(r["metric"], r["weight"]): r for r in new_records}
+
+
+async def test_create_log_records_and_improves_personal_records(session, user_id):
+    repo = ExerciseLogRepository(session)
+
+    _, first = await repo.create_log(
+        user_id=user_id,
+        exercise_name="ベンチプレス",
+        sets=[{"weight": 60, "reps": 10}, {"weight": 100, "reps": 3}],
+        total_sets=2,
+        recorded_at=BASE_TIME,
+    )
+    first = _records(first)
+    assert first[("max_weight", 0.0)]["value"] == 100
+    assert first[("max_weight", 0.0)]["previous_value"] is None
+    # 最大重量の 7 割未満（60kg）は max_reps にしない
+    assert ("max_reps", 100.0) in first
+    assert ("max_reps", 60.0) not in first
+
+    # 軽い日は更新しない
+    _, lighter = await repo.create_log(
+        user_id=user_id,
+        exercise_name="ベンチプレス",
+        sets=[{"weight": 90, "reps": 3}],
+        total_sets=1,
+        recorded_at=BASE_TIME + timedelta(days=1),
+    )
+    assert ("max_weight", 0.0) not in _records(lighter)
+
+    _, heavier = await repo.create_log(
+        user_id=user_id,
+        exercise_name="ベンチプレス",
+        sets=[{"weight": 105, "reps": 1}],
+        total_sets=1,
+        recorded_at=BASE_TIME + timedelta(days=2),
+    )
+    heavier = _records(heavier)
+    assert heavier[("max_weight", 0.0)]["value"] == 105
+    assert heavier[("max_weight", 0.0)]["previous_value"] == 100
+
+
+async def test_fastest_pace_keeps_the_lower_value(session, user_id):
+    repo = ExerciseLogRepository(session)
+
+    await repo.create_log(
+        user_id=user_id,
+        exercise_name="ランニング",
+        sets=[{"duration": 1800, "distance": 5.0}],
+        total_sets=1,
+        recorded_at=BASE_TIME,
+    )
+    _, slower = await repo.create_log(
+        user_id=user_id,
+        exercise_name="ランニング",
+        sets=[{"duration": 2000, "distance": 5.0}],
+        total_sets=1,
+        recorded_at=BASE_TIME + timedelta(days=1),
+    )
+    assert ("fastest_pace", 0.0) not in _records(slower)
+
+    _, faster = await repo.create_log(
+        user_id=user_id,
+        exercise_name="ランニング",
+        sets=[{"duration": 1500, "distance": 5.0}],
+        total_sets=1,
+        recorded_at=BASE_TIME + timedelta(days=2),
+    )
+    pace = _records(faster)[("fastest_pace", 0.0)]
+    assert pace["value"] == 300.0
+    assert pace["previous_value"] == 360.0
+
+
+async def test_create_logs_upserts_in_bulk_and_skips_reimports(session, user_id):
+    repo = ExerciseLogRepository(session)
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+
+    def build_logs() -> list[ExerciseLog]:
+        logs = []
+        for i, log_id in enumerate(ids):
+            log = ExerciseLog(
+                id=log_id,
+                user_id=user_id,
+                exercise_name="スクワット",
+                total_sets=1,
+                recorded_at=BASE_TIME + timedelta(days=i),
+            )
+            log.sets = [{"weight": 80 + 10 * i, "reps": 5}]
+            logs.append(log)
+        return logs
+
+    created = await repo.create_logs(build_logs())
+    assert len(created) == 3
+
+    records = await PersonalRecordRepository(session).get_by_user_id(user_id, "スクワット")
+    best = {(r.metric, r.weight): r.value for r in records}
+    assert best[("max_weight", 0.0)] == 100
+
+    # 同じ ID の再インポートはスキップする
+    assert await repo.create_logs(build_logs()) == []
+    count = len(
+        (
+            await session.execute(
+                select(PersonalRecord).where(PersonalRecord.user_id == user_id)
+            )
+        ).all()
+    )
+    assert count == len(records)
@@ -0,0 +1,73 @@
+"""calorie_context のテスト（目標カロリーの選び方と残りカロリー）"""
+
+from contextlib import asynccontextmanager
+
+import pytest
+
+from agents.health_advisor.db.repositories import (
+    DietLogRepository,
+    GoalRepository,
+    HabitRepository,
+)
+from agents.health_advisor.services import calorie_context
+from agents.health_advisor.utils import get_jst_now
+
+
+@pytest.fixture(autouse=True)
+def use_test_session(session, monkeypatch):
+    @asynccontextmanager
+    async def get_async_session():
+        yield session
+
+    monkeypatch.setattr(calorie_context, "get_async_session", get_async_session)
+    calorie_context._cache.clear()
+
+
+async def _record_lunch(session, user_id, calories):
+    await DietLogRepository(session).create_log(
+        user_id=user_id,
+        name="ラーメン",
+        meal_type="lunch",
+        calories=calories,
+        proteins=20,
+        fats=30,
+        carbohydrates=90,
+        estimation_source="text",
+        recorded_at=get_jst_now(),
+    )
+
+
+async def test_goal_target_wins_over_partial_habit_sum(session, user_id):
+    await GoalRepository(session).create_goal(
+        user_id, "減量", "夕食を軽く", {"daily_calorie_target": 1800}
+    )
+    # 夕食だけに目標がある食事習慣
+    await HabitRepository(session).create_habit(
+        user_id=user_id,
+        habit_type="meal",
+        title="夕食は 600kcal",
+        frequency="daily",
+        target_calories=600,
+    )
+    await _record_lunch(session, user_id, 900)
+
+    context = await calorie_context.get_calorie_context(user_id)
+
+    assert context["daily_calorie_target"] == 1800
+    assert context["remaining_calories"] == 900
+
+
+async def test_habit_sum_is_used_without_goal_and_remaining_is_clamped(session, user_id):
+    await HabitRepository(session).create_habit(
+        user_id=user_id,
+        habit_type="meal",
+        title="夕食は 600kcal",
+        frequency="daily",
+        target_calories=600,
+    )
+    await _record_lunch(session, user_id, 900)
+
+    context = await calorie_context.get_calorie_context(user_id)
+
+    assert context["daily_calorie_target"] == 600
+    assert context["remaining_calories"] == 0
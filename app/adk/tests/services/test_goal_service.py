@@ -0,0 +1,23 @@
+"""goal_service のテスト（目標の辞書化）"""
+
+from datetime import datetime
+
+from agents.health_advisor.db.models import Goal
+from agents.health_advisor.services.goal_service import _to_dict
+
+
+def test_to_dict_returns_naive_db_datetimes_in_jst():
+    # JST 2026-12-31 0:00 の期限は DB に UTC 2026-12-30 15:00 として保存される
+    goal = Goal(
+        id="g",
+        user_id="u",
+        details="減量",
+        habits="毎日歩く",
+        deadline=datetime(2026, 12, 30, 15, 0),
+        created_at=datetime(2026, 10, 19, 1, 30),
+    )
+
+    result = _to_dict(goal)
+
+    assert result["deadline"] == "2026-12-31T00:00:00+09:00"
+    assert result["created_at"] == "2026-10-19T10:30:00+09:00"
@@ -0,0 +1,40 @@
+"""router のテスト（発話の事前ルーティング）"""
+
+import pytest
+
+from agents.health_advisor.router import (
+    EXERCISE_MANAGER_AGENT,
+    GOAL_SETTING_AGENT,
+    MEAL_RECORD_AGENT,
+    classify_message,
+)
+
+
+@pytest.mark.parametrize(
+    ("text", "mime_types", "agent"),
+    [
+        ("ベンチ 50kg×10", [], EXERCISE_MANAGER_AGENT),
+        ("スクワット１０回×３セット", [], EXERCISE_MANAGER_AGENT),
+        ("5km走った", [], EXERCISE_MANAGER_AGENT),
+        ("ラーメン食べた", [], MEAL_RECORD_AGENT),
+        ("", ["image/jpeg"], MEAL_RECORD_AGENT),
+        ("目標を設定したい", [], GOAL_SETTING_AGENT),
+    ],
+)
+def test_obvious_messages_are_routed(text, mime_types, agent):
+    decision = classify_message(text, mime_types)
+    assert decision is not None
+    assert decision.agent_name == agent
+
+
+@pytest.mark.parametrize(
+    ("text", "mime_types"),
+    [
+        ("こんにちは、ラーメン食べた", []),  # 挨拶はルートが答える
+        ("今日はどうしよう", []),
+        ("カロリー", []),  # 確信度が閾値未満
+        ("ジムの後にプロテイン飲んだ", []),  # 運動と食事が拮抗
+    ],
+)
+def test_ambiguous_messages_are_left_to_the_llm(text, mime_types):
+    assert classify_message(text, mime_types) is None
@@ -0,0 +1,2 @@
+-- CreateIndex: 「いつもの食事」検索（料理名での集計）用
+CREATE INDEX "diet_logs_user_id_name_idx" ON "diet_logs"("user_id", "name");
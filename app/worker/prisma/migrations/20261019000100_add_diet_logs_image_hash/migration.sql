@@ -0,0 +1,5 @@
+-- AlterTable: 食事画像のコンテンツハッシュ（同一画像の再送時に分析結果を再利用する）
+ALTER TABLE "diet_logs" ADD COLUMN "image_hash" TEXT;
+
+-- CreateIndex
+CREATE INDEX "diet_logs_user_id_image_hash_idx" ON "diet_logs"("user_id", "image_hash");
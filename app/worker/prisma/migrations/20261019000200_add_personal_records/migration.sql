@@ -0,0 +1,93 @@
+-- CreateTable: 運動種目ごとの自己ベスト（ADK の ExerciseLogRepository.create_log で更新する）
+CREATE TABLE "personal_records" (
+    "id" TEXT NOT NULL,
+    "user_id" TEXT NOT NULL,
+    "exercise_name" TEXT NOT NULL,
+    "metric" TEXT NOT NULL,
+    "weight" DOUBLE PRECISION NOT NULL DEFAULT 0,
+    "value" DOUBLE PRECISION NOT NULL,
+    "exercise_log_id" TEXT,
+    "achieved_at" TIMESTAMP(3) NOT NULL,
+    "created_at" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "personal_records_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "personal_records_user_id_exercise_name_metric_weight_key" ON "personal_records"("user_id", "exercise_name", "metric", "weight");
+
+-- CreateIndex
+CREATE INDEX "personal_records_user_id_achieved_at_idx" ON "personal_records"("user_id", "achieved_at" DESC);
+
+-- AddForeignKey
+ALTER TABLE "personal_records" ADD CONSTRAINT "personal_records_user_id_fkey" FOREIGN KEY ("user_id") REFERENCES "user_sessions"("user_id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "personal_records" ADD CONSTRAINT "personal_records_exercise_log_id_fkey" FOREIGN KEY ("exercise_log_id") REFERENCES "exercise_logs"("id") ON DELETE SET NULL ON UPDATE CASCADE;
+
+-- Backfill: 既存の運動ログから自己ベストを作成する
+-- （analytics/records.py の extract_record_candidates と同じ計算。数値でない値は無視する。
+--   max_reps はユーザー・運動ごとの最大重量の 0.7 倍（WORKING_WEIGHT_RATIO）以上のセットのみ）
+WITH parsed AS (
+    SELECT
+        l."id" AS log_id,
+        l."user_id",
+        l."exercise_name",
+        l."recorded_at",
+        CASE WHEN s->>'weight' ~ '^[0-9]+(\.[0-9]+)?$' THEN (s->>'weight')::DOUBLE PRECISION END AS weight,
+        CASE WHEN s->>'reps' ~ '^[0-9]+(\.[0-9]+)?$' THEN (s->>'reps')::DOUBLE PRECISION END AS reps,
+        CASE WHEN s->>'duration' ~ '^[0-9]+(\.[0-9]+)?$' THEN (s->>'duration')::DOUBLE PRECISION END AS duration,
+        CASE WHEN s->>'distance' ~ '^[0-9]+(\.[0-9]+)?$' THEN (s->>'distance')::DOUBLE PRECISION END AS distance
+    FROM "exercise_logs" l
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE WHEN jsonb_typeof(l."sets") = 'array' THEN l."sets" ELSE '[]'::jsonb END
+    ) AS s
+),
+sets AS (
+    SELECT
+        parsed.*,
+        MAX(CASE WHEN weight > 0 THEN weight END)
+            OVER (PARTITION BY "user_id", "exercise_name") AS max_weight
+    FROM parsed
+),
+candidates AS (
+    SELECT log_id, "user_id", "exercise_name", "recorded_at",
+           'max_weight' AS metric, 0::DOUBLE PRECISION AS weight, weight AS value
+    FROM sets WHERE weight > 0
+    UNION ALL
+    SELECT log_id, "user_id", "exercise_name", "recorded_at",
+           'max_reps', ROUND(weight::NUMERIC, 2)::DOUBLE PRECISION, reps
+    FROM sets WHERE weight > 0 AND reps > 0 AND weight >= max_weight * 0.7
+    UNION ALL
+    SELECT log_id, "user_id", "exercise_name", "recorded_at",
+           'best_e1rm', 0,
+           ROUND((CASE WHEN reps <= 1 THEN weight ELSE weight * (1 + reps / 30) END)::NUMERIC, 2)::DOUBLE PRECISION
+    FROM sets WHERE weight > 0 AND reps > 0
+    UNION ALL
+    SELECT log_id, "user_id", "exercise_name", "recorded_at",
+           'fastest_pace', 0, ROUND((duration / distance)::NUMERIC, 1)::DOUBLE PRECISION
+    FROM sets WHERE duration > 0 AND distance > 0
+    UNION ALL
+    SELECT l."id", l."user_id", l."exercise_name", l."recorded_at",
+           'longest_distance', 0,
+           COALESCE(NULLIF(l."total_distance", 0), d.distance)
+    FROM "exercise_logs" l
+    LEFT JOIN (
+        SELECT log_id, SUM(distance) AS distance FROM sets WHERE distance > 0 GROUP BY log_id
+    ) d ON d.log_id = l."id"
+    WHERE COALESCE(NULLIF(l."total_distance", 0), d.distance) > 0
+)
+INSERT INTO "personal_records" (
+    "id", "user_id", "exercise_name", "metric", "weight", "value",
+    "exercise_log_id", "achieved_at", "updated_at"
+)
+SELECT DISTINCT ON ("user_id", "exercise_name", metric, weight)
+    gen_random_uuid()::TEXT, "user_id", "exercise_name", metric, weight, value,
+    log_id, "recorded_at", CURRENT_TIMESTAMP
+FROM candidates
+ORDER BY
+    "user_id", "exercise_name", metric, weight,
+    CASE WHEN metric = 'fastest_pace' THEN value END ASC,
+    CASE WHEN metric <> 'fastest_pace' THEN value END DESC,
+    "recorded_at" ASC;
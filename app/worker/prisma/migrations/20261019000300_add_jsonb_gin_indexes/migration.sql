@@ -0,0 +1,5 @@
+-- exercise_logs.sets / habits.days_of_week は Prisma の Json 型のため、既に JSONB で作成されている。
+-- ADK（SQLAlchemy）側のモデルを JSONB に揃え、セット単位の検索用に GIN インデックスを追加する。
+
+-- CreateIndex: sets @? '$[*] ? (@.weight >= 100)' / sets @> '[{"weight": 100}]' 用
+CREATE INDEX "exercise_logs_sets_idx" ON "exercise_logs" USING GIN ("sets" jsonb_path_ops);
@@ -0,0 +1,54 @@
+-- AlterTable: セット情報のコンパクト形式（指標ごとの配列）
+-- 数値のみのセットは配列カラムに保存し、sets（JSONB）は NULL にする（ADK の ExerciseLog モデルで変換する）
+ALTER TABLE "exercise_logs" ALTER COLUMN "sets" DROP NOT NULL,
+ADD COLUMN "set_reps" INTEGER[],
+ADD COLUMN "set_weights" DOUBLE PRECISION[],
+ADD COLUMN "set_durations" INTEGER[],
+ADD COLUMN "set_distances" DOUBLE PRECISION[];
+
+-- AddCheck: どちらかの形式でセット情報を持つ
+ALTER TABLE "exercise_logs" ADD CONSTRAINT "exercise_logs_sets_present_check"
+CHECK ("sets" IS NOT NULL OR COALESCE("set_reps", "set_weights", "set_durations", "set_distances") IS NOT NULL);
+
+-- Backfill: 既存の行のうち、配列カラムで表せるもの（全セットにない指標は配列ごと NULL）（空でない配列で、各セットが
+-- reps / weight / duration / distance の数値のみを持ち、reps / duration が整数）を変換する
+WITH convertible AS (
+    SELECT l."id"
+    FROM "exercise_logs" l
+    WHERE jsonb_typeof(l."sets") = 'array'
+      AND jsonb_array_length(l."sets") > 0
+      AND NOT EXISTS (
+          SELECT 1
+          FROM jsonb_array_elements(l."sets") AS e
+          WHERE jsonb_typeof(e) <> 'object' OR e = '{}'::jsonb
+      )
+      AND NOT EXISTS (
+          SELECT 1
+          FROM jsonb_array_elements(l."sets") AS e
+          CROSS JOIN LATERAL jsonb_each(e) AS kv
+          WHERE kv.key NOT IN ('reps', 'weight', 'duration', 'distance')
+             OR jsonb_typeof(kv.value) <> 'number'
+             OR (kv.key IN ('reps', 'duration') AND (kv.value::TEXT)::NUMERIC % 1 <> 0)
+      )
+),
+columns AS (
+    SELECT
+        l."id",
+        array_agg((e->>'reps')::NUMERIC::INTEGER ORDER BY i) AS reps,
+        array_agg((e->>'weight')::DOUBLE PRECISION ORDER BY i) AS weights,
+        array_agg((e->>'duration')::NUMERIC::INTEGER ORDER BY i) AS durations,
+        array_agg((e->>'distance')::DOUBLE PRECISION ORDER BY i) AS distances
+    FROM "exercise_logs" l
+    JOIN convertible c ON c."id" = l."id"
+    CROSS JOIN LATERAL jsonb_array_elements(l."sets") WITH ORDINALITY AS t(e, i)
+    GROUP BY l."id"
+)
+UPDATE "exercise_logs" l
+SET
+    "sets" = NULL,
+    "set_reps" = CASE WHEN EXISTS (SELECT 1 FROM unnest(c.reps) v WHERE v IS NOT NULL) THEN c.reps END,
+    "set_weights" = CASE WHEN EXISTS (SELECT 1 FROM unnest(c.weights) v WHERE v IS NOT NULL) THEN c.weights END,
+    "set_durations" = CASE WHEN EXISTS (SELECT 1 FROM unnest(c.durations) v WHERE v IS NOT NULL) THEN c.durations END,
+    "set_distances" = CASE WHEN EXISTS (SELECT 1 FROM unnest(c.distances) v WHERE v IS NOT NULL) THEN c.distances END
+FROM columns c
+WHERE c."id" = l."id";
@@ -0,0 +1,190 @@
+-- CreateTable: 運動種目カタログ（ADK の ExerciseRepository.resolve_or_create で追加する）
+CREATE TABLE "exercises" (
+    "id" TEXT NOT NULL,
+    "canonical_name" TEXT NOT NULL,
+    "category" TEXT,
+    "muscle_group" TEXT,
+    "created_at" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "exercises_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable: 運動名の別名索引（alias は ADK の normalize_exercise_name で正規化した文字列）
+CREATE TABLE "exercise_aliases" (
+    "alias" TEXT NOT NULL,
+    "exercise_id" TEXT NOT NULL,
+
+    CONSTRAINT "exercise_aliases_pkey" PRIMARY KEY ("alias")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "exercises_canonical_name_key" ON "exercises"("canonical_name");
+
+-- CreateIndex
+CREATE INDEX "exercise_aliases_exercise_id_idx" ON "exercise_aliases"("exercise_id");
+
+-- AddForeignKey
+ALTER TABLE "exercise_aliases" ADD CONSTRAINT "exercise_aliases_exercise_id_fkey" FOREIGN KEY ("exercise_id") REFERENCES "exercises"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AlterTable
+ALTER TABLE "exercise_logs" ADD COLUMN "canonical_exercise_id" TEXT;
+
+-- CreateIndex
+CREATE INDEX "exercise_logs_user_id_canonical_exercise_id_recorded_at_idx" ON "exercise_logs"("user_id", "canonical_exercise_id", "recorded_at" DESC);
+
+-- AddForeignKey
+ALTER TABLE "exercise_logs" ADD CONSTRAINT "exercise_logs_canonical_exercise_id_fkey" FOREIGN KEY ("canonical_exercise_id") REFERENCES "exercises"("id") ON DELETE SET NULL ON UPDATE CASCADE;
+
+-- Seed: よく使う運動種目と表記ゆれ（ローマ字表記は別名として登録する）
+INSERT INTO "exercises" ("id", "canonical_name", "category", "muscle_group")
+SELECT gen_random_uuid()::TEXT, name, category, muscle_group
+FROM (VALUES
+    ('ベンチプレス', 'strength', 'chest'),
+    ('スクワット', 'strength', 'legs'),
+    ('デッドリフト', 'strength', 'back'),
+    ('ショルダープレス', 'strength', 'shoulders'),
+    ('ラットプルダウン', 'strength', 'back'),
+    ('レッグプレス', 'strength', 'legs'),
+    ('懸垂', 'strength', 'back'),
+    ('腕立て伏せ', 'strength', 'chest'),
+    ('腹筋', 'strength', 'core'),
+    ('プランク', 'strength', 'core'),
+    ('ランニング', 'cardio', 'full_body'),
+    ('ウォーキング', 'cardio', 'full_body'),
+    ('サイクリング', 'cardio', 'legs'),
+    ('水泳', 'cardio', 'full_body'),
+    ('ヨガ', 'flexibility', 'full_body'),
+    ('ストレッチ', 'flexibility', 'full_body')
+) AS seed(name, category, muscle_group);
+
+INSERT INTO "exercise_aliases" ("alias", "exercise_id")
+SELECT seed.alias, e."id"
+FROM (VALUES
+    ('べんちぷれす', 'ベンチプレス'),
+    ('べんち', 'ベンチプレス'),
+    ('benchpress', 'ベンチプレス'),
+    ('bench', 'ベンチプレス'),
+    ('すくわっと', 'スクワット'),
+    ('squat', 'スクワット'),
+    ('ばっくすくわっと', 'スクワット'),
+    ('backsquat', 'スクワット'),
+    ('でっどりふと', 'デッドリフト'),
+    ('でっど', 'デッドリフト'),
+    ('deadlift', 'デッドリフト'),
+    ('しょるだーぷれす', 'ショルダープレス'),
+    ('shoulderpress', 'ショルダープレス'),
+    ('overheadpress', 'ショルダープレス'),
+    ('ohp', 'ショルダープレス'),
+    ('らっとぷるだうん', 'ラットプルダウン'),
+    ('らっとぷる', 'ラットプルダウン'),
+    ('latpulldown', 'ラットプルダウン'),
+    ('れっぐぷれす', 'レッグプレス'),
+    ('legpress', 'レッグプレス'),
+    ('懸垂', '懸垂'),
+    ('けんすい', '懸垂'),
+    ('ちんにんぐ', '懸垂'),
+    ('pullup', '懸垂'),
+    ('chinup', '懸垂'),
+    ('腕立て伏せ', '腕立て伏せ'),
+    ('腕立て', '腕立て伏せ'),
+    ('ぷっしゅあっぷ', '腕立て伏せ'),
+    ('pushup', '腕立て伏せ'),
+    ('腹筋', '腹筋'),
+    ('くらんち', '腹筋'),
+    ('crunch', '腹筋'),
+    ('しっとあっぷ', '腹筋'),
+    ('situp', '腹筋'),
+    ('ぷらんく', 'プランク'),
+    ('plank', 'プランク'),
+    ('らんにんぐ', 'ランニング'),
+    ('らん', 'ランニング'),
+    ('running', 'ランニング'),
+    ('run', 'ランニング'),
+    ('じょぎんぐ', 'ランニング'),
+    ('jogging', 'ランニング'),
+    ('うぉーきんぐ', 'ウォーキング'),
+    ('walking', 'ウォーキング'),
+    ('walk', 'ウォーキング'),
+    ('散歩', 'ウォーキング'),
+    ('さいくりんぐ', 'サイクリング'),
+    ('ばいく', 'サイクリング'),
+    ('えあろばいく', 'サイクリング'),
+    ('cycling', 'サイクリング'),
+    ('bike', 'サイクリング'),
+    ('水泳', '水泳'),
+    ('すいみんぐ', '水泳'),
+    ('swimming', '水泳'),
+    ('swim', '水泳'),
+    ('よが', 'ヨガ'),
+    ('yoga', 'ヨガ'),
+    ('すとれっち', 'ストレッチ'),
+    ('stretch', 'ストレッチ'),
+    ('stretching', 'ストレッチ')
+) AS seed(alias, canonical_name)
+JOIN "exercises" e ON e."canonical_name" = seed.canonical_name;
+
+-- Backfill: 既存の運動ログの運動名をカタログに登録する
+-- （正規化は ADK の normalize_exercise_name と同じ: NFKC、小文字化、カタカナ→ひらがな、区切り文字の除去）
+CREATE TEMPORARY TABLE "exercise_log_names" AS
+SELECT
+    "exercise_name",
+    regexp_replace(translate(lower(normalize("exercise_name", NFKC)), 'ァアィイゥウェエォオカガキギクグケゲコゴサザシジスズセゼソゾタダチヂッツヅテデトドナニヌネノハバパヒビピフブプヘベペホボポマミムメモャヤュユョヨラリルレロヮワヰヱヲンヴヵヶ', 'ぁあぃいぅうぇえぉおかがきぎくぐけげこごさざしじすずせぜそぞただちぢっつづてでとどなにぬねのはばぱひびぴふぶぷへべぺほぼぽまみむめもゃやゅゆょよらりるれろゎわゐゑをんゔゕゖ'), '[[:space:]・/._-]+', '', 'g') AS alias,
+    MAX("category") AS category,
+    MAX("muscle_group") AS muscle_group,
+    COUNT(*) AS sessions
+FROM "exercise_logs"
+GROUP BY "exercise_name";
+
+-- 未登録の運動名は、同じ正規化結果の中で最も記録の多い表記を正規名にする
+INSERT INTO "exercises" ("id", "canonical_name", "category", "muscle_group")
+SELECT DISTINCT ON (n.alias)
+    gen_random_uuid()::TEXT, btrim(n."exercise_name"), n.category, n.muscle_group
+FROM "exercise_log_names" n
+WHERE n.alias <> ''
+  AND NOT EXISTS (SELECT 1 FROM "exercise_aliases" a WHERE a."alias" = n.alias)
+ORDER BY n.alias, n.sessions DESC, n."exercise_name"
+ON CONFLICT ("canonical_name") DO NOTHING;
+
+INSERT INTO "exercise_aliases" ("alias", "exercise_id")
+SELECT DISTINCT ON (n.alias) n.alias, e."id"
+FROM "exercise_log_names" n
+JOIN "exercises" e ON e."canonical_name" = btrim(n."exercise_name")
+WHERE n.alias <> ''
+ORDER BY n.alias, n.sessions DESC
+ON CONFLICT ("alias") DO NOTHING;
+
+UPDATE "exercise_logs" l
+SET "canonical_exercise_id" = a."exercise_id"
+FROM "exercise_log_names" n
+JOIN "exercise_aliases" a ON a."alias" = n.alias
+WHERE l."exercise_name" = n."exercise_name";
+
+DROP TABLE "exercise_log_names";
+
+-- Backfill: 自己ベストを運動種目の正規名にまとめる
+-- （同じ正規名・指標・重量の記録が複数ある場合は最も良い記録だけを残す）
+WITH resolved AS (
+    SELECT
+        pr."id",
+        e."canonical_name",
+        ROW_NUMBER() OVER (
+            PARTITION BY pr."user_id", e."canonical_name", pr."metric", pr."weight"
+            ORDER BY
+                CASE WHEN pr."metric" = 'fastest_pace' THEN pr."value" END ASC,
+                CASE WHEN pr."metric" <> 'fastest_pace' THEN pr."value" END DESC,
+                pr."achieved_at" ASC
+        ) AS rank
+    FROM "personal_records" pr
+    JOIN "exercise_aliases" a ON a."alias" = regexp_replace(translate(lower(normalize(pr."exercise_name", NFKC)), 'ァアィイゥウェエォオカガキギクグケゲコゴサザシジスズセゼソゾタダチヂッツヅテデトドナニヌネノハバパヒビピフブプヘベペホボポマミムメモャヤュユョヨラリルレロヮワヰヱヲンヴヵヶ', 'ぁあぃいぅうぇえぉおかがきぎくぐけげこごさざしじすずせぜそぞただちぢっつづてでとどなにぬねのはばぱひびぴふぶぷへべぺほぼぽまみむめもゃやゅゆょよらりるれろゎわゐゑをんゔゕゖ'), '[[:space:]・/._-]+', '', 'g')
+    JOIN "exercises" e ON e."id" = a."exercise_id"
+)
+DELETE FROM "personal_records" pr
+USING resolved r
+WHERE pr."id" = r."id" AND r.rank > 1;
+
+UPDATE "personal_records" pr
+SET "exercise_name" = e."canonical_name", "updated_at" = CURRENT_TIMESTAMP
+FROM "exercise_aliases" a
+JOIN "exercises" e ON e."id" = a."exercise_id"
+WHERE a."alias" = regexp_replace(translate(lower(normalize(pr."exercise_name", NFKC)), 'ァアィイゥウェエォオカガキギクグケゲコゴサザシジスズセゼソゾタダチヂッツヅテデトドナニヌネノハバパヒビピフブプヘベペホボポマミムメモャヤュユョヨラリルレロヮワヰヱヲンヴヵヶ', 'ぁあぃいぅうぇえぉおかがきぎくぐけげこごさざしじすずせぜそぞただちぢっつづてでとどなにぬねのはばぱひびぴふぶぷへべぺほぼぽまみむめもゃやゅゆょよらりるれろゎわゐゑをんゔゕゖ'), '[[:space:]・/._-]+', '', 'g')
+  AND pr."exercise_name" <> e."canonical_name";
@@ -0,0 +1,41 @@
+-- CreateTable: 週ごと・筋肉群ごとのトレーニング量（ADK の ExerciseLogRepository.create_log で加算する）
+CREATE TABLE "weekly_muscle_volumes" (
+    "id" TEXT NOT NULL,
+    "user_id" TEXT NOT NULL,
+    "iso_week" TEXT NOT NULL,
+    "muscle_group" TEXT NOT NULL,
+    "sessions" INTEGER NOT NULL DEFAULT 0,
+    "sets" INTEGER NOT NULL DEFAULT 0,
+    "reps" INTEGER NOT NULL DEFAULT 0,
+    "volume" DOUBLE PRECISION NOT NULL DEFAULT 0,
+    "duration" INTEGER NOT NULL DEFAULT 0,
+    "updated_at" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "weekly_muscle_volumes_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "weekly_muscle_volumes_user_id_iso_week_muscle_group_key" ON "weekly_muscle_volumes"("user_id", "iso_week", "muscle_group");
+
+-- AddForeignKey
+ALTER TABLE "weekly_muscle_volumes" ADD CONSTRAINT "weekly_muscle_volumes_user_id_fkey" FOREIGN KEY ("user_id") REFERENCES "user_sessions"("user_id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- Backfill: 既存の運動ログを集計する
+-- （ISO 週は ADK の iso_week_key と同じく JST で計算し、筋肉群が未設定なら運動種目カタログの値を使う）
+INSERT INTO "weekly_muscle_volumes" (
+    "id", "user_id", "iso_week", "muscle_group",
+    "sessions", "sets", "reps", "volume", "duration"
+)
+SELECT
+    gen_random_uuid()::TEXT,
+    l."user_id",
+    to_char(timezone('Asia/Tokyo', timezone('UTC', l."recorded_at")), 'IYYY-"W"IW'),
+    COALESCE(l."muscle_group", e."muscle_group", 'unknown'),
+    COUNT(*),
+    COALESCE(SUM(l."total_sets"), 0),
+    COALESCE(SUM(l."total_reps"), 0),
+    COALESCE(SUM(l."total_volume"), 0),
+    COALESCE(SUM(l."total_duration"), 0)
+FROM "exercise_logs" l
+LEFT JOIN "exercises" e ON e."id" = l."canonical_exercise_id"
+GROUP BY 2, 3, 4;
@@ -0,0 +1,16 @@
+-- AlterTable: 健康目標の数値目標（ADK の set_user_health_goal で details / habits から取り出して保存する）
+ALTER TABLE "goals" ADD COLUMN "daily_calorie_target" INTEGER,
+ADD COLUMN "target_proteins" INTEGER,
+ADD COLUMN "target_fats" INTEGER,
+ADD COLUMN "target_carbohydrates" INTEGER,
+ADD COLUMN "target_weight" DOUBLE PRECISION,
+ADD COLUMN "deadline" TIMESTAMP(3),
+ADD COLUMN "weekly_exercise_sessions" INTEGER;
+
+-- Backfill: 既存の目標は目標カロリーのみ取り出す（行動計画の「1800kcal」等。その他の項目は目標の再設定時に保存される）
+UPDATE "goals"
+SET "daily_calorie_target" = replace(
+    substring(normalize("habits", NFKC) from '(\d{1,2},?\d{3})\s*(?:kcal|キロカロリー|カロリー)'),
+    ',', ''
+)::INTEGER
+WHERE normalize("habits", NFKC) ~ '\d{1,2},?\d{3}\s*(kcal|キロカロリー|カロリー)';
@@ -0,0 +1,2 @@
+-- CreateIndex: 目標の履歴のキーセットページネーション（ADK の GoalRepository.get_history）
+CREATE INDEX "goals_user_id_created_at_id_idx" ON "goals"("user_id", "created_at" DESC, "id" DESC);
@@ -0,0 +1,20 @@
+-- AlterTable: セットの最大重量（ADK の ExerciseLog モデルが sets の書き込み時に計算する）
+ALTER TABLE "exercise_logs" ADD COLUMN "max_set_weight" DOUBLE PRECISION;
+
+-- Backfill: コンパクト形式は set_weights、JSONB 形式は数値の weight の最大値
+UPDATE "exercise_logs" l
+SET "max_set_weight" = COALESCE(
+    (SELECT max(w) FROM unnest(l."set_weights") AS w),
+    (
+        SELECT max((v #>> '{}')::DOUBLE PRECISION)
+        FROM jsonb_path_query(l."sets", '$[*].weight ? (@.type() == "number")') AS v
+    )
+)
+WHERE l."set_weights" IS NOT NULL OR l."sets" IS NOT NULL;
+
+-- CreateIndex: 重量の閾値検索（max_set_weight >= 100 で候補を絞り込む）
+CREATE INDEX "exercise_logs_user_id_max_set_weight_idx" ON "exercise_logs"("user_id", "max_set_weight");
+
+-- DropIndex: jsonb_path_ops は jsonpath の等値条件のみ対応し、@.weight >= 100 のような
+-- 範囲条件には使われないため削除する
+DROP INDEX "exercise_logs_sets_idx";
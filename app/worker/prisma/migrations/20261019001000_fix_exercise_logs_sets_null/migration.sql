@@ -0,0 +1,11 @@
+-- Backfill: コンパクト形式の行の sets が JSON の null で保存されていたため、SQL の NULL に直す
+-- （ADK の ExerciseLog モデルは JSONB(none_as_null=True) で NULL を書き込む）
+UPDATE "exercise_logs"
+SET "sets" = NULL
+WHERE "sets" = 'null'::jsonb
+  AND COALESCE("set_reps", "set_weights", "set_durations", "set_distances") IS NOT NULL;
+
+-- 配列カラムもない行はセットなしとして [] にする
+UPDATE "exercise_logs"
+SET "sets" = '[]'::jsonb
+WHERE "sets" = 'null'::jsonb;